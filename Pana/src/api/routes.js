@@ -17,6 +17,8 @@ export const API_ROUTES = {
   RECORDINGS: {
     LIST: "/api/recordings",
     CREATE: "/api/recordings",
+    STREAM: "/api/recordings/stream", // POST raw audio body, metadata in query
+    LIVE: "/api/recordings/live", // WebSocket: PCM frames in, partial/final text out
     DETAIL: (id) => `/api/recordings/${id}`,
     UPDATE: (id) => `/api/recordings/${id}`,
     DELETE: (id) => `/api/recordings/${id}`,
@@ -26,8 +28,10 @@ export const API_ROUTES = {
     DETAIL: (id) => `/api/transcriptions/${id}`,
   },
   DIARY: {
-    CREATE: "/api/diary",
+    CREATE: "/api/diary", // POST - 202 with a generation job
     GET: "/api/diary",
+    JOB: (id) => `/api/diary/jobs/${id}`,
+    EVENTS: "/api/diary/events", // SSE - progress of the user's diary jobs
   },
   HISTORY: {
     CALENDAR: (year, month) => `/api/history/calendar/${year}/${month}`,
@@ -1,6 +1,7 @@
 import React from 'react';
 import { Mic, Square, Pause, Play } from 'lucide-react';
 import { useAudioRecorder } from '../hooks/useAudioRecorder';
+import { useLiveTranscription } from '../hooks/useLiveTranscription';
 import FluidWaveVisualizer from './FluidWaveVisualizer';
 import { toast } from 'sonner';
 
@@ -78,7 +79,7 @@ const blobToWavBlob = async (blob) => {
   }
 };
 
-const AudioRecorder = ({ onRecordingComplete }) => {
+const AudioRecorder = ({ onRecordingComplete, onLiveSaved, liveParams }) => {
   const { 
     isRecording, 
     isPaused,
@@ -92,24 +93,54 @@ const AudioRecorder = ({ onRecordingComplete }) => {
     getAudioBlob, 
     resetRecording 
   } = useAudioRecorder();
+
+  const {
+    isLive,
+    finals,
+    partialText,
+    startLive,
+    pauseLive,
+    resumeLive,
+    stopLive,
+    resetLive
+  } = useLiveTranscription();
   
   const [isProcessing, setIsProcessing] = React.useState(false);
 
   const handleStart = async () => {
-    await startRecording();
+    const stream = await startRecording();
+    if (stream && onLiveSaved) {
+      // Live text is best effort: without it the clip is uploaded on stop
+      startLive(stream, liveParams).catch((e) => console.warn(e.message));
+    }
   };
 
   const handlePauseResume = () => {
     if (isPaused) {
       resumeRecording();
+      resumeLive();
     } else {
       pauseRecording();
+      pauseLive();
     }
   };
 
   const handleStop = async () => {    
     stopRecording();
     setIsProcessing(true);
+
+    if (isLive) {
+      const saved = await stopLive();
+      if (saved) {
+        onLiveSaved(saved);
+        resetRecording();
+        resetLive();
+        toast.success("Recording saved successfully!");
+        setIsProcessing(false);
+        return;
+      }
+    }
+    resetLive();
     
     setTimeout(async () => {
       const blob = getAudioBlob();
@@ -151,6 +182,14 @@ const AudioRecorder = ({ onRecordingComplete }) => {
         <FluidWaveVisualizer audioData={audioData} isRecording={isRecording && !isPaused} />
       </div>
 
+      {/* Live transcript */}
+      {(finals.length > 0 || partialText) && (
+        <div className="live-transcript">
+          {finals.filter(Boolean).join(' ')}
+          {partialText && <span className="live-partial"> {partialText}</span>}
+        </div>
+      )}
+
       {/* Controls */}
       <div className="controls-container">
         {!isRecording ? (
@@ -214,6 +253,23 @@ const AudioRecorder = ({ onRecordingComplete }) => {
           margin: 0;
         }
 
+        .live-transcript {
+          width: 100%;
+          max-width: 600px;
+          max-height: 8rem;
+          overflow-y: auto;
+          margin-bottom: 1rem;
+          color: var(--text-secondary);
+          font-size: 1rem;
+          line-height: 1.5;
+          text-align: center;
+        }
+
+        .live-partial {
+          color: var(--text-tertiary);
+          font-style: italic;
+        }
+
         .controls-container {
           display: flex;
           gap: 1.25rem;
@@ -2,7 +2,7 @@ import React from 'react';
 import { BookOpen } from 'lucide-react';
 import './Diary/Diary.css'; // Import the CSS file
 
-const CreateDiary = ({ onCreate, loading }) => {
+const CreateDiary = ({ onCreate, loading, progressLabel }) => {
   return (
     <div className="create-diary-container">
       <div className="create-icon-wrapper">
@@ -22,7 +22,7 @@ const CreateDiary = ({ onCreate, loading }) => {
         {loading ? (
            <div style={{display: 'flex', alignItems: 'center', gap: '8px'}}>
              <div className="spinner"></div>
-             <span>Generating...</span>
+             <span>{progressLabel || 'Generating...'}</span>
            </div>
         ) : (
           'Generate Diary'
@@ -95,8 +95,10 @@ export const useAudioRecorder = () => {
         stream.getTracks().forEach(track => track.stop());
       };
 
+      return stream;
     } catch (err) {
       console.error("Error accessing microphone:", err);
+      return null;
     }
   };
 
@@ -0,0 +1,95 @@
+import { useCallback, useEffect, useRef, useState } from 'react';
+import axiosClient from '../api/axiosClient';
+import { API_ROUTES, BASE_URL } from '../api/routes';
+
+const STAGE_LABELS = {
+  transcripts: 'Gathering transcripts...',
+  waiting: 'Waiting for recordings to finish transcribing...',
+  locations: 'Placing your day...',
+  writing: 'Writing your diary...',
+  saving: 'Saving...',
+};
+
+// Server-side waiting is bounded by its transcription deadline; give up after this
+const JOB_TIMEOUT_MS = 15 * 60 * 1000;
+
+/**
+ * Queues diary generation and follows the job over the diary events stream.
+ * Resolves with the generated diary, or rejects with the job's error.
+ */
+export const useDiaryJob = () => {
+  const [stage, setStage] = useState(null);
+  const sourceRef = useRef(null);
+
+  useEffect(() => () => sourceRef.current?.close(), []);
+
+  const generate = useCallback(async (date) => {
+    const response = await axiosClient.post(API_ROUTES.DIARY.CREATE, null, {
+      params: { date },
+    });
+    if (!response.data || response.data.code !== 'SUCCESS') {
+      throw new Error(response.data?.message || 'Diary generation failed');
+    }
+    const jobId = response.data.data.job_id;
+    setStage('queued');
+
+    return new Promise((resolve, reject) => {
+      const source = new EventSource(`${BASE_URL}${API_ROUTES.DIARY.EVENTS}`, { withCredentials: true });
+      sourceRef.current = source;
+      let settled = false;
+      let timer = null;
+
+      const settle = (job) => {
+        if (settled) return;
+        settled = true;
+        clearTimeout(timer);
+        source.close();
+        setStage(null);
+        if (job.status === 'completed') {
+          resolve(job.diary);
+        } else {
+          reject(new Error(job.error || 'Diary generation failed'));
+        }
+      };
+
+      // The job may finish before the stream is open, so read it directly too
+      const check = async () => {
+        try {
+          const res = await axiosClient.get(API_ROUTES.DIARY.JOB(jobId));
+          const job = res.data?.data;
+          if (job && (job.status === 'completed' || job.status === 'failed')) {
+            settle(job);
+          }
+        } catch (e) {
+          // The stream will still report completion
+        }
+      };
+
+      timer = setTimeout(
+        () => settle({ status: 'failed', error: 'Diary generation is taking too long, please try again' }),
+        JOB_TIMEOUT_MS,
+      );
+
+      source.onopen = check;
+      source.onmessage = (event) => {
+        try {
+          const data = JSON.parse(event.data);
+          if (data.job_id !== jobId) return;
+          if (data.status === 'completed' || data.status === 'failed') {
+            check();
+          } else {
+            setStage(data.stage || data.status);
+          }
+        } catch (e) {
+          // quiet failure
+        }
+      };
+      source.onerror = () => {
+        // EventSource reconnects by itself; poll in the meantime
+        check();
+      };
+    });
+  }, []);
+
+  return { generate, stage, stageLabel: stage ? STAGE_LABELS[stage] || 'Queued...' : null };
+};
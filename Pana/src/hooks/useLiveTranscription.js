@@ -0,0 +1,155 @@
+import { useState, useRef } from 'react';
+import { API_ROUTES, BASE_URL } from '../api/routes';
+
+const TARGET_SAMPLE_RATE = 16000;
+const CONNECT_TIMEOUT_MS = 5000;
+const SAVE_TIMEOUT_MS = 60000;
+
+// Float32 samples at the context rate -> 16 kHz mono signed 16-bit PCM
+const downsampleToInt16 = (input, inputRate) => {
+  const ratio = inputRate / TARGET_SAMPLE_RATE;
+  const length = Math.floor(input.length / ratio);
+  const output = new Int16Array(length);
+  for (let i = 0; i < length; i += 1) {
+    const start = Math.floor(i * ratio);
+    const end = Math.min(Math.floor((i + 1) * ratio), input.length);
+    let sum = 0;
+    for (let j = start; j < end; j += 1) sum += input[j];
+    const sample = Math.max(-1, Math.min(1, sum / Math.max(end - start, 1)));
+    output[i] = sample < 0 ? sample * 0x8000 : sample * 0x7FFF;
+  }
+  return output.buffer;
+};
+
+export const useLiveTranscription = () => {
+  const [isLive, setIsLive] = useState(false);
+  const [finals, setFinals] = useState([]);
+  const [partialText, setPartialText] = useState('');
+
+  const socketRef = useRef(null);
+  const audioContextRef = useRef(null);
+  const processorRef = useRef(null);
+  const sourceRef = useRef(null);
+  const pausedRef = useRef(false);
+  const saveResolverRef = useRef(null);
+
+  const teardownAudio = () => {
+    if (processorRef.current) processorRef.current.disconnect();
+    if (sourceRef.current) sourceRef.current.disconnect();
+    if (audioContextRef.current) audioContextRef.current.close();
+    processorRef.current = null;
+    sourceRef.current = null;
+    audioContextRef.current = null;
+  };
+
+  const settleSave = (value) => {
+    if (saveResolverRef.current) {
+      saveResolverRef.current(value);
+      saveResolverRef.current = null;
+    }
+  };
+
+  const startLive = (stream, params = {}) => new Promise((resolve, reject) => {
+    const url = new URL(`${BASE_URL}${API_ROUTES.RECORDINGS.LIVE}`);
+    url.protocol = url.protocol.replace('http', 'ws');
+    url.searchParams.set('recorded_at', new Date().toISOString());
+    Object.entries(params).forEach(([key, value]) => {
+      if (value !== undefined && value !== null && value !== '') url.searchParams.set(key, value);
+    });
+
+    const socket = new WebSocket(url.toString());
+    socket.binaryType = 'arraybuffer';
+    socketRef.current = socket;
+    const timeout = setTimeout(() => {
+      socket.close();
+      reject(new Error('Live transcription unavailable'));
+    }, CONNECT_TIMEOUT_MS);
+
+    socket.onmessage = (event) => {
+      let message;
+      try {
+        message = JSON.parse(event.data);
+      } catch {
+        return;
+      }
+      if (message.type === 'ready') {
+        clearTimeout(timeout);
+        const audioContext = new (window.AudioContext || window.webkitAudioContext)();
+        const source = audioContext.createMediaStreamSource(stream);
+        const processor = audioContext.createScriptProcessor(4096, 1, 1);
+        processor.onaudioprocess = (e) => {
+          if (pausedRef.current || socket.readyState !== WebSocket.OPEN) return;
+          socket.send(downsampleToInt16(e.inputBuffer.getChannelData(0), audioContext.sampleRate));
+        };
+        source.connect(processor);
+        processor.connect(audioContext.destination);
+        audioContextRef.current = audioContext;
+        sourceRef.current = source;
+        processorRef.current = processor;
+        pausedRef.current = false;
+        setIsLive(true);
+        resolve();
+      } else if (message.type === 'partial') {
+        setPartialText(message.text);
+      } else if (message.type === 'final') {
+        setFinals((prev) => {
+          const next = [...prev];
+          next[message.index] = message.text;
+          return next;
+        });
+        setPartialText('');
+      } else if (message.type === 'saved') {
+        settleSave(message);
+      }
+    };
+
+    socket.onclose = () => {
+      clearTimeout(timeout);
+      teardownAudio();
+      setIsLive(false);
+      settleSave(null);
+      reject(new Error('Live transcription closed'));
+    };
+  });
+
+  const pauseLive = () => {
+    pausedRef.current = true;
+  };
+
+  const resumeLive = () => {
+    pausedRef.current = false;
+  };
+
+  // Resolves with { recording, transcription } once the server has saved it, or null
+  const stopLive = () => new Promise((resolve) => {
+    teardownAudio();
+    const socket = socketRef.current;
+    if (!socket || socket.readyState !== WebSocket.OPEN) {
+      resolve(null);
+      return;
+    }
+    saveResolverRef.current = resolve;
+    setTimeout(() => settleSave(null), SAVE_TIMEOUT_MS);
+    socket.send(JSON.stringify({ type: 'stop' }));
+  });
+
+  const resetLive = () => {
+    if (socketRef.current && socketRef.current.readyState === WebSocket.OPEN) {
+      socketRef.current.send(JSON.stringify({ type: 'cancel' }));
+    }
+    socketRef.current = null;
+    setFinals([]);
+    setPartialText('');
+  };
+
+  return {
+    isLive,
+    finals,
+    partialText,
+    startLive,
+    pauseLive,
+    resumeLive,
+    stopLive,
+    resetLive
+  };
+};
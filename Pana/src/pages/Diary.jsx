@@ -3,6 +3,7 @@ import axiosClient from '../api/axiosClient';
 import { API_ROUTES } from '../api/routes';
 import CreateDiary from '../components/CreateDiary';
 import DiaryView from '../components/Diary/DiaryView';
+import { useDiaryJob } from '../hooks/useDiaryJob';
 import { useParams } from 'react-router-dom';
 
 const Diary = () => {
@@ -11,6 +12,7 @@ const Diary = () => {
   const [loading, setLoading] = useState(false);
   const [recordings, setRecordings] = useState([]);
   const [loadingRecordings, setLoadingRecordings] = useState(true);
+  const { generate, stageLabel } = useDiaryJob();
 
   // Helper for today's date in YYYY-MM-DD
   const getTodayDateString = () => {
@@ -57,15 +59,9 @@ const Diary = () => {
     // We now support creating/regenerating diary for any date supported by backend
     setLoading(true);
     try {
-      // Pass the targetDate as a query parameter
-      const response = await axiosClient.post(API_ROUTES.DIARY.CREATE, null, {
-          params: { date: targetDate }
-      });
-      if (response.data && response.data.code === 'SUCCESS') {
-        setDiary(response.data.data);
-      } else {
-        console.error("Diary generation failed:", response.data.message);
-      }
+      // Generation runs as a background job; wait for its completion event
+      const generated = await generate(targetDate);
+      setDiary(generated);
     } catch (error) {
       console.error("Error generating diary:", error);
     } finally {
@@ -116,6 +112,7 @@ const Diary = () => {
       <CreateDiary 
         onCreate={handleCreateDiary} 
         loading={loading} 
+        progressLabel={stageLabel}
       />
     );
   } else if (hasRecordings) {
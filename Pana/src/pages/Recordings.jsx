@@ -68,15 +68,17 @@ const Recordings = () => {
   };
 
   const handleUpload = async (file, duration) => {
-      const formData = new FormData();
-      formData.append('file', file);
-      formData.append('duration_seconds', duration);
-      formData.append('recorded_at', new Date().toISOString());
-      if (locationText) formData.append('location_text', locationText);
+      const params = {
+          duration_seconds: duration,
+          recorded_at: new Date().toISOString(),
+          filename: file.name,
+      };
+      if (locationText) params.location_text = locationText;
       
       try {
-          const res = await axiosClient.post(API_ROUTES.RECORDINGS.CREATE, formData, {
-              headers: { 'Content-Type': 'multipart/form-data' }
+          const res = await axiosClient.post(API_ROUTES.RECORDINGS.STREAM, file, {
+              params,
+              headers: { 'Content-Type': file.type || 'application/octet-stream' }
           });
           if (res.data.code === 'SUCCESS') {
               setRefreshKey(prev => prev + 1);
@@ -161,7 +163,11 @@ const Recordings = () => {
 
       {/* Right Panel - Recorder */}
       <div className="recorder-panel">
-        <AudioRecorder onRecordingComplete={handleUpload} />
+        <AudioRecorder
+          onRecordingComplete={handleUpload}
+          onLiveSaved={() => setRefreshKey(prev => prev + 1)}
+          liveParams={{ location_text: locationText }}
+        />
       </div>
       
       <ConfirmDialog 
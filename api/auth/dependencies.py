@@ -1,5 +1,5 @@
 from typing import Optional, Dict
-from fastapi import Request, HTTPException, status, Security
+from fastapi import Request, HTTPException, status, Security, WebSocket
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from api.config.config import settings
@@ -69,3 +69,35 @@ async def get_authorized_db_user(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
         
     return user
+
+
+async def get_admin_user(
+    user = Depends(get_authorized_db_user),
+) -> object:
+    """
+    Dependency that only lets through users listed in settings.ADMIN_EMAILS.
+    """
+    if (user.email or "").lower() not in CONFIG.ADMIN_EMAILS:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return user
+
+
+async def get_websocket_user(websocket: WebSocket, db: AsyncSession) -> Optional[object]:
+    """
+    Resolve the user of a WebSocket handshake from the access cookie or a
+    ?token= query parameter (browsers cannot set headers on WebSockets).
+    Returns None if unauthenticated.
+    """
+    token = (
+        websocket.query_params.get("token")
+        or _extract_bearer_token(websocket.headers.get("authorization"))
+        or websocket.cookies.get(CONFIG.ACCESS_COOKIE_NAME)
+    )
+    if not token:
+        return None
+    try:
+        payload = decode_access_token(token)
+    except Exception:
+        return None
+    sub = payload.get("sub")
+    return await get_user_by_sub(db, sub) if sub else None
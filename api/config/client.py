@@ -1,6 +1,59 @@
+import asyncio
+import httpx
 from groq import AsyncGroq
 from api.config.config import settings as CONFIG
 
 transcription_client = AsyncGroq(api_key=CONFIG.GROQ_API_KEY)
 
-llm_client = transcription_client
\ No newline at end of file
+llm_client = transcription_client
+
+# One pooled client per event loop: httpx connections are bound to the loop
+# that opened them, so a long-lived loop (Celery workers) keeps reusing its own.
+_loop_clients: dict = {}
+_loop_http_clients: dict = {}
+
+
+def get_transcription_client() -> AsyncGroq:
+    loop = asyncio.get_running_loop()
+    client = _loop_clients.get(loop)
+    if client is None:
+        client = AsyncGroq(
+            api_key=CONFIG.GROQ_API_KEY,
+            base_url=CONFIG.GROQ_TRANSCRIPTION_BASE_URL,
+            # 429s are retried by the shared rate limiter instead
+            max_retries=0,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=CONFIG.GROQ_MAX_CONNECTIONS,
+                    max_keepalive_connections=CONFIG.GROQ_MAX_CONNECTIONS,
+                ),
+                timeout=httpx.Timeout(CONFIG.GROQ_TIMEOUT_SECONDS),
+            ),
+        )
+        _loop_clients[loop] = client
+    return client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Shared pooled client for plain HTTP calls (reverse geocoding), one per loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _loop_http_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            headers={"User-Agent": CONFIG.LOCATION_USER_AGENT},
+            timeout=httpx.Timeout(CONFIG.GEOCODE_TIMEOUT_SECONDS),
+        )
+        _loop_http_clients[loop] = client
+    return client
+
+
+async def close_clients() -> None:
+    loop = asyncio.get_running_loop()
+    client = _loop_clients.pop(loop, None)
+    if client is not None:
+        await client.close()
+    http_client = _loop_http_clients.pop(loop, None)
+    if http_client is not None:
+        await http_client.aclose()
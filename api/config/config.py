@@ -12,6 +12,27 @@ class config:
 
     # Diary
     LOCATION_URL = "https://nominatim.openstreetmap.org/reverse?format=json&lat={lat}&lon={long}"
+    LOCATION_USER_AGENT = "PanaLocation/1.0"
+    # Reverse geocoding is cached per grid cell (0.001 degrees is roughly 110 m)
+    GEOCODE_GRID_DEGREES = float(os.getenv("GEOCODE_GRID_DEGREES", "0.001"))
+    GEOCODE_LRU_SIZE = 4096
+    GEOCODE_TIMEOUT_SECONDS = 10
+    # Nominatim's usage policy allows one request per second
+    GEOCODE_MIN_INTERVAL_SECONDS = 1.0
+    # Optional GeoNames dump (e.g. cities1000.txt) answered locally before Nominatim
+    GEOCODE_GAZETTEER_PATH = os.getenv("GEOCODE_GAZETTEER_PATH", None)
+    GEOCODE_GAZETTEER_MAX_KM = float(os.getenv("GEOCODE_GAZETTEER_MAX_KM", "5"))
+    # Background diary generation
+    DIARY_EVENTS_CHANNEL = "diary_events"
+    DIARY_JOB_TTL_SECONDS = 86400
+    # A diary job waits this long for the day's transcriptions before writing anyway
+    DIARY_TRANSCRIPTION_DEADLINE_SECONDS = int(os.getenv("DIARY_TRANSCRIPTION_DEADLINE_SECONDS", "300"))
+    DIARY_BARRIER_POLL_SECONDS = 5
+    # A queued/running job older than this is presumed lost and may be replaced
+    DIARY_JOB_STALE_SECONDS = DIARY_TRANSCRIPTION_DEADLINE_SECONDS + 600
+    # Consecutive recordings this close in space and time form one diary event
+    VISIT_RADIUS_METERS = 200
+    VISIT_MAX_GAP_MINUTES = 90
 
     # Transcriptions
     BASE_DIR = "recordings"
@@ -19,12 +40,105 @@ class config:
     TRANSCRIPTION_MODEL = "whisper-large-v3"
     TRANSCRIPTION_MODEL_TURBO = "whisper-large-v3-turbo"
     TRANSCRIPTION_CONFIDENCE_THRESHOLD = 0.5
+    # Turbo first pass, large-model re-run only below the confidence threshold
+    TRANSCRIPTION_TIERED = os.getenv("TRANSCRIPTION_TIERED", "true").lower() == "true"
+
+    # Transcription engines: "groq" (remote) or "local" (faster-whisper on CPU),
+    # chosen per Celery queue as "queue=backend,..."; unlisted queues use the default
+    TRANSCRIPTION_BACKEND = os.getenv("TRANSCRIPTION_BACKEND", "groq")
+    TRANSCRIPTION_LOCAL_QUEUE = "local"
+    TRANSCRIPTION_QUEUE_BACKENDS = dict(
+        item.split("=", 1)
+        for item in os.getenv("TRANSCRIPTION_QUEUE_BACKENDS", "local=local").split(",")
+        if "=" in item
+    )
+    LOCAL_WHISPER_MODEL = os.getenv("LOCAL_WHISPER_MODEL", "large-v3")
+    LOCAL_WHISPER_MODEL_TURBO = os.getenv("LOCAL_WHISPER_MODEL_TURBO", "large-v3-turbo")
+    LOCAL_WHISPER_COMPUTE_TYPE = os.getenv("LOCAL_WHISPER_COMPUTE_TYPE", "int8")
+    LOCAL_WHISPER_CPU_THREADS = int(os.getenv("LOCAL_WHISPER_CPU_THREADS", "4"))
+    LOCAL_WHISPER_WORKERS = int(os.getenv("LOCAL_WHISPER_WORKERS", "1"))
+    LOCAL_WHISPER_BEAM_SIZE = 5
+
+    # Transcoding (runs in the Celery worker before transcription)
+    TRANSCODE_ENABLED = os.getenv("TRANSCODE_ENABLED", "true").lower() == "true"
+    TRANSCODE_CODEC = os.getenv("TRANSCODE_CODEC", "opus")  # "opus" or "flac"
+    TRANSCODE_SAMPLE_RATE = 16000
+    TRANSCODE_OPUS_BITRATE = "24k"
+    TRANSCODE_WORKERS = int(os.getenv("TRANSCODE_WORKERS", "2"))
+    # Longest one worker may own a blob's transcode before another may take over
+    TRANSCODE_CLAIM_SECONDS = int(os.getenv("TRANSCODE_CLAIM_SECONDS", "600"))
+    KEEP_ORIGINAL_AUDIO = os.getenv("KEEP_ORIGINAL_AUDIO", "false").lower() == "true"
+    DURATION_TOLERANCE_SECONDS = 2
+
+    # Voice activity detection (silence trimming before transcription)
+    VAD_ENABLED = os.getenv("VAD_ENABLED", "true").lower() == "true"
+    VAD_AGGRESSIVENESS = 2  # webrtcvad mode 0-3, when installed
+    VAD_ENERGY_MARGIN_DB = 12.0
+    VAD_MIN_ENERGY_DB = -50.0
+    VAD_PADDING_SECONDS = 0.3
+    VAD_MIN_SILENCE_SECONDS = 0.6
+    VAD_MIN_SPEECH_SECONDS = 0.25
+
+    # Chunked transcription of long recordings
+    TRANSCRIPTION_CHUNK_SECONDS = int(os.getenv("TRANSCRIPTION_CHUNK_SECONDS", "600"))
+    TRANSCRIPTION_MAX_PARALLEL_CHUNKS = int(os.getenv("TRANSCRIPTION_MAX_PARALLEL_CHUNKS", "4"))
+
+    # Live transcription over WebSocket (16 kHz mono PCM frames)
+    LIVE_MIN_WINDOW_SECONDS = 1.0
+    LIVE_ENDPOINT_SILENCE_SECONDS = float(os.getenv("LIVE_ENDPOINT_SILENCE_SECONDS", "0.5"))
+    LIVE_MAX_WINDOW_SECONDS = float(os.getenv("LIVE_MAX_WINDOW_SECONDS", "25"))
+    LIVE_PARTIALS_ENABLED = os.getenv("LIVE_PARTIALS_ENABLED", "true").lower() == "true"
+    LIVE_PARTIAL_INTERVAL_SECONDS = float(os.getenv("LIVE_PARTIAL_INTERVAL_SECONDS", "3"))
+    # Short utterances are merged into one final of at least this much audio
+    # (Groq bills every request as at least GROQ_MIN_BILLED_SECONDS)
+    LIVE_MIN_FINAL_SECONDS = float(os.getenv("LIVE_MIN_FINAL_SECONDS", "10"))
+
+    # Transcription result cache (audio hash + model + prompt hash)
+    TRANSCRIPTION_CACHE_ENABLED = os.getenv("TRANSCRIPTION_CACHE_ENABLED", "true").lower() == "true"
+    TRANSCRIPTION_CACHE_TTL_SECONDS = int(os.getenv("TRANSCRIPTION_CACHE_TTL_SECONDS", str(30 * 24 * 60 * 60)))
+    TRANSCRIPTION_CACHE_MAX_ENTRIES = int(os.getenv("TRANSCRIPTION_CACHE_MAX_ENTRIES", "50000"))
+    # Upper bound on how long one transcription may stay queued/running before
+    # it can be enqueued again; also the reaper's pending deadline below, so a
+    # row is only re-driven once its registration has lapsed
+    TRANSCRIPTION_INFLIGHT_TTL_SECONDS = int(os.getenv("TRANSCRIPTION_INFLIGHT_TTL_SECONDS", "1800"))
+
+    # Reaper (Celery beat): re-drive rows stuck in processing/pending
+    REAPER_INTERVAL_SECONDS = int(os.getenv("REAPER_INTERVAL_SECONDS", "60"))
+    # A working task refreshes claimed_at every TRANSCRIPTION_HEARTBEAT_SECONDS;
+    # a processing row is reaped once its heartbeat is older than the timeout
+    TRANSCRIPTION_HEARTBEAT_SECONDS = int(os.getenv("TRANSCRIPTION_HEARTBEAT_SECONDS", "60"))
+    TRANSCRIPTION_VISIBILITY_TIMEOUT_SECONDS = int(os.getenv("TRANSCRIPTION_VISIBILITY_TIMEOUT_SECONDS", "300"))
+    TRANSCRIPTION_PENDING_DEADLINE_SECONDS = int(
+        os.getenv("TRANSCRIPTION_PENDING_DEADLINE_SECONDS", str(TRANSCRIPTION_INFLIGHT_TTL_SECONDS))
+    )
+    TRANSCRIPTION_MAX_ATTEMPTS = int(os.getenv("TRANSCRIPTION_MAX_ATTEMPTS", "5"))
+    # Backoff between transient failures (network, 5xx, 429)
+    TRANSCRIPTION_RETRY_BASE_SECONDS = 30
+    TRANSCRIPTION_RETRY_MAX_SECONDS = 1800
+    REAPER_BATCH_SIZE = 200
     
     # LLM1
     LLM1 = "Groq"
     GROQ_API_KEY = os.getenv("GROQ_API_KEY", None)
     GROQ_MODEL_SMALL = "llama-3.1-8b-instant"
     GROQ_MODEL_LARGE = "meta-llama/llama-4-maverick-17b-128e-instruct"
+    GROQ_MAX_CONNECTIONS = int(os.getenv("GROQ_MAX_CONNECTIONS", "20"))
+    GROQ_TIMEOUT_SECONDS = float(os.getenv("GROQ_TIMEOUT_SECONDS", "120"))
+    # Point transcription calls elsewhere, e.g. at benchmarks/fake_groq.py
+    GROQ_TRANSCRIPTION_BASE_URL = os.getenv("GROQ_TRANSCRIPTION_BASE_URL", None)
+
+    # Groq rate limits, shared by every worker through Redis
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    GROQ_REQUESTS_PER_MINUTE = int(os.getenv("GROQ_REQUESTS_PER_MINUTE", "20"))
+    GROQ_AUDIO_SECONDS_PER_HOUR = int(os.getenv("GROQ_AUDIO_SECONDS_PER_HOUR", "7200"))
+    GROQ_MIN_BILLED_SECONDS = 10
+    RATE_LIMIT_HEADROOM = 0.9  # stay just under the provider ceiling
+    RATE_LIMIT_MAX_WAIT_SECONDS = 30  # longer waits defer the task instead of blocking
+    RATE_LIMIT_RETRIES = 4
+    RATE_LIMIT_BACKOFF_BASE_SECONDS = 1.0
+    RATE_LIMIT_BACKOFF_MAX_SECONDS = 60.0
+    # Fraction of the limits reserved for live sessions; batch gets the rest
+    LIVE_RATE_LIMIT_SHARE = float(os.getenv("LIVE_RATE_LIMIT_SHARE", "0.25"))
 
     # LLM2
     LLM2 = "Gemini"
@@ -43,6 +157,34 @@ class config:
     REDIS_BROKER_URL = os.getenv("REDIS_BROKER_URL", "redis://localhost:6379")
     REDIS_RESULT_BACKEND = os.getenv("REDIS_RESULT_BACKEND", "redis://localhost:6379")
     REDIS_PUBSUB_URL = os.getenv("REDIS_PUBSUB_URL", "redis://localhost:6379")
+    REDIS_CACHE_URL = os.getenv("REDIS_CACHE_URL", REDIS_PUBSUB_URL)
+
+    # Celery workers (thread pool + one shared asyncio loop per process)
+    CELERY_WORKER_POOL = os.getenv("CELERY_WORKER_POOL", "threads")
+    CELERY_WORKER_CONCURRENCY = int(os.getenv("CELERY_WORKER_CONCURRENCY", "8"))
+    CELERY_QUEUES = ["high_priority", "default", TRANSCRIPTION_LOCAL_QUEUE]
+
+    # Worker autoscaler (python -m celery_service.autoscaler)
+    AUTOSCALE_QUEUES = ["high_priority", "default"]
+    AUTOSCALE_MIN_WORKERS = int(os.getenv("AUTOSCALE_MIN_WORKERS", "1"))
+    AUTOSCALE_MAX_WORKERS = int(os.getenv("AUTOSCALE_MAX_WORKERS", "4"))
+    AUTOSCALE_INTERVAL_SECONDS = 5
+    AUTOSCALE_TARGET_WAIT_SECONDS = int(os.getenv("AUTOSCALE_TARGET_WAIT_SECONDS", "15"))
+    AUTOSCALE_SCALE_DOWN_DELAY_SECONDS = int(os.getenv("AUTOSCALE_SCALE_DOWN_DELAY_SECONDS", "300"))
+    AUTOSCALE_DRAIN_TIMEOUT_SECONDS = int(os.getenv("AUTOSCALE_DRAIN_TIMEOUT_SECONDS", "600"))
+    # Time a new worker needs before it takes tasks; no further scale-up meanwhile
+    AUTOSCALE_WORKER_STARTUP_SECONDS = int(os.getenv("AUTOSCALE_WORKER_STARTUP_SECONDS", "30"))
+
+    # Fair-share scheduling: per-user sub-queues drained by deficit round-robin
+    # (high_priority, the diary path, bypasses it)
+    FAIR_SCHEDULING_ENABLED = os.getenv("FAIR_SCHEDULING_ENABLED", "true").lower() == "true"
+    FAIR_QUEUES = ["default", TRANSCRIPTION_LOCAL_QUEUE]
+    FAIR_QUANTUM_SECONDS = int(os.getenv("FAIR_QUANTUM_SECONDS", "600"))  # audio credit per visit
+    FAIR_DISPATCH_DEPTH = int(os.getenv("FAIR_DISPATCH_DEPTH", str(CELERY_WORKER_CONCURRENCY)))
+    FAIR_DISPATCH_INTERVAL_SECONDS = 0.5
+
+    # Admin endpoints (comma-separated account emails)
+    ADMIN_EMAILS = [e.strip().lower() for e in os.getenv("ADMIN_EMAILS", "").split(",") if e.strip()]
 
     # SYSTEM
     SERVER_HOST="0.0.0.0"
@@ -71,5 +213,24 @@ class config:
 
     # Files
     UPLOAD_DIR = "recordings"
+    UPLOAD_STAGING_DIR = os.path.join(UPLOAD_DIR, ".staging")
+    BLOB_DIR = "blobs"
+    UPLOAD_CHUNK_SIZE = 1024 * 1024
+    MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(200 * 1024 * 1024)))
+    UPLOAD_SESSION_DIR = os.path.join(UPLOAD_STAGING_DIR, "sessions")
+    UPLOAD_SESSION_TTL_SECONDS = int(os.getenv("UPLOAD_SESSION_TTL_SECONDS", str(24 * 60 * 60)))
+    # Beat sweep of expired sessions and staging files left by failed uploads
+    UPLOAD_SWEEP_INTERVAL_SECONDS = int(os.getenv("UPLOAD_SWEEP_INTERVAL_SECONDS", "3600"))
+    UPLOAD_STAGING_MAX_AGE_SECONDS = int(os.getenv("UPLOAD_STAGING_MAX_AGE_SECONDS", str(6 * 60 * 60)))
+    # Longest a single chunk request may hold its session's append lock
+    UPLOAD_SESSION_LOCK_SECONDS = int(os.getenv("UPLOAD_SESSION_LOCK_SECONDS", "600"))
+
+    # Storage ("local" disk under UPLOAD_DIR, or "s3" for S3/MinIO)
+    STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")
+    S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL", None)
+    S3_BUCKET = os.getenv("S3_BUCKET", "pana-recordings")
+    S3_ACCESS_KEY = os.getenv("S3_ACCESS_KEY", None)
+    S3_SECRET_KEY = os.getenv("S3_SECRET_KEY", None)
+    S3_REGION = os.getenv("S3_REGION", "us-east-1")
 
 settings = config()
\ No newline at end of file
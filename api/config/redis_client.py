@@ -7,6 +7,9 @@ from api.config.config import settings as CONFIG
 logger = logging.getLogger(__name__)
 
 REDIS_PUBSUB_URL=CONFIG.REDIS_PUBSUB_URL
+REDIS_CACHE_URL=CONFIG.REDIS_CACHE_URL
+
+_cache_client = None
 
 
 def get_redis_client():
@@ -24,4 +27,17 @@ def get_async_redis_client():
         return aioredis.from_url(REDIS_PUBSUB_URL, decode_responses=False)
     except Exception as e:
         logger.error(f"Failed to create async Redis client: {e}")
-        return None
\ No newline at end of file
+        return None
+
+def get_cache_redis_client():
+    """
+    Shared (thread-safe, pooled) client for cache and coordination keys.
+    """
+    global _cache_client
+    if _cache_client is None:
+        try:
+            _cache_client = redis.StrictRedis.from_url(REDIS_CACHE_URL)
+        except Exception as e:
+            logger.error(f"Failed to create cache Redis client: {e}")
+            return None
+    return _cache_client
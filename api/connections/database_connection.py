@@ -1,5 +1,6 @@
 import asyncpg
 import logging
+import threading
 
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
@@ -9,7 +10,7 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session,sessionmaker
-from typing import Any, AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, List, Optional
 
 from api.connections.database_creation import Base
 from api.config.config import settings
@@ -33,6 +34,30 @@ connection: Optional[asyncpg.Connection] = None
 # Sync Globals (for Celery)
 sync_engine: Optional[Any] = None
 SyncSession: Optional[sessionmaker] = None
+_sync_engine_lock = threading.Lock()
+
+# Columns, indexes and enum values added after tables were first created.
+# create_all never alters an existing table, so these run on every start and
+# must stay idempotent. Append only.
+SCHEMA_UPGRADES: List[str] = [
+    # Reaper bookkeeping
+    "ALTER TABLE transcriptions ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE transcriptions ADD COLUMN IF NOT EXISTS claimed_at TIMESTAMP WITH TIME ZONE",
+    "ALTER TABLE transcriptions ADD COLUMN IF NOT EXISTS queue VARCHAR",
+    "ALTER TYPE transcription_status ADD VALUE IF NOT EXISTS 'dead_letter'",
+    # Content-addressed blobs
+    "ALTER TABLE recordings ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)",
+    "CREATE INDEX IF NOT EXISTS ix_recordings_content_hash ON recordings (content_hash)",
+    # Last failure, kept for dead-letter re-drive
+    "ALTER TABLE transcriptions ADD COLUMN IF NOT EXISTS error_message TEXT",
+    # Recording coordinates (filled for old rows by tasks/geo_backfill.py)
+    "ALTER TABLE recordings ADD COLUMN IF NOT EXISTS latitude DOUBLE PRECISION",
+    "ALTER TABLE recordings ADD COLUMN IF NOT EXISTS longitude DOUBLE PRECISION",
+    "CREATE INDEX IF NOT EXISTS ix_recordings_location_point ON recordings "
+    "USING gist (point(longitude, latitude)) WHERE latitude IS NOT NULL",
+    # Queue-wait measurement, unaffected by heartbeats
+    "ALTER TABLE transcriptions ADD COLUMN IF NOT EXISTS first_claimed_at TIMESTAMP WITH TIME ZONE",
+]
 
 
 async def create_database_if_not_exists() -> None:
@@ -102,7 +127,8 @@ async def setup_engine_and_session() -> None:
 
 async def create_all_tables() -> None:
     """
-    Create all tables defined on the global Base using the async engine.
+    Create all tables defined on the global Base using the async engine,
+    then apply SCHEMA_UPGRADES to tables that already existed.
     Must be called after setup_engine_and_session().
     """
     if not engine:
@@ -114,12 +140,26 @@ async def create_all_tables() -> None:
         logger.info("Ensuring all tables are created")
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+        await upgrade_schema()
         logger.info("Tables ensured/created")
     except Exception as e:
         logger.exception("Error creating tables")
         raise
 
 
+async def upgrade_schema() -> None:
+    """
+    Bring an existing database up to the models by running SCHEMA_UPGRADES.
+    Runs in autocommit, since ALTER TYPE ... ADD VALUE may not share a
+    transaction with statements that use the new value.
+    """
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for statement in SCHEMA_UPGRADES:
+            await conn.execute(text(statement))
+    logger.info(f"Applied {len(SCHEMA_UPGRADES)} schema upgrades")
+
+
 async def check_connection() -> None:
     """
     Run a simple SQL command to check if DB is reachable.
@@ -187,13 +227,15 @@ def get_sync_db_session():
     """
     global sync_engine, SyncSession
 
-    if not sync_engine:
-        db_url = (
-            f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}"
-            f"@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
-        )
-        sync_engine = create_engine(db_url, echo=False)
-        SyncSession = sessionmaker(bind=sync_engine)
+    # Celery runs tasks on a thread pool, so guard the lazy initialisation
+    with _sync_engine_lock:
+        if not sync_engine:
+            db_url = (
+                f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}"
+                f"@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
+            )
+            sync_engine = create_engine(db_url, echo=False)
+            SyncSession = sessionmaker(bind=sync_engine)
 
     session = SyncSession()
     try:
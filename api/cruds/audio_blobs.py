@@ -0,0 +1,83 @@
+from typing import List, Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.models.audio_blobs import AudioBlob
+from api.storage import get_storage
+from api.utils.upload_writer import WrittenFile, discard_staged
+
+from api.config.config import settings
+
+
+def blob_relative_path(sha256: str, extension: str) -> str:
+    """
+    Content-addressed storage key of a blob.
+    """
+    return f"{settings.BLOB_DIR}/{sha256[:2]}/{sha256}{extension}"
+
+
+async def acquire_blob(
+    db: AsyncSession,
+    staged: WrittenFile,
+    extension: str,
+) -> AudioBlob:
+    """
+    Store a staged file under its SHA-256, or add a reference to the existing
+    blob with the same content. The caller commits the session.
+    """
+    result = await db.execute(
+        select(AudioBlob)
+        .where(AudioBlob.sha256 == staged.sha256)
+        .with_for_update()
+    )
+    blob: Optional[AudioBlob] = result.scalars().first()
+
+    if blob:
+        await discard_staged(staged)
+        blob.ref_count += 1
+        return blob
+
+    relative_path = blob_relative_path(staged.sha256, extension)
+    await run_in_threadpool(get_storage().put_file, staged.path, relative_path)
+
+    blob = AudioBlob(
+        sha256=staged.sha256,
+        file_path=relative_path,
+        size_bytes=staged.size_bytes,
+        ref_count=1,
+    )
+    db.add(blob)
+    return blob
+
+
+async def release_blob(db: AsyncSession, sha256: Optional[str]) -> List[str]:
+    """
+    Drop one reference to a blob. When nothing points at it any more the row is
+    deleted and the orphaned storage keys are returned, to be removed with
+    delete_blob_files once the caller has committed.
+    """
+    if not sha256:
+        return []
+
+    result = await db.execute(
+        select(AudioBlob)
+        .where(AudioBlob.sha256 == sha256)
+        .with_for_update()
+    )
+    blob: Optional[AudioBlob] = result.scalars().first()
+    if not blob:
+        return []
+
+    blob.ref_count -= 1
+    if blob.ref_count > 0:
+        return []
+
+    await db.delete(blob)
+    return [key for key in (blob.file_path, blob.original_path) if key]
+
+
+async def delete_blob_files(keys: List[str]) -> None:
+    storage = get_storage()
+    for key in keys:
+        await run_in_threadpool(storage.delete, key)
@@ -1,6 +1,6 @@
 from datetime import date as _date
 
-from typing import List, Optional
+from typing import Callable, List, Optional
 from fastapi import HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -11,12 +11,44 @@ from api.models.recordings import Recording
 from api.models.transcriptions import Transcription
 from api.schemas.diary import DiaryResponse
 from api.schemas.history import HistoryFetch
-from api.services.diary import generate_diary_from_recordings
+from api.schemas.transcriptions import TranscriptionStatus
+from api.services.diary import generate_diary_from_recordings, ensure_all_transcriptions
+
+_UNFINISHED = {TranscriptionStatus.pending, TranscriptionStatus.processing}
+
+
+async def count_unfinished_transcriptions(
+    db: AsyncSession,
+    user_id: int,
+    date: Optional[_date] = None,
+) -> int:
+    """
+    Make sure every recording of the day has a queued transcription and
+    return how many are still missing, pending or processing.
+    """
+    target_date = date or _date.today()
+    rec_result = await db.execute(
+        select(Recording)
+        .where(
+            Recording.user_id == user_id,
+            Recording.is_deleted == False,
+            Recording.recording_date == target_date,
+        )
+        .options(joinedload(Recording.transcription))
+    )
+    recordings: List[Recording] = rec_result.scalars().all()
+    await ensure_all_transcriptions(recordings, db, user_id)
+    return sum(
+        1 for r in recordings
+        if r.transcription is None or r.transcription.status in _UNFINISHED
+    )
+
 
 async def create_or_update_diary(
     db: AsyncSession,
     user_id: int,
     date: Optional[_date] = None,
+    on_progress: Optional[Callable[[str], None]] = None,
 ) -> DiaryResponse:
     target_date = date or _date.today()
 
@@ -46,7 +78,9 @@ async def create_or_update_diary(
     transcriptions: List[Transcription] = tra_result.scalars().all()
 
     # Diary Creating Service
-    summary = await generate_diary_from_recordings(db, user_id, recordings, transcriptions)
+    summary = await generate_diary_from_recordings(db, user_id, recordings, transcriptions, on_progress)
+    if on_progress:
+        on_progress("saving")
 
     diary_result = await db.execute(
         select(Diary)
@@ -1,18 +1,24 @@
-import os
-import shutil
 from pathlib import Path
-from fastapi import UploadFile, HTTPException
+from fastapi import UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, desc
 from sqlalchemy.orm import joinedload
+from sqlalchemy.exc import IntegrityError
 from datetime import date
+from typing import Optional
 
 from api.models.recordings import Recording
 from api.models.transcriptions import Transcription
 from api.cruds.transcriptions import get_transcription_by_id
+from api.cruds.audio_blobs import acquire_blob, release_blob, delete_blob_files, blob_relative_path
 from api.schemas.recordings import RecordingCreate, RecordingUpdate, RecordingResponse
+from api.services.geocoding import parse_location_text, resolve_location_soon
+from api.utils.upload_writer import (
+    WrittenFile,
+    iter_upload_file,
+    write_stream_to_staging,
+)
 
-from api.config.config import settings
 
 async def create_recording(
     db: AsyncSession, 
@@ -24,46 +30,74 @@ async def create_recording(
     """
     Create a new recording entry in the database and save the file.
     """
+    # Stream to a staging file off the event loop
+    staged = await write_stream_to_staging(iter_upload_file(file))
+    return await create_recording_from_staged(
+        db=db,
+        staged=staged,
+        filename=file.filename,
+        user_id=user_id,
+        user_sub=user_sub,
+        recording_data=recording_data,
+    )
+
+
+async def create_recording_from_staged(
+    db: AsyncSession,
+    staged: WrittenFile,
+    filename: Optional[str],
+    user_id: int,
+    user_sub: str,
+    recording_data: RecordingCreate
+):
+    """
+    Move an already staged (fsynced) file into content-addressed storage and
+    create its recording entry.
+    """
     duration_seconds = recording_data.duration_seconds
     recorded_at = recording_data.recorded_at
     location_text = recording_data.location_text
+    latitude, longitude = parse_location_text(location_text) or (None, None)
     
     recording_date = recorded_at.date()
 
-    date_str = recorded_at.strftime("%Y-%m-%d")
-    time_str = recorded_at.strftime("%H-%M-%S")
-    
-    file_extension = Path(file.filename).suffix
+    file_extension = Path(filename or "").suffix.lower()
     if not file_extension:
         file_extension = ".wav" 
-    
-    filename = f"{time_str}{file_extension}"
-    relative_path = Path(user_sub) / date_str / filename
-    full_path = Path(settings.UPLOAD_DIR) / relative_path
-    
-    # Ensure dir exists
-    os.makedirs(full_path.parent, exist_ok=True)
-    
-    # Save file
-    try:
-        with open(full_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Could not save file: {str(e)}")
 
-    file_path_str = str(relative_path).replace("\\", "/")
+    # Identical content is stored once and reference-counted
+    orphan = None
+    for attempt in range(2):
+        try:
+            # A savepoint, so a lost race does not expire the caller's objects
+            async with db.begin_nested():
+                blob = await acquire_blob(db, staged, file_extension)
+            break
+        except IntegrityError:
+            # A concurrent upload of the same bytes created the blob first;
+            # the copy we stored is now unreferenced
+            if attempt:
+                raise
+            orphan = blob_relative_path(staged.sha256, file_extension)
+
+    if orphan and orphan not in (blob.file_path, blob.original_path):
+        await delete_blob_files([orphan])
 
     new_recording = Recording(
         user_id=user_id,
-        file_path=file_path_str,
+        file_path=blob.file_path,
+        content_hash=blob.sha256,
         duration_seconds=duration_seconds,
         recorded_at=recorded_at,
         recording_date=recording_date,
         location_text=location_text,
+        latitude=latitude,
+        longitude=longitude,
     )
     db.add(new_recording)
     await db.commit()
     await db.refresh(new_recording)
+    resolve_location_soon(location_text)
     return RecordingResponse.model_validate(new_recording)
 
 
@@ -151,6 +185,10 @@ async def update_recording(
     if "recorded_at" in update_data:
         recording.recording_date = update_data["recorded_at"].date()
 
+    if "location_text" in update_data:
+        recording.latitude, recording.longitude = parse_location_text(recording.location_text) or (None, None)
+        resolve_location_soon(recording.location_text)
+
     await db.commit()
     await db.refresh(recording)
     return RecordingResponse.model_validate(recording)
@@ -161,13 +199,14 @@ async def delete_recording(db: AsyncSession, recording_id: int, user_id: int) ->
     Soft delete a recording.
     """
     recording = await get_recording_by_id(db, recording_id, user_id)
-    transcription = await get_transcription_by_id(db, recording.transcription_id)
-    if not recording or not transcription:
+    if not recording:
         return False
-    
+    transcription = await get_transcription_by_id(db, recording.transcription_id, user_id)
+
     recording.is_deleted = True
-    transcription.is_deleted = True
+    if transcription:
+        transcription.is_deleted = True
+    orphaned_files = await release_blob(db, recording.content_hash)
     await db.commit()
-    await db.refresh(recording)
-    await db.refresh(transcription)
+    await delete_blob_files(orphaned_files)
     return True
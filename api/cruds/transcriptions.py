@@ -1,10 +1,13 @@
 from typing import Optional
+from datetime import datetime, timedelta, timezone
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.models.recordings import Recording
 from api.models.transcriptions import Transcription
+from api.config.config import settings
 from api.schemas.transcriptions import (
+    TranscriptionStatus,
     TranscriptionCreate,
     TranscriptionUpdate,
     TranscriptionResponse,
@@ -41,6 +44,7 @@ async def create_transcription(
         recording_id=payload.recording_id,
         model_name=payload.model_name,
         status=payload.status or "pending",
+        queue=payload.queue,
         is_deleted=False,
     )
     db.add(new_transcription)
@@ -146,4 +150,78 @@ async def delete_transcription(
 
     transcription.is_deleted = True
     await db.commit()
-    return True
\ No newline at end of file
+    return True
+
+async def get_transcription_queue_stats(db: AsyncSession):
+    """
+    Status counts, oldest waiting row and rows past the reaper deadlines,
+    across all users.
+    """
+    now = datetime.now(timezone.utc)
+    processing_deadline = now - timedelta(seconds=settings.TRANSCRIPTION_VISIBILITY_TIMEOUT_SECONDS)
+    pending_deadline = now - timedelta(seconds=settings.TRANSCRIPTION_PENDING_DEADLINE_SECONDS)
+    waiting_since = func.coalesce(Transcription.claimed_at, Transcription.created_at)
+
+    status_result = await db.execute(
+        select(Transcription.status, func.count(), func.min(waiting_since), func.max(Transcription.attempts))
+        .where(Transcription.is_deleted == False)
+        .group_by(Transcription.status)
+    )
+
+    by_status = {}
+    for status, count, oldest, max_attempts in status_result.all():
+        key = status.value if hasattr(status, "value") else status
+        by_status[key] = {
+            "count": count,
+            "oldest_age_seconds": (now - oldest).total_seconds() if oldest else None,
+            "max_attempts": max_attempts,
+        }
+
+    stuck_result = await db.execute(
+        select(
+            func.count().filter(
+                Transcription.status == TranscriptionStatus.processing.value,
+                waiting_since < processing_deadline,
+            ),
+            func.count().filter(
+                Transcription.status == TranscriptionStatus.pending.value,
+                waiting_since < pending_deadline,
+            ),
+        ).where(Transcription.is_deleted == False)
+    )
+    stuck_processing, stuck_pending = stuck_result.one()
+
+    return {
+        "by_status": by_status,
+        "stuck_processing": stuck_processing,
+        "stuck_pending": stuck_pending,
+    }
+
+
+async def create_completed_transcription(
+    db: AsyncSession,
+    recording_id: int,
+    transcription_data: dict,
+    model_name: str,
+    queue: Optional[str] = None,
+):
+    """
+    Store a transcription produced outside the task queue (live sessions).
+    queue is where refinement passes for it must run.
+    """
+    new_transcription = Transcription(
+        recording_id=recording_id,
+        text=transcription_data["text"],
+        language=transcription_data["language"],
+        confidence=transcription_data["confidence"],
+        words=transcription_data["words"],
+        transcribed_at=transcription_data["transcribe_time"],
+        model_name=model_name,
+        status=TranscriptionStatus.completed.value,
+        queue=queue,
+        is_deleted=False,
+    )
+    db.add(new_transcription)
+    await db.commit()
+    await db.refresh(new_transcription)
+    return TranscriptionResponse.model_validate(new_transcription)
@@ -2,5 +2,7 @@ from api.connections.database_creation import Base
 from .users import User
 from .recordings import Recording
 from .transcriptions import Transcription
+from .audio_blobs import AudioBlob
+from .geocode_cache import GeocodeCache
 
-__all__ = ["Base", "User", "Recording", "Transcription"]
\ No newline at end of file
+__all__ = ["Base", "User", "Recording", "Transcription", "AudioBlob", "GeocodeCache"]
\ No newline at end of file
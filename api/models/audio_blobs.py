@@ -0,0 +1,29 @@
+from sqlalchemy import (
+    Column,
+    String,
+    Integer,
+    BigInteger,
+    Float,
+    Text,
+    DateTime,
+)
+from sqlalchemy.sql import func
+
+from api.connections.database_creation import Base
+
+
+class AudioBlob(Base):
+    __tablename__ = "audio_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    file_path = Column(Text, nullable=False)
+    size_bytes = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=1)
+    codec = Column(String, nullable=True)
+    duration_seconds = Column(Float, nullable=True)
+    original_path = Column(Text, nullable=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
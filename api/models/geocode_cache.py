@@ -0,0 +1,26 @@
+from sqlalchemy import (
+    Column,
+    String,
+    Integer,
+    Float,
+    DateTime,
+)
+from sqlalchemy.sql import func
+
+from api.connections.database_creation import Base
+
+
+class GeocodeCache(Base):
+    __tablename__ = "geocode_cache"
+
+    # Grid cell: coordinates divided by grid_degrees and rounded
+    grid_degrees = Column(Float, primary_key=True)
+    lat_bucket = Column(Integer, primary_key=True)
+    lon_bucket = Column(Integer, primary_key=True)
+    # NULL when the provider had no name for the cell
+    name = Column(String, nullable=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
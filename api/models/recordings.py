@@ -9,7 +9,8 @@ from sqlalchemy import (
     ForeignKey,
     Float,
     Enum,
-    Boolean
+    Boolean,
+    Index,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
@@ -29,16 +30,31 @@ class Recording(Base):
         index=True,
     )
     file_path = Column(Text, nullable=False)
+    content_hash = Column(String(64), nullable=True, index=True)
     duration_seconds = Column(Integer)
     recorded_at = Column(DateTime(timezone=True), nullable=False)
     recording_date = Column(Date, nullable=False, index=True, server_default=func.current_date())
     location_text = Column(String, nullable=True)
+    # Parsed from location_text ("lat,long") when it holds coordinates
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
     created_at = Column(
         DateTime(timezone=True),
         server_default=func.now(),
         nullable=False,
     )
     is_deleted = Column(Boolean, default=False)
+
+    __table_args__ = (
+        # GiST over the built-in point type; no PostGIS needed
+        Index(
+            "ix_recordings_location_point",
+            func.point(longitude, latitude),
+            postgresql_using="gist",
+            postgresql_where=latitude.isnot(None),
+        ),
+    )
+
     # One-to-one relationship
     transcription = relationship(
         "Transcription",
@@ -44,5 +44,13 @@ class Transcription(Base):
     )
     transcribed_at = Column(DateTime(timezone=True), nullable=True)
     words = Column(JSON, nullable=True)
+    # Delivery bookkeeping for the reaper: claims so far, last claim or
+    # heartbeat of the working task, claiming queue
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
+    # First claim only, never refreshed: created_at to here is the queue wait
+    first_claimed_at = Column(DateTime(timezone=True), nullable=True)
+    queue = Column(String, nullable=True)
+    error_message = Column(Text, nullable=True)
     is_deleted = Column(Boolean, default=False)
     recording = relationship("Recording", back_populates="transcription")
\ No newline at end of file
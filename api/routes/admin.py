@@ -0,0 +1,52 @@
+from typing import List, Optional, Union
+from fastapi import APIRouter, Body, Depends
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.schemas.return_response import SuccessResponse, FailureResponse
+from api.auth.dependencies import get_admin_user
+from api.connections.database_connection import get_async_db_session
+
+from api.cruds.transcriptions import get_transcription_queue_stats
+from api.services.queue_stats import queue_depths
+from api.services.dead_letter import list_dead_letters
+from celery_service.tasks.maintenance import redrive_dead_letters_task
+from celery_service.autoscaler import get_autoscaler_metrics
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+@router.get("/transcriptions/queue", response_model=Union[SuccessResponse, FailureResponse])
+async def get_transcription_queue_endpoint(
+    user = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_async_db_session),
+):
+    stats = await get_transcription_queue_stats(db)
+    stats["queue_depths"] = await run_in_threadpool(queue_depths)
+    return SuccessResponse(data=stats, message="Transcription queue retrieved successfully")
+
+
+@router.get("/transcriptions/dead-letter", response_model=Union[SuccessResponse, FailureResponse])
+async def get_dead_letters_endpoint(
+    user = Depends(get_admin_user),
+):
+    entries = await run_in_threadpool(list_dead_letters)
+    return SuccessResponse(data=entries, message="Dead-lettered transcriptions retrieved successfully")
+
+
+@router.post("/transcriptions/dead-letter/redrive", response_model=Union[SuccessResponse, FailureResponse])
+async def redrive_dead_letters_endpoint(
+    transcription_ids: Optional[List[int]] = Body(None, embed=True),
+    include_failed: bool = Body(False, embed=True),
+    user = Depends(get_admin_user),
+):
+    redrive_dead_letters_task.apply_async(args=[transcription_ids, include_failed], queue="high_priority")
+    return SuccessResponse(data=None, message="Re-drive queued")
+
+
+@router.get("/autoscaler", response_model=Union[SuccessResponse, FailureResponse])
+async def get_autoscaler_endpoint(
+    user = Depends(get_admin_user),
+):
+    metrics = await run_in_threadpool(get_autoscaler_metrics)
+    return SuccessResponse(data=metrics, message="Autoscaler metrics retrieved successfully")
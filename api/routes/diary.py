@@ -1,33 +1,100 @@
+import json
+import asyncio
 from datetime import date
+from datetime import date as _date
 from typing import Union, Optional
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.schemas.return_response import SuccessResponse, FailureResponse
 from api.auth.dependencies import get_authorized_db_user
 from api.connections.database_connection import get_async_db_session
 
-from api.schemas.diary import DiaryResponse
+from api.config.redis_client import get_async_redis_client
+from api.config.config import settings
 from api.cruds import diary as diary_crud
+from api.services.diary_jobs import create_job, discard_job, get_job
+from celery_service.tasks.diary import generate_diary_task
 
 router = APIRouter(prefix="/diary", tags=["Diary"])
 
 
-@router.post("", response_model=Union[SuccessResponse, FailureResponse])
+@router.post("", status_code=202, response_model=Union[SuccessResponse, FailureResponse])
 async def create_diary_endpoint(
     date: Optional[date] = None,
     user = Depends(get_authorized_db_user),
-    db: AsyncSession = Depends(get_async_db_session),
 ):
+    """
+    Queue diary generation for the day and return the job at once. Progress
+    and completion arrive on /diary/events; the job can also be polled.
+    """
     try:
-        result = await diary_crud.create_or_update_diary(db, user.id, date)
+        job, created = create_job(user.id, date or _date.today())
+        if created:
+            try:
+                generate_diary_task.apply_async(
+                    kwargs={"job_id": job["job_id"], "user_id": user.id, "diary_date": job["diary_date"]},
+                    queue="high_priority",
+                )
+            except Exception:
+                discard_job(job)
+                raise
         return SuccessResponse(
-            data=result,
-            message="Diary created/updated successfully",
+            data=job,
+            message="Diary generation queued" if created else "Diary generation already in progress",
         )
     except Exception as e:
         return FailureResponse(message=str(e))
 
+
+@router.get("/jobs/{job_id}", response_model=Union[SuccessResponse, FailureResponse])
+async def get_diary_job_endpoint(
+    job_id: str,
+    user = Depends(get_authorized_db_user),
+):
+    job = get_job(job_id)
+    if not job or job["user_id"] != user.id:
+        return FailureResponse(message="Diary job not found")
+    return SuccessResponse(data=job, message="Diary job fetched successfully")
+
+
+@router.get("/events")
+async def diary_events(
+    request: Request,
+    user = Depends(get_authorized_db_user),
+):
+    """
+    Server-sent events for the user's diary jobs (status and stage changes).
+    """
+
+    async def event_generator():
+        redis_client = get_async_redis_client()
+        pubsub = redis_client.pubsub()
+        await pubsub.subscribe(settings.DIARY_EVENTS_CHANNEL)
+
+        try:
+            async for message in pubsub.listen():
+                if await request.is_disconnected():
+                    break
+
+                if message['type'] == 'message':
+                    data = message['data']
+                    if isinstance(data, bytes):
+                        data = data.decode('utf-8')
+                    if json.loads(data).get("user_id") == user.id:
+                        yield f"data: {data}\n\n"
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await pubsub.close()
+            await redis_client.close()
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream"
+    )
+
 @router.get("", response_model=Union[SuccessResponse, FailureResponse])
 async def get_diary_endpoint(
     date: Optional[date] = None,
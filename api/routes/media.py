@@ -0,0 +1,72 @@
+import mimetypes
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from api.storage import get_storage
+
+router = APIRouter(prefix="/recordings", tags=["Media"])
+
+
+def _parse_range(range_header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """
+    Parse a single ``bytes=start-end`` range into an inclusive (start, end).
+    """
+    if not range_header or not range_header.startswith("bytes="):
+        return None
+    spec = range_header[len("bytes="):].split(",")[0].strip()
+    start_str, _, end_str = spec.partition("-")
+    try:
+        if start_str:
+            start = int(start_str)
+            end = int(end_str) if end_str else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start = max(size - int(end_str), 0)
+            end = size - 1
+    except ValueError:
+        return None
+    if start > end or start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, min(end, size - 1)
+
+
+@router.get("/{file_path:path}", include_in_schema=False)
+async def get_recording_file(file_path: str, request: Request):
+    """
+    Serve a recording from the configured storage backend with Range support.
+    """
+    storage = get_storage()
+    try:
+        size = await run_in_threadpool(storage.size, file_path)
+    except ValueError:
+        size = None
+    if size is None:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    media_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+    byte_range = _parse_range(request.headers.get("range"), size)
+
+    if byte_range is None:
+        return StreamingResponse(
+            storage.open_read(file_path),
+            media_type=media_type,
+            headers={"Accept-Ranges": "bytes", "Content-Length": str(size)},
+        )
+
+    start, end = byte_range
+    return StreamingResponse(
+        storage.open_read(file_path, start, end),
+        status_code=206,
+        media_type=media_type,
+        headers={
+            "Accept-Ranges": "bytes",
+            "Content-Range": f"bytes {start}-{end}/{size}",
+            "Content-Length": str(end - start + 1),
+        },
+    )
@@ -1,24 +1,54 @@
-from fastapi import APIRouter, Body, Depends, UploadFile, File, HTTPException, Form
+import os
+import json
+import asyncio
+import logging
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Form, Request, Header, Query, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Union, Optional
 from datetime import datetime, date
 
 from api.schemas.return_response import SuccessResponse, FailureResponse
-from api.auth.dependencies import get_authorized_db_user
+from api.auth.dependencies import get_authorized_db_user, get_websocket_user
 from api.connections.database_connection import get_async_db_session
 from api.cruds.recordings import (
     create_recording,
+    create_recording_from_staged,
     get_all_recordings,
     get_recording_by_id,
     update_recording,
     delete_recording
 )
 
-from api.cruds.transcriptions import create_transcription
-from celery_service.tasks.transcription import transcribe_audio_task
+from api.cruds.transcriptions import create_transcription, create_completed_transcription
+from celery_service.tasks.transcription import (
+    enqueue_transcription,
+    first_pass_model,
+    needs_refinement,
+    publish_transcription_event,
+)
 
-from api.schemas.recordings import RecordingCreate,RecordingUpdate, RecordingResponse
+from api.schemas.recordings import (
+    RecordingCreate,
+    RecordingUpdate,
+    RecordingResponse,
+    UploadSessionCreate,
+)
 from api.schemas.transcriptions import TranscriptionCreate
+from api.utils.upload_writer import write_stream_to_staging
+from api.config.config import settings
+from api.services.live_transcription import LiveTranscriber, encode_recording
+from api.services.transcription_backends import backend_for_queue
+from api.services.upload_sessions import (
+    create_upload_session,
+    get_upload_session_status,
+    append_upload_chunk,
+    finalize_upload_session,
+    discard_upload_session,
+    upload_session_lock,
+)
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/recordings", tags=["Recordings"])
 
@@ -31,6 +61,7 @@ async def create_recording_endpoint(
     duration_seconds: int = Form(...),
     recorded_at: datetime = Form(...),
     location_text: str | None = Form(None),
+    on_device: bool = Form(False),
     user = Depends(get_authorized_db_user),
     db: AsyncSession = Depends(get_async_db_session)
 ):
@@ -56,9 +87,19 @@ async def create_recording_endpoint(
         recording_data=payload
     )
 
-    # 2. Create transcription
+    # 2. Create transcription and enqueue it
+    await _start_transcription(db, new_recording, user, on_device)
+
+    return SuccessResponse(data=new_recording, message="Recording created successfully")
+
+
+async def _start_transcription(db: AsyncSession, new_recording: RecordingResponse, user, on_device: bool = False):
+    # Private recordings go to the queue served by the local CPU engine; the
+    # row remembers it so re-enqueues never route it to a cloud queue
+    queue = settings.TRANSCRIPTION_LOCAL_QUEUE if on_device else "default"
     create_transcription_payload = TranscriptionCreate(
-        recording_id=new_recording.id
+        recording_id=new_recording.id,
+        queue=queue,
     )
     transcription = await create_transcription(
         db=db,
@@ -66,10 +107,255 @@ async def create_recording_endpoint(
         user_id=user.id,
     )
 
-    # 3. enqueue celery task
     if transcription:
-        transcribe_audio_task.apply_async(args=[transcription.id], queue="default")
+        enqueue_transcription(
+            transcription.id, queue, user_id=user.id, cost=new_recording.duration_seconds
+        )
+
+
+@router.post("/stream", response_model=Union[SuccessResponse, FailureResponse])
+async def create_recording_stream_endpoint(
+    request: Request,
+    duration_seconds: Optional[int] = Query(None),
+    recorded_at: Optional[datetime] = Query(None),
+    location_text: Optional[str] = Query(None),
+    filename: Optional[str] = Query(None),
+    on_device: bool = Query(False),
+    x_duration_seconds: Optional[int] = Header(None),
+    x_recorded_at: Optional[datetime] = Header(None),
+    x_location_text: Optional[str] = Header(None),
+    x_filename: Optional[str] = Header(None),
+    user = Depends(get_authorized_db_user),
+    db: AsyncSession = Depends(get_async_db_session)
+):
+    """
+    Raw upload: the request body is the audio itself (application/octet-stream
+    or audio/*) and is streamed straight to disk without multipart spooling.
+    Metadata comes from query parameters or the matching X-* headers.
+    """
+    content_type = (request.headers.get("content-type") or "").lower()
+    if not (content_type.startswith("application/octet-stream") or content_type.startswith("audio/")):
+        raise HTTPException(status_code=415, detail="Body must be application/octet-stream or audio/*")
+
+    filename = filename or x_filename
+    if filename and not any(filename.lower().endswith(ext) for ext in _ALLOWED_AUDIO_EXTENSIONS):
+        raise HTTPException(status_code=400, detail="Uploaded file must be an audio file")
+
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Uploaded file exceeds the {settings.MAX_UPLOAD_BYTES} byte limit",
+        )
+
+    duration_seconds = duration_seconds if duration_seconds is not None else x_duration_seconds
+    recorded_at = recorded_at or x_recorded_at
+    if duration_seconds is None or recorded_at is None:
+        raise HTTPException(status_code=422, detail="duration_seconds and recorded_at are required")
+
+    payload = RecordingCreate(
+        duration_seconds=duration_seconds,
+        recorded_at=recorded_at,
+        location_text=location_text or x_location_text,
+    )
+
+    # End the auth query's transaction so no pooled connection sits idle
+    # while a slow client streams the body
+    await db.commit()
+    staged = await write_stream_to_staging(request.stream())
+    new_recording = await create_recording_from_staged(
+        db=db,
+        staged=staged,
+        filename=filename,
+        user_id=user.id,
+        user_sub=user.google_id,
+        recording_data=payload
+    )
+
+    await _start_transcription(db, new_recording, user, on_device)
+
+    return SuccessResponse(data=new_recording, message="Recording created successfully")
+
+
+async def _iter_file(path: str):
+    with open(path, "rb") as f:
+        while chunk := await run_in_threadpool(f.read, settings.UPLOAD_CHUNK_SIZE):
+            yield chunk
+
+
+@router.websocket("/live")
+async def live_recording_endpoint(
+    websocket: WebSocket,
+    recorded_at: Optional[datetime] = Query(None),
+    location_text: Optional[str] = Query(None),
+    on_device: bool = Query(False),
+    db: AsyncSession = Depends(get_async_db_session)
+):
+    """
+    Live recording: the client streams 16 kHz mono s16le PCM as binary
+    frames and receives {"type": "partial" | "final"} text while it records.
+    {"type": "stop"} finalises the session and persists the Recording and
+    its Transcription ({"type": "saved"}); {"type": "cancel"} discards it.
+    """
+    user = await get_websocket_user(websocket, db)
+    # Don't pin a pooled connection for the whole recording; the session
+    # checks out a fresh one when the result is persisted
+    await db.commit()
+    if not user:
+        await websocket.close(code=1008)
+        return
+    await websocket.accept()
+
+    queue = settings.TRANSCRIPTION_LOCAL_QUEUE if on_device else "default"
+    backend = backend_for_queue(queue)
+    model = first_pass_model()
+    recorded_at = recorded_at or datetime.now().astimezone()
+    send_lock = asyncio.Lock()
+
+    async def send(message: dict):
+        async with send_lock:
+            await websocket.send_text(json.dumps(message))
+
+    transcriber = LiveTranscriber(send, backend, model)
+    await send({"type": "ready"})
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes"):
+                if len(transcriber.pcm) + len(message["bytes"]) > settings.MAX_UPLOAD_BYTES:
+                    await send({"type": "error", "message": "Recording exceeds the upload limit"})
+                    await websocket.close(code=1009)
+                    return
+                await transcriber.feed(message["bytes"])
+            elif message.get("text"):
+                try:
+                    command = json.loads(message["text"]).get("type")
+                except (ValueError, AttributeError):
+                    # A bad control frame must not cost the buffered audio
+                    await send({"type": "error", "message": "Control messages must be JSON objects"})
+                    continue
+                if command == "cancel":
+                    await websocket.close()
+                    return
+                if command == "stop":
+                    break
+    except WebSocketDisconnect:
+        return
+
+    transcription_data = await transcriber.finish()
+    if not transcriber.pcm:
+        await websocket.close()
+        return
+
+    encoded_path = await run_in_threadpool(encode_recording, bytes(transcriber.pcm))
+    try:
+        staged = await write_stream_to_staging(_iter_file(encoded_path))
+    finally:
+        os.unlink(encoded_path)
+
+    new_recording = await create_recording_from_staged(
+        db=db,
+        staged=staged,
+        filename=f"live_{int(recorded_at.timestamp())}{os.path.splitext(encoded_path)[1]}",
+        user_id=user.id,
+        user_sub=user.google_id,
+        recording_data=RecordingCreate(
+            duration_seconds=round(transcriber.duration),
+            recorded_at=recorded_at,
+            location_text=location_text,
+        ),
+    )
+
+    if transcription_data is None:
+        # Some windows failed: fall back to the regular pipeline
+        await _start_transcription(db, new_recording, user, on_device)
+        transcription = None
+    else:
+        transcription = await create_completed_transcription(
+            db, new_recording.id, transcription_data, backend.model_label(model), queue
+        )
+        await run_in_threadpool(publish_transcription_event, transcription)
+        if needs_refinement(transcription, model):
+            enqueue_transcription(
+                transcription.id, queue, settings.TRANSCRIPTION_MODEL,
+                user_id=user.id, cost=new_recording.duration_seconds,
+            )
+
+    await send({
+        "type": "saved",
+        "recording": new_recording.model_dump(mode="json"),
+        "transcription": transcription.model_dump(mode="json") if transcription else None,
+    })
+    await websocket.close()
+
+
+@router.post("/uploads", response_model=Union[SuccessResponse, FailureResponse])
+async def create_upload_session_endpoint(
+    payload: UploadSessionCreate,
+    user = Depends(get_authorized_db_user),
+):
+    filename = (payload.filename or "").lower()
+    if filename and not any(filename.endswith(ext) for ext in _ALLOWED_AUDIO_EXTENSIONS):
+        raise HTTPException(status_code=400, detail="Uploaded file must be an audio file")
+
+    session = await create_upload_session(user.id, payload)
+    return SuccessResponse(data=session, message="Upload session created successfully")
+
+
+@router.get("/uploads/{session_id}", response_model=Union[SuccessResponse, FailureResponse])
+async def get_upload_session_endpoint(
+    session_id: str,
+    user = Depends(get_authorized_db_user),
+):
+    session = await get_upload_session_status(session_id, user.id)
+    return SuccessResponse(data=session, message="Upload session retrieved successfully")
+
+
+@router.put("/uploads/{session_id}", response_model=Union[SuccessResponse, FailureResponse])
+async def upload_chunk_endpoint(
+    session_id: str,
+    request: Request,
+    content_range: str = Header(...),
+    user = Depends(get_authorized_db_user),
+    db: AsyncSession = Depends(get_async_db_session)
+):
+    # Return the auth query's connection to the pool before the body streams
+    await db.commit()
+    session = await append_upload_chunk(session_id, user.id, content_range, request.stream())
+    return SuccessResponse(data=session, message="Chunk uploaded successfully")
+
+
+@router.post("/uploads/{session_id}/complete", response_model=Union[SuccessResponse, FailureResponse])
+async def complete_upload_session_endpoint(
+    session_id: str,
+    user = Depends(get_authorized_db_user),
+    db: AsyncSession = Depends(get_async_db_session)
+):
+    # Held until the session is discarded: a concurrent complete then finds
+    # it busy or gone, never a second copy of the same upload
+    async with upload_session_lock(session_id):
+        meta, staged = await finalize_upload_session(session_id, user.id)
+
+        payload = RecordingCreate(
+            duration_seconds=meta["duration_seconds"],
+            recorded_at=meta["recorded_at"],
+            location_text=meta["location_text"],
+        )
+
+        new_recording = await create_recording_from_staged(
+            db=db,
+            staged=staged,
+            filename=meta["filename"],
+            user_id=user.id,
+            user_sub=user.google_id,
+            recording_data=payload
+        )
+        await discard_upload_session(session_id)
 
+    await _start_transcription(db, new_recording, user, meta.get("on_device", False))
 
     return SuccessResponse(data=new_recording, message="Recording created successfully")
 
@@ -20,14 +20,32 @@ class RecordingResponse(BaseModel):
     id: int
     user_id: int
     file_path: str
+    content_hash: Optional[str] = None
     duration_seconds: int
     recorded_at: datetime
     recording_date: date
     location_text: Optional[str]
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     created_at: datetime
     is_deleted: bool
     transcription_status: Optional[str] = None
     transcription_id: Optional[int] = None
     transcription_confidence: Optional[float] = None
     
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class UploadSessionCreate(BaseModel):
+    duration_seconds: int
+    recorded_at: datetime
+    location_text: Optional[str] = None
+    filename: Optional[str] = None
+    total_bytes: Optional[int] = None
+    on_device: bool = False
+
+
+class UploadSessionResponse(BaseModel):
+    session_id: str
+    offset: int
+    total_bytes: Optional[int] = None
+    expires_at: datetime
@@ -11,11 +11,14 @@ class TranscriptionStatus(str, PyEnum):
     processing = "processing"
     completed = "completed"
     failed = "failed"
+    dead_letter = "dead_letter"
 
 class TranscriptionCreate(BaseModel):
     recording_id: int
     model_name: str = config.TRANSCRIPTION_MODEL
     status: TranscriptionStatus = TranscriptionStatus.pending.value
+    # Queue the row is served from; on-device rows must stay on the local queue
+    queue: Optional[str] = None
     created_at: datetime = datetime.now()
 
     model_config = ConfigDict(from_attributes=True)
@@ -40,6 +43,8 @@ class TranscriptionResponse(BaseModel):
     created_at: datetime
     transcribed_at: Optional[datetime]
     words: Optional[list] = None
+    attempts: int = 0
+    error_message: Optional[str] = None
     is_deleted: bool
 
     model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -1,10 +1,9 @@
-import os
+import asyncio
 import uvicorn
 import logging
 from api.config.config import settings
 
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 
 from api.connections.database_connection import (
@@ -13,6 +12,8 @@ from api.connections.database_connection import (
     create_all_tables,
     async_disconnect,
 )
+from api.config.client import close_clients
+from api.services.gazetteer import get_gazetteer
 
 # Routes
 from api.routes import (
@@ -22,7 +23,9 @@ from api.routes import (
     transcriptions,
     transcription_event,
     history,
-    diary
+    diary,
+    media,
+    admin
 )
 
 from api.utils.logging_config import setup_logging
@@ -45,9 +48,12 @@ async def lifespan(app: FastAPI):
     await create_database_if_not_exists()
     await setup_engine_and_session()
     await create_all_tables()
+    # Parse/map the offline gazetteer now rather than on the first upload
+    await asyncio.to_thread(get_gazetteer)
     logger.info("Application lifespan started successfully")
     yield
     logger.info("Application lifespan shutdown: disconnecting database")
+    await close_clients()
     await async_disconnect()
     logger.info("Application shutdown cleanup complete")
 
@@ -80,9 +86,6 @@ app.add_middleware(
 )
 logger.info("CORS middleware configured to allow all origins")
 
-os.makedirs("recordings", exist_ok=True)
-app.mount("/recordings", StaticFiles(directory="recordings"), name="recordings")
-
 # Include routers
 app.include_router(authentication.router)
 app.include_router(home.router, prefix="/api")
@@ -91,6 +94,9 @@ app.include_router(transcriptions.router, prefix="/api")
 app.include_router(transcription_event.router,prefix="/api")
 app.include_router(history.router, prefix="/api")
 app.include_router(diary.router, prefix="/api")
+app.include_router(admin.router, prefix="/api")
+# Recording files are served from the storage backend (local disk or S3)
+app.include_router(media.router)
 
 # Test route
 @app.get("/", include_in_schema=False)
@@ -0,0 +1,215 @@
+import os
+import time
+import uuid
+import shutil
+import logging
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+from typing import Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+
+from api.config.redis_client import get_cache_redis_client
+from api.models.audio_blobs import AudioBlob
+from api.models.recordings import Recording
+from api.storage import get_storage
+from api.services.vad import SAMPLE_RATE
+
+from api.config.config import settings as CONFIG
+
+logger = logging.getLogger(__name__)
+
+_CODEC_OPTIONS = {
+    "opus": (".ogg", ["-c:a", "libopus", "-b:a", CONFIG.TRANSCODE_OPUS_BITRATE, "-application", "voip"]),
+    "flac": (".flac", ["-c:a", "flac"]),
+}
+
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=CONFIG.TRANSCODE_WORKERS)
+        return _pool
+
+
+def ffmpeg_available() -> bool:
+    return shutil.which("ffmpeg") is not None and shutil.which("ffprobe") is not None
+
+
+def probe_duration(path: str) -> float:
+    """
+    Decoded duration of an audio file in seconds, via ffprobe.
+    """
+    result = subprocess.run(
+        [
+            "ffprobe", "-v", "error",
+            "-show_entries", "format=duration",
+            "-of", "default=noprint_wrappers=1:nokey=1",
+            path,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout.strip())
+
+
+def transcode_file(source: str, destination: str, codec: str) -> float:
+    """
+    Normalize audio to mono at TRANSCODE_SAMPLE_RATE in the given codec.
+    Runs in the process pool; returns the decoded duration of the output.
+    """
+    _, codec_args = _CODEC_OPTIONS[codec]
+    subprocess.run(
+        [
+            "ffmpeg", "-y", "-v", "error",
+            "-i", source,
+            "-vn", "-ac", "1", "-ar", str(CONFIG.TRANSCODE_SAMPLE_RATE),
+            *codec_args,
+            destination,
+        ],
+        capture_output=True,
+        check=True,
+    )
+    return probe_duration(destination)
+
+
+def _claim_key(sha256: str) -> str:
+    return f"transcode:claim:{sha256}"
+
+
+def _wait_for_claim(sha256: str) -> None:
+    redis_client = get_cache_redis_client()
+    deadline = time.monotonic() + CONFIG.TRANSCODE_CLAIM_SECONDS
+    while redis_client.exists(_claim_key(sha256)) and time.monotonic() < deadline:
+        time.sleep(1)
+
+
+def codec_extension(codec: str) -> str:
+    return _CODEC_OPTIONS[codec][0]
+
+
+def encode_pcm(pcm: bytes, destination: str, codec: str) -> None:
+    """
+    Encode raw 16 kHz mono s16le PCM with the given codec's settings, so
+    chunks sent to the provider are as compact as the stored rendition.
+    """
+    _, codec_args = _CODEC_OPTIONS[codec]
+    subprocess.run(
+        [
+            "ffmpeg", "-y", "-v", "error",
+            "-f", "s16le", "-ar", str(SAMPLE_RATE), "-ac", "1", "-i", "-",
+            "-ar", str(CONFIG.TRANSCODE_SAMPLE_RATE),
+            *codec_args,
+            destination,
+        ],
+        input=pcm,
+        capture_output=True,
+        check=True,
+    )
+
+
+def ensure_transcoded(db: Any, recording: Recording) -> None:
+    """
+    Replace a recording's stored audio with the compact transcoded rendition.
+
+    The work is shared by every recording of the same blob: the blob is
+    transcoded once, all recordings pointing at it are repointed, and the
+    original is deleted unless KEEP_ORIGINAL_AUDIO is set. The reported
+    duration_seconds is checked against the decoded length and corrected.
+
+    The transcode is claimed with a short-lived Redis flag and runs without
+    any database lock; the blob row is locked only for the final update.
+    A worker that finds the blob claimed waits for the claim to go and
+    picks up the new file path. Uses the synchronous session of the Celery
+    worker.
+    """
+    if not CONFIG.TRANSCODE_ENABLED or not recording.content_hash:
+        return
+    if not ffmpeg_available():
+        logger.warning("ffmpeg/ffprobe not found, skipping transcoding")
+        return
+
+    blob = db.query(AudioBlob).filter(AudioBlob.sha256 == recording.content_hash).first()
+    original_key = blob.file_path if blob else None
+    done = not blob or blob.codec == CONFIG.TRANSCODE_CODEC
+    db.commit()
+    if done:
+        return
+
+    token = uuid.uuid4().hex
+    redis_client = get_cache_redis_client()
+    if not redis_client.set(_claim_key(recording.content_hash), token, nx=True, ex=CONFIG.TRANSCODE_CLAIM_SECONDS):
+        _wait_for_claim(recording.content_hash)
+        db.refresh(recording)
+        return
+    try:
+        _transcode_blob(db, recording.content_hash, original_key)
+    finally:
+        redis_client.eval(_RELEASE_SCRIPT, 1, _claim_key(recording.content_hash), token)
+
+
+def _transcode_blob(db: Any, sha256: str, original_key: str) -> None:
+    storage = get_storage()
+    extension, _ = _CODEC_OPTIONS[CONFIG.TRANSCODE_CODEC]
+    transcoded_key = str(Path(original_key).with_suffix(extension)).replace("\\", "/")
+    if transcoded_key == original_key:
+        transcoded_key = str(Path(original_key).with_suffix(f".{CONFIG.TRANSCODE_CODEC}{extension}")).replace("\\", "/")
+
+    fd, tmp_output = tempfile.mkstemp(suffix=extension)
+    os.close(fd)
+    try:
+        with storage.local_copy(original_key) as source_path:
+            decoded_duration = _get_pool().submit(
+                transcode_file, str(source_path), tmp_output, CONFIG.TRANSCODE_CODEC
+            ).result()
+        transcoded_size = os.path.getsize(tmp_output)
+        storage.put_file(Path(tmp_output), transcoded_key)
+    finally:
+        Path(tmp_output).unlink(missing_ok=True)
+
+    blob = (
+        db.query(AudioBlob)
+        .filter(AudioBlob.sha256 == sha256)
+        .with_for_update()
+        .first()
+    )
+    if not blob or blob.file_path != original_key or blob.codec == CONFIG.TRANSCODE_CODEC:
+        # Released or replaced while we were transcoding; drop our rendition
+        db.commit()
+        if not blob or blob.file_path != transcoded_key:
+            storage.delete(transcoded_key)
+        return
+
+    blob.file_path = transcoded_key
+    blob.codec = CONFIG.TRANSCODE_CODEC
+    blob.duration_seconds = decoded_duration
+    blob.original_path = original_key if CONFIG.KEEP_ORIGINAL_AUDIO else None
+    blob.size_bytes = transcoded_size
+
+    for rec in db.query(Recording).filter(Recording.content_hash == blob.sha256).all():
+        rec.file_path = transcoded_key
+        if rec.duration_seconds is None or abs(rec.duration_seconds - decoded_duration) > CONFIG.DURATION_TOLERANCE_SECONDS:
+            logger.warning(
+                "Recording %s reported %ss but decodes to %.1fs, correcting",
+                rec.id, rec.duration_seconds, decoded_duration,
+            )
+            rec.duration_seconds = round(decoded_duration)
+
+    db.commit()
+
+    if not CONFIG.KEEP_ORIGINAL_AUDIO:
+        storage.delete(original_key)
+    logger.info("Transcoded %s -> %s", original_key, transcoded_key)
@@ -0,0 +1,55 @@
+""" Dead-letter store for transcription tasks that will not be retried automatically """
+import json
+import time
+import logging
+from typing import Any, Dict, List, Optional
+
+from api.config.redis_client import get_cache_redis_client
+
+logger = logging.getLogger(__name__)
+
+_DEAD_LETTER_KEY = "transcription:dead_letter"
+
+
+def push_dead_letter(
+    transcription_id: int,
+    queue: Optional[str],
+    model: Optional[str],
+    error: Optional[str],
+    attempts: int,
+    reason: str,
+) -> None:
+    """
+    Record the task payload and last error; one entry per transcription.
+    """
+    redis_client = get_cache_redis_client()
+    if redis_client is None:
+        return
+    entry = {
+        "transcription_id": transcription_id,
+        "queue": queue or "default",
+        "model": model,
+        "error": error,
+        "attempts": attempts,
+        "reason": reason,
+        "dead_lettered_at": time.time(),
+    }
+    try:
+        redis_client.hset(_DEAD_LETTER_KEY, str(transcription_id), json.dumps(entry))
+    except Exception as e:
+        logger.error(f"Could not dead-letter transcription {transcription_id}: {e}")
+
+
+def list_dead_letters() -> List[Dict[str, Any]]:
+    redis_client = get_cache_redis_client()
+    if redis_client is None:
+        return []
+    entries = [json.loads(raw) for raw in redis_client.hvals(_DEAD_LETTER_KEY)]
+    return sorted(entries, key=lambda entry: entry["dead_lettered_at"])
+
+
+def remove_dead_letters(transcription_ids: List[int]) -> None:
+    redis_client = get_cache_redis_client()
+    if redis_client is None or not transcription_ids:
+        return
+    redis_client.hdel(_DEAD_LETTER_KEY, *[str(i) for i in transcription_ids])
@@ -1,7 +1,8 @@
 import json
-import httpx
+import logging
+from collections import Counter
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 from datetime import datetime
 
 from api.models.recordings import Recording
@@ -9,47 +10,72 @@ from api.models.transcriptions import Transcription
 
 from api.config.config import settings as CONFIG
 from api.config.client import llm_client
+from api.services.geocoding import reverse_geocode
+from api.services.visits import Visit, cluster_visits
 from prompts.diary_ai import DIARY_AI_PROMPT
 
-async def get_location_by_lat_long(lat: float, long: float) -> str:
-    headers = {
-        "User-Agent": "PanaLocation/1.0"
-    }
-    location_url_full = CONFIG.LOCATION_URL.format(lat=lat, long=long)
-    async with httpx.AsyncClient() as client:
-        response = await client.get(location_url_full, headers=headers)
-        data = response.json()
-        return data.get("name")
+logger = logging.getLogger(__name__)
+
+async def _visit_location(db: Any, visit: Visit) -> str:
+    """
+    One lookup per visit, at the centroid of its clips; the raw coordinates
+    stand in if it cannot be resolved.
+    """
+    if visit.latitude is None:
+        return "Unknown Location"
+    try:
+        return await reverse_geocode(db, visit.latitude, visit.longitude) or "Unknown Location"
+    except Exception as e:
+        logger.warning(f"Could not resolve {visit.latitude},{visit.longitude}: {e}")
+        return f"{visit.latitude:.5f},{visit.longitude:.5f}"
 
 async def ensure_all_transcriptions(
     recordings: List[Recording], 
     db: Any, 
     user_id: int
 ):
+    """
+    Queue missing or pending transcriptions. Rows already being processed,
+    transcriptions already in flight and failed or dead-lettered rows (which
+    need a re-drive) are left alone, so repeated diary requests never stack
+    duplicate tasks.
+    """
     from api.cruds.transcriptions import create_transcription
-    from api.schemas.transcriptions import TranscriptionCreate
-    from celery_service.tasks.transcription import transcribe_audio_task
+    from api.schemas.transcriptions import TranscriptionCreate, TranscriptionStatus
+    from celery_service.tasks.transcription import enqueue_transcription, promote_transcription
 
     for recording in recordings:
         transcription = getattr(recording, "transcription", None)
         if not transcription:
-            payload = TranscriptionCreate(recording_id=recording.id)
+            payload = TranscriptionCreate(recording_id=recording.id, queue="high_priority")
             new_trans = await create_transcription(db=db, payload=payload, user_id=user_id)
             if new_trans:
-                transcribe_audio_task.apply_async(args=[new_trans.id], queue="high_priority")
-        elif not transcription.status == "completed":
-            transcribe_audio_task.apply_async(args=[transcription.id], queue="high_priority")
+                enqueue_transcription(new_trans.id, "high_priority")
+        elif transcription.status == TranscriptionStatus.pending:
+            if transcription.queue == CONFIG.TRANSCRIPTION_LOCAL_QUEUE:
+                # On-device recordings stay on the local queue
+                enqueue_transcription(transcription.id, transcription.queue)
+            else:
+                # Jump the user's own fair-share backlog
+                promote_transcription(transcription.id, user_id)
 
 async def generate_diary_from_recordings(
     db: Any,
     user_id: int,
     recordings: List[Recording], 
-    transcriptions: List[Transcription]
+    transcriptions: List[Transcription],
+    on_progress: Optional[Callable[[str], None]] = None,
 ) -> Dict[str, Any]:
-    await ensure_all_transcriptions(recordings, db, user_id)
+    """
+    on_progress, if given, is called with the stage being entered:
+    "transcripts", "locations" and "writing".
+    """
+    report = on_progress or (lambda stage: None)
 
-    events_data = []
+    report("transcripts")
+    await ensure_all_transcriptions(recordings, db, user_id)
 
+    usable = []
     for r in recordings:
         transcription = getattr(r, "transcription", None)
         
@@ -60,20 +86,19 @@ async def generate_diary_from_recordings(
         if (transcription.confidence or 0) <= CONFIG.TRANSCRIPTION_CONFIDENCE_THRESHOLD:
             continue
 
-        # Resolve location
-        location_resolved = "Unknown Location"
-        if r.location_text and "," in r.location_text:
-            try:
-                lat_str, lon_str = r.location_text.split(",")
-                location_resolved = await get_location_by_lat_long(float(lat_str), float(lon_str))
-            except Exception:
-                location_resolved = r.location_text # Fallback to raw coords if resolution fails
+        usable.append(r)
 
+    # One event per place visited rather than per clip
+    report("locations")
+    events_data = []
+    for visit in cluster_visits(usable):
+        languages = Counter(r.transcription.language for r in visit.recordings if r.transcription.language)
         events_data.append({
-            "diary_date": r.recorded_at.isoformat() if isinstance(r.recorded_at, datetime) else str(r.recorded_at),
-            "text": transcription.text,
-            "location": location_resolved,
-            "language": transcription.language or "unknown"
+            "timestamp": visit.start.isoformat(),
+            "end_timestamp": visit.end.isoformat(),
+            "text": "\n\n".join(r.transcription.text for r in visit.recordings),
+            "location": await _visit_location(db, visit),
+            "language": languages.most_common(1)[0][0] if languages else "unknown"
         })
 
     if not events_data:
@@ -84,6 +109,7 @@ async def generate_diary_from_recordings(
         }
 
     # Construct Prompt
+    report("writing")
     input_json = json.dumps({"events": events_data}, indent=2)
     user_message = f"Here are my events for today:\n\n{input_json}\n\nPlease generate my diary entry."
 
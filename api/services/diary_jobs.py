@@ -0,0 +1,96 @@
+""" Status of background diary generation jobs, kept in Redis and published as events """
+import json
+import time
+import uuid
+import logging
+from datetime import date
+from typing import Any, Dict, Optional, Tuple
+
+from api.config.redis_client import get_cache_redis_client, get_redis_client
+
+from api.config.config import settings as CONFIG
+
+logger = logging.getLogger(__name__)
+
+_TERMINAL = {"completed", "failed"}
+
+
+def _job_key(job_id: str) -> str:
+    return f"diary:job:{job_id}"
+
+
+def _active_key(user_id: int, diary_date: date) -> str:
+    return f"diary:job:active:{user_id}:{diary_date.isoformat()}"
+
+
+def create_job(user_id: int, diary_date: date) -> Tuple[Dict[str, Any], bool]:
+    """
+    Register a job for the user's day. If one is already queued or running
+    for that day it is returned instead, with created=False, unless it is
+    older than DIARY_JOB_STALE_SECONDS (its worker died or the message was
+    lost); a stale job is marked failed and replaced.
+    """
+    redis_client = get_cache_redis_client()
+    job_id = uuid.uuid4().hex
+    if not redis_client.set(_active_key(user_id, diary_date), job_id, nx=True, ex=CONFIG.DIARY_JOB_TTL_SECONDS):
+        current = redis_client.get(_active_key(user_id, diary_date))
+        existing = get_job(current.decode()) if current else None
+        if existing and existing["status"] not in _TERMINAL:
+            if time.time() - existing["created_at"] < CONFIG.DIARY_JOB_STALE_SECONDS:
+                return existing, False
+            update_job(existing["job_id"], status="failed", stage=None, error="Diary generation timed out")
+        redis_client.set(_active_key(user_id, diary_date), job_id, ex=CONFIG.DIARY_JOB_TTL_SECONDS)
+
+    now = time.time()
+    job = {
+        "job_id": job_id,
+        "user_id": user_id,
+        "diary_date": diary_date.isoformat(),
+        "status": "queued",
+        "stage": None,
+        "error": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+    redis_client.set(_job_key(job_id), json.dumps(job), ex=CONFIG.DIARY_JOB_TTL_SECONDS)
+    return job, True
+
+
+def discard_job(job: Dict[str, Any]) -> None:
+    """
+    Forget a job that was never queued, freeing its day for a new request.
+    """
+    redis_client = get_cache_redis_client()
+    active_key = _active_key(job["user_id"], date.fromisoformat(job["diary_date"]))
+    if redis_client.get(active_key) == job["job_id"].encode():
+        redis_client.delete(active_key)
+    redis_client.delete(_job_key(job["job_id"]))
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    raw = get_cache_redis_client().get(_job_key(job_id))
+    return json.loads(raw) if raw else None
+
+
+def update_job(job_id: str, **fields) -> Optional[Dict[str, Any]]:
+    """
+    Merge fields into the job, then publish it on DIARY_EVENTS_CHANNEL. The
+    diary itself stays out of the event; clients fetch it when completed.
+    """
+    redis_client = get_cache_redis_client()
+    job = get_job(job_id)
+    if job is None:
+        return None
+    job.update(fields, updated_at=time.time())
+    redis_client.set(_job_key(job_id), json.dumps(job), ex=CONFIG.DIARY_JOB_TTL_SECONDS)
+    if job["status"] in _TERMINAL:
+        active_key = _active_key(job["user_id"], date.fromisoformat(job["diary_date"]))
+        if redis_client.get(active_key) == job_id.encode():
+            redis_client.delete(active_key)
+
+    try:
+        event = {k: v for k, v in job.items() if k != "diary"}
+        get_redis_client().publish(CONFIG.DIARY_EVENTS_CHANNEL, json.dumps(event))
+    except Exception as e:
+        logger.exception(f"Error publishing diary job {job_id}: {e}")
+    return job
@@ -0,0 +1,179 @@
+""" Per-user sub-queues in Redis, drained into Celery by deficit round-robin """
+import json
+import time
+import logging
+from collections import deque
+from typing import Callable, Dict, Optional, Set
+
+from api.config.redis_client import get_cache_redis_client
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "fairq"
+
+# Drop a user from the active set only if their sub-queue is still empty, so a
+# concurrent submit between the check and the removal is never lost.
+_RETIRE_SCRIPT = """
+if redis.call('LLEN', KEYS[1]) == 0 then
+  return redis.call('SREM', KEYS[2], ARGV[1])
+end
+return 0
+"""
+
+
+def _user_key(queue: str, user_id: str) -> str:
+    return f"{_KEY_PREFIX}:{queue}:user:{user_id}"
+
+
+def _active_key(queue: str) -> str:
+    return f"{_KEY_PREFIX}:{queue}:active"
+
+
+def submit(
+    transcription_id: int,
+    user_id: int,
+    queue: str,
+    model: Optional[str] = None,
+    cost: Optional[float] = None,
+) -> bool:
+    """
+    Append a task to the user's sub-queue. Cost is the audio length in
+    seconds, so users are served in proportion to audio, not file count.
+    Returns False when Redis is unavailable and the caller should send directly.
+    """
+    redis_client = get_cache_redis_client()
+    if redis_client is None:
+        return False
+    item = {
+        "transcription_id": transcription_id,
+        "model": model,
+        "cost": max(float(cost or 0), 1.0),
+        "enqueued_at": time.time(),
+    }
+    try:
+        pipe = redis_client.pipeline()
+        pipe.rpush(_user_key(queue, str(user_id)), json.dumps(item))
+        pipe.sadd(_active_key(queue), str(user_id))
+        pipe.execute()
+        return True
+    except Exception as e:
+        logger.warning(f"Fair scheduler unavailable, sending {transcription_id} directly: {e}")
+        return False
+
+
+def withdraw(transcription_id: int, user_id: int, queue: str) -> bool:
+    """
+    Take a task back out of the user's sub-queue, e.g. to send it on a
+    priority queue instead. Returns False if it is not waiting there (any
+    more); the dispatcher may have released it in the meantime.
+    """
+    redis_client = get_cache_redis_client()
+    key = _user_key(queue, str(user_id))
+    for raw in redis_client.lrange(key, 0, -1):
+        if json.loads(raw).get("transcription_id") == transcription_id:
+            return redis_client.lrem(key, 1, raw) == 1
+    return False
+
+
+def queued_ids(user_id: int, queue: str) -> Set[int]:
+    """
+    Transcriptions waiting in the user's sub-queue.
+    """
+    raw_items = get_cache_redis_client().lrange(_user_key(queue, str(user_id)), 0, -1)
+    return {json.loads(raw)["transcription_id"] for raw in raw_items}
+
+
+def backlog(queue: str) -> Dict[str, int]:
+    """
+    Waiting items per user for one queue.
+    """
+    redis_client = get_cache_redis_client()
+    users = [u.decode() for u in redis_client.smembers(_active_key(queue))]
+    pipe = redis_client.pipeline()
+    for user_id in users:
+        pipe.llen(_user_key(queue, user_id))
+    return dict(zip(users, pipe.execute()))
+
+
+def oldest_waiting_age(queue: str) -> float:
+    """
+    Seconds the oldest item at the head of any user's sub-queue has waited.
+    """
+    redis_client = get_cache_redis_client()
+    users = [u.decode() for u in redis_client.smembers(_active_key(queue))]
+    pipe = redis_client.pipeline()
+    for user_id in users:
+        pipe.lindex(_user_key(queue, user_id), 0)
+    stamps = [json.loads(raw).get("enqueued_at") for raw in pipe.execute() if raw]
+    stamps = [t for t in stamps if t]
+    return max(time.time() - min(stamps), 0.0) if stamps else 0.0
+
+
+class DeficitRoundRobin:
+    """
+    Deficit round-robin over the active users of one queue. Each visit
+    grants a user FAIR_QUANTUM_SECONDS of audio credit; items are released
+    while their cost fits the credit. A newly active user waits at most one
+    round of the other active users, whatever their backlog. Only one
+    dispatcher may run it at a time, so the ring and deficits live in memory.
+    """
+
+    def __init__(self, redis_client, queue: str, quantum: float):
+        self.redis = redis_client
+        self.queue = queue
+        self.quantum = quantum
+        self.ring = deque()
+        self.deficit: Dict[str, float] = {}
+        self._visiting: Optional[str] = None
+        self._retire = redis_client.register_script(_RETIRE_SCRIPT)
+
+    def _refresh(self) -> None:
+        active = {u.decode() for u in self.redis.smembers(_active_key(self.queue))}
+        for user_id in list(self.ring):
+            if user_id not in active:
+                self.ring.remove(user_id)
+                self.deficit.pop(user_id, None)
+        for user_id in active - set(self.ring):
+            # New users join the tail with no carried-over credit
+            self.ring.append(user_id)
+            self.deficit[user_id] = 0.0
+
+    def dispatch(self, budget: int, send: Callable[[str, dict], None]) -> int:
+        """
+        Release up to budget items, calling send(user_id, item) for each.
+        """
+        self._refresh()
+        sent = 0
+        idle_visits = 0
+
+        while budget > sent and self.ring and idle_visits <= len(self.ring):
+            user_id = self.ring[0]
+            if self._visiting != user_id:
+                self.deficit[user_id] = self.deficit.get(user_id, 0.0) + self.quantum
+                self._visiting = user_id
+
+            key = _user_key(self.queue, user_id)
+            released = False
+            while budget > sent:
+                head = self.redis.lindex(key, 0)
+                if head is None:
+                    self._retire(keys=[key, _active_key(self.queue)], args=[user_id])
+                    self.ring.popleft()
+                    self.deficit.pop(user_id, None)
+                    self._visiting = None
+                    break
+                item = json.loads(head)
+                if item["cost"] > self.deficit[user_id]:
+                    self.ring.rotate(-1)
+                    self._visiting = None
+                    break
+                self.redis.lpop(key)
+                self.deficit[user_id] -= item["cost"]
+                send(user_id, item)
+                sent += 1
+                released = True
+
+            idle_visits = 0 if released else idle_visits + 1
+
+        return sent
+
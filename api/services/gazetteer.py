@@ -0,0 +1,193 @@
+""" Offline reverse geocoding from a GeoNames dump, served before Nominatim """
+import os
+import math
+import time
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Optional
+
+import numpy as np
+
+from api.config.config import settings as CONFIG
+
+logger = logging.getLogger(__name__)
+
+_EARTH_RADIUS_KM = 6371.0
+
+# GeoNames dump columns (tab separated)
+_NAME, _LAT, _LON = 1, 4, 5
+
+# A build lock older than this belongs to a process that died mid-build
+_BUILD_LOCK_STALE_SECONDS = 600
+
+
+def _unit_vectors(lat, lon) -> np.ndarray:
+    """
+    Points on the unit sphere: straight-line distance between them grows
+    with great-circle distance, so a Euclidean nearest-neighbour search works.
+    """
+    lat, lon = np.radians(lat), np.radians(lon)
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+@contextmanager
+def _build_lock(path: Path):
+    """
+    Exclusive lock file shared by every process building the same dump
+    (O_EXCL works on Windows as well as POSIX).
+    """
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - path.stat().st_mtime > _BUILD_LOCK_STALE_SECONDS:
+                    path.unlink(missing_ok=True)
+                    continue
+            except FileNotFoundError:
+                continue
+            time.sleep(0.5)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        path.unlink(missing_ok=True)
+
+
+def _replace_with(destination: Path, write) -> None:
+    """
+    Write through a temporary file in the same directory and move it into
+    place, so readers never see a partial file.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=destination.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_name, destination)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+class Gazetteer:
+    """
+    Nearest named place for a coordinate. Coordinates, name offsets and the
+    UTF-8 name bytes are kept in files next to the dump and memory-mapped, so
+    the parse happens once and every process shares the same pages. Lookups
+    use a scipy cKDTree when scipy is installed, otherwise a vectorised scan
+    over the mapped array.
+    """
+
+    def __init__(self, source: Path):
+        self.source = source
+        points_path = source.with_suffix(".points.npy")
+        offsets_path = source.with_suffix(".name_offsets.npy")
+        names_path = source.with_suffix(".names.bin")
+        if not self._fresh(points_path):
+            with _build_lock(source.with_suffix(".build.lock")):
+                # Another process may have built it while we waited
+                if not self._fresh(points_path):
+                    self._build(points_path, offsets_path, names_path)
+
+        self.points = np.load(points_path, mmap_mode="r")
+        self.name_offsets = np.load(offsets_path, mmap_mode="r")
+        if names_path.stat().st_size:
+            self.name_bytes = np.memmap(names_path, dtype=np.uint8, mode="r")
+        else:
+            self.name_bytes = np.zeros(0, dtype=np.uint8)
+        try:
+            from scipy.spatial import cKDTree
+            self._tree = cKDTree(self.points)
+        except ImportError:
+            self._tree = None
+        logger.info(
+            f"Gazetteer loaded {len(self)} places from {source.name} "
+            f"({'KD-tree' if self._tree is not None else 'linear scan'})"
+        )
+
+    def __len__(self) -> int:
+        return len(self.name_offsets) - 1
+
+    def _fresh(self, points_path: Path) -> bool:
+        return points_path.exists() and points_path.stat().st_mtime >= self.source.stat().st_mtime
+
+    def name(self, index: int) -> str:
+        start, end = int(self.name_offsets[index]), int(self.name_offsets[index + 1])
+        return self.name_bytes[start:end].tobytes().decode("utf-8")
+
+    def _build(self, points_path: Path, offsets_path: Path, names_path: Path) -> None:
+        lats, lons, names = [], [], []
+        with open(self.source, encoding="utf-8") as dump:
+            for line in dump:
+                fields = line.rstrip("\n").split("\t")
+                if len(fields) <= _LON:
+                    continue
+                try:
+                    lats.append(float(fields[_LAT]))
+                    lons.append(float(fields[_LON]))
+                except ValueError:
+                    continue
+                names.append(fields[_NAME].encode("utf-8"))
+
+        offsets = np.zeros(len(names) + 1, dtype=np.int64)
+        np.cumsum([len(name) for name in names], out=offsets[1:])
+        points = _unit_vectors(np.array(lats), np.array(lons)).astype(np.float32).reshape(-1, 3)
+        _replace_with(names_path, lambda f: f.write(b"".join(names)))
+        _replace_with(offsets_path, lambda f: np.save(f, offsets))
+        # Points go last: their mtime is what marks the build complete
+        _replace_with(points_path, lambda f: np.save(f, points))
+
+    def nearest(self, lat: float, lon: float) -> Optional[tuple]:
+        """
+        (name, distance in km) of the closest place, or None if the dump is empty.
+        """
+        if not len(self):
+            return None
+        query = _unit_vectors(lat, lon).astype(np.float32)
+        if self._tree is not None:
+            chord, index = self._tree.query(query)
+        else:
+            index = int(np.argmax(self.points @ query))
+            chord = float(np.linalg.norm(self.points[index] - query))
+        angle = 2 * math.asin(min(1.0, float(chord) / 2))
+        return self.name(int(index)), angle * _EARTH_RADIUS_KM
+
+
+_gazetteer: Optional[Gazetteer] = None
+_gazetteer_lock = threading.Lock()
+_unavailable = False
+
+
+def get_gazetteer() -> Optional[Gazetteer]:
+    """
+    The shared gazetteer, loaded on first use, or None when
+    GEOCODE_GAZETTEER_PATH is unset or cannot be read.
+    """
+    global _gazetteer, _unavailable
+    if _gazetteer is not None or _unavailable or not CONFIG.GEOCODE_GAZETTEER_PATH:
+        return _gazetteer
+    with _gazetteer_lock:
+        if _gazetteer is None and not _unavailable:
+            try:
+                _gazetteer = Gazetteer(Path(CONFIG.GEOCODE_GAZETTEER_PATH))
+            except Exception as e:
+                logger.error(f"Could not load gazetteer {CONFIG.GEOCODE_GAZETTEER_PATH}: {e}")
+                _unavailable = True
+    return _gazetteer
+
+
+def lookup_place(lat: float, lon: float) -> Optional[str]:
+    """
+    Name of the nearest gazetteer place within GEOCODE_GAZETTEER_MAX_KM.
+    """
+    gazetteer = get_gazetteer()
+    if gazetteer is None:
+        return None
+    found = gazetteer.nearest(lat, lon)
+    if found is None or found[1] > CONFIG.GEOCODE_GAZETTEER_MAX_KM:
+        return None
+    return found[0]
@@ -0,0 +1,141 @@
+""" Reverse geocoding cached per coordinate grid cell, in process and in Postgres """
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.connections import database_connection
+from api.config.client import get_http_client
+from api.models.geocode_cache import GeocodeCache
+from api.services.gazetteer import lookup_place
+from api.services.rate_limiter import take_token
+
+from api.config.config import settings as CONFIG
+
+logger = logging.getLogger(__name__)
+
+Cell = Tuple[float, int, int]
+
+_MISSING = object()
+
+_lru: "OrderedDict[Cell, Optional[str]]" = OrderedDict()
+_lru_lock = threading.Lock()
+
+_THROTTLE_KEY = "ratelimit:nominatim:requests"
+
+# Upload-time resolutions in flight; held so they are not garbage collected
+_background = set()
+
+
+def parse_location_text(location_text: Optional[str]) -> Optional[Tuple[float, float]]:
+    """
+    "lat,lon" as sent by the recorder, or None for anything else.
+    """
+    if not location_text or "," not in location_text:
+        return None
+    try:
+        lat_str, lon_str = location_text.split(",")
+        lat, lon = float(lat_str), float(lon_str)
+    except ValueError:
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return None
+    return lat, lon
+
+
+def grid_cell(lat: float, lon: float) -> Cell:
+    grid = CONFIG.GEOCODE_GRID_DEGREES
+    return grid, round(lat / grid), round(lon / grid)
+
+
+def _lru_get(cell: Cell):
+    with _lru_lock:
+        if cell not in _lru:
+            return _MISSING
+        _lru.move_to_end(cell)
+        return _lru[cell]
+
+
+def _lru_put(cell: Cell, name: Optional[str]) -> None:
+    with _lru_lock:
+        _lru[cell] = name
+        _lru.move_to_end(cell)
+        while len(_lru) > CONFIG.GEOCODE_LRU_SIZE:
+            _lru.popitem(last=False)
+
+
+async def _fetch(cell: Cell) -> Optional[str]:
+    grid, lat_bucket, lon_bucket = cell
+    # Ask for the cell centre so the cached answer holds for the whole cell
+    url = CONFIG.LOCATION_URL.format(lat=round(lat_bucket * grid, 6), long=round(lon_bucket * grid, 6))
+    # Nominatim allows one request per second per application, not per process
+    await take_token(_THROTTLE_KEY, 1, 1 / CONFIG.GEOCODE_MIN_INTERVAL_SECONDS)
+    response = await get_http_client().get(url)
+    response.raise_for_status()
+    return response.json().get("name")
+
+
+async def reverse_geocode(db: AsyncSession, lat: float, lon: float) -> Optional[str]:
+    """
+    Place name for the coordinates: the offline gazetteer if one is
+    configured, then the in-process LRU, the geocode_cache table and finally
+    Nominatim (stored for every user). Raises if Nominatim fails, so a
+    transient error is never cached.
+    """
+    name = lookup_place(lat, lon)
+    if name:
+        return name
+
+    cell = grid_cell(lat, lon)
+    name = _lru_get(cell)
+    if name is not _MISSING:
+        return name
+
+    row = (await db.execute(
+        select(GeocodeCache.name).where(
+            GeocodeCache.grid_degrees == cell[0],
+            GeocodeCache.lat_bucket == cell[1],
+            GeocodeCache.lon_bucket == cell[2],
+        )
+    )).first()
+    if row is not None:
+        _lru_put(cell, row.name)
+        return row.name
+
+    name = await _fetch(cell)
+    await db.execute(
+        insert(GeocodeCache)
+        .values(grid_degrees=cell[0], lat_bucket=cell[1], lon_bucket=cell[2], name=name)
+        .on_conflict_do_nothing()
+    )
+    await db.commit()
+    _lru_put(cell, name)
+    return name
+
+
+async def _resolve_in_background(location_text: str) -> None:
+    coordinates = parse_location_text(location_text)
+    if coordinates is None or database_connection.async_session is None:
+        return
+    try:
+        async with database_connection.async_session() as db:
+            await reverse_geocode(db, *coordinates)
+    except Exception as e:
+        logger.warning(f"Upload-time geocoding of {location_text} failed: {e}")
+
+
+def resolve_location_soon(location_text: Optional[str]) -> None:
+    """
+    Warm the cache for a new recording without delaying the upload, so
+    diary generation finds the name already resolved.
+    """
+    if parse_location_text(location_text) is None:
+        return
+    task = asyncio.get_running_loop().create_task(_resolve_in_background(location_text))
+    _background.add(task)
+    task.add_done_callback(_background.discard)
@@ -0,0 +1,217 @@
+""" Incremental transcription of audio streamed over a WebSocket while it is recorded """
+import os
+import wave
+import asyncio
+import logging
+import tempfile
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from api.services.vad import SAMPLE_RATE, detect_speech_spans, encode_flac
+from api.services.audio_transcode import ffmpeg_available
+from api.services.rate_limiter import LIVE_POOL, RateLimitDeferred, rate_limit_policy
+from api.services.transcribe_audio_async import compute_confidence
+from api.services.transcription_backends import BackendTranscription, TranscriptionBackend
+
+from api.config.config import settings as CONFIG
+
+logger = logging.getLogger(__name__)
+
+_BYTES_PER_SECOND = SAMPLE_RATE * 2
+
+
+def _write_wav(pcm: bytes, destination: str) -> None:
+    with wave.open(destination, "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(SAMPLE_RATE)
+        out.writeframes(pcm)
+
+
+def encode_recording(pcm: bytes) -> str:
+    """
+    Encode the whole session to a temporary FLAC (WAV without ffmpeg) file
+    and return its path; the caller removes it.
+    """
+    use_flac = ffmpeg_available()
+    fd, path = tempfile.mkstemp(suffix=".flac" if use_flac else ".wav")
+    os.close(fd)
+    if use_flac:
+        encode_flac(pcm, path)
+    else:
+        _write_wav(pcm, path)
+    return path
+
+
+class LiveTranscriber:
+    """
+    Buffers 16 kHz mono s16le PCM as it arrives and transcribes it in
+    utterance-sized windows. A window is finalised once VAD sees
+    LIVE_ENDPOINT_SILENCE_SECONDS of silence after at least
+    LIVE_MIN_FINAL_SECONDS of audio (shorter utterances are merged with the
+    next, since each request is billed at the minimum anyway), or when it
+    reaches LIVE_MAX_WINDOW_SECONDS. In between, the open window is
+    re-transcribed every LIVE_PARTIAL_INTERVAL_SECONDS as a partial, unless
+    there is no new speech since the last one or a final is about to cover
+    it. All calls draw on the live rate-limit pool; partials never wait for
+    it and are simply dropped when it is exhausted. Finals are transcribed
+    strictly in order; a partial is skipped while another is in flight.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[Dict[str, Any]], Awaitable[None]],
+        backend: TranscriptionBackend,
+        model: str,
+    ):
+        self.send = send
+        self.backend = backend
+        self.model = model
+        self.pcm = bytearray()
+        self.window_start = 0.0
+        self.finals: List[Optional[Dict[str, Any]]] = []
+        self.failed = False
+        self._final_tasks: List[asyncio.Task] = []
+        self._final_lock = asyncio.Lock()
+        self._partial_task: Optional[asyncio.Task] = None
+        self._partial_mark = 0.0
+        self._partial_speech_end = 0.0
+        self._generation = 0
+
+    @property
+    def duration(self) -> float:
+        return len(self.pcm) / _BYTES_PER_SECOND
+
+    def _window(self, start: float, end: float) -> bytes:
+        return bytes(self.pcm[int(start * SAMPLE_RATE) * 2:int(end * SAMPLE_RATE) * 2])
+
+    async def _transcribe(self, pcm: bytes, max_wait: Optional[float] = None) -> BackendTranscription:
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            await asyncio.to_thread(_write_wav, pcm, path)
+            with rate_limit_policy(LIVE_POOL, max_wait):
+                return await self.backend.transcribe(path, self.model, len(pcm) / _BYTES_PER_SECOND)
+        finally:
+            os.unlink(path)
+
+    async def feed(self, data: bytes) -> None:
+        self.pcm.extend(data)
+        open_seconds = self.duration - self.window_start
+        if open_seconds < CONFIG.LIVE_MIN_WINDOW_SECONDS:
+            return
+
+        spans = await asyncio.to_thread(detect_speech_spans, self._window(self.window_start, self.duration))
+        if not spans:
+            # Nothing but silence: slide the window so it never grows unbounded
+            if open_seconds > CONFIG.LIVE_MAX_WINDOW_SECONDS:
+                self.window_start = self.duration - CONFIG.LIVE_MIN_WINDOW_SECONDS
+                self._partial_mark = self.window_start
+            return
+
+        speech_end = spans[-1][1]
+        trailing_silence = open_seconds - speech_end
+        long_enough = speech_end >= CONFIG.LIVE_MIN_FINAL_SECONDS
+        if trailing_silence >= CONFIG.LIVE_ENDPOINT_SILENCE_SECONDS and long_enough:
+            self._commit(self.window_start + speech_end)
+        elif open_seconds >= CONFIG.LIVE_MAX_WINDOW_SECONDS:
+            self._commit(self.duration)
+        elif (
+            CONFIG.LIVE_PARTIALS_ENABLED
+            and self.duration - self._partial_mark >= CONFIG.LIVE_PARTIAL_INTERVAL_SECONDS
+            and (self._partial_task is None or self._partial_task.done())
+            # Nothing new to show since the last partial
+            and self.window_start + speech_end > self._partial_speech_end
+            # A final is about to cover this audio anyway
+            and not (long_enough and trailing_silence > 0)
+            and open_seconds + CONFIG.LIVE_PARTIAL_INTERVAL_SECONDS < CONFIG.LIVE_MAX_WINDOW_SECONDS
+        ):
+            self._partial_mark = self.duration
+            self._partial_speech_end = self.window_start + speech_end
+            self._partial_task = asyncio.create_task(
+                self._run_partial(self.window_start, self.duration, self._generation)
+            )
+
+    def _commit(self, end: float) -> None:
+        start = self.window_start
+        self.window_start = end
+        self._partial_mark = end
+        self._generation += 1
+        index = len(self.finals)
+        self.finals.append(None)
+        self._final_tasks.append(asyncio.create_task(self._run_final(index, start, end)))
+
+    async def _run_partial(self, start: float, end: float, generation: int) -> None:
+        try:
+            result = await self._transcribe(self._window(start, end), max_wait=0)
+        except RateLimitDeferred:
+            # Live budget is tight: keep it for the finals
+            return
+        except Exception as e:
+            logger.warning(f"Live partial transcription failed: {e}")
+            return
+        # Drop partials overtaken by a final for the same audio
+        if generation == self._generation and result.text.strip():
+            await self.send({"type": "partial", "start": start, "end": end, "text": result.text.strip()})
+
+    async def _run_final(self, index: int, start: float, end: float) -> None:
+        async with self._final_lock:
+            try:
+                result = await self._transcribe(self._window(start, end))
+            except Exception as e:
+                logger.warning(f"Live final transcription of {start:.1f}-{end:.1f}s failed: {e}")
+                self.failed = True
+                await self.send({"type": "error", "index": index, "message": "Transcription of a segment failed"})
+                return
+
+            def shift(t):
+                return round(float(t) + start, 3) if t is not None else None
+
+            self.finals[index] = {
+                "start": start,
+                "end": end,
+                "text": result.text.strip(),
+                "language": result.language,
+                "words": [
+                    {"start": shift(w.get("start")), "end": shift(w.get("end")), "text": w.get("word")}
+                    for w in result.words
+                ],
+                "segments": [
+                    {**seg, "start": shift(seg.get("start")), "end": shift(seg.get("end"))}
+                    for seg in result.segments
+                ],
+            }
+            if self.finals[index]["text"]:
+                await self.send({"type": "final", "index": index, "start": start, "end": end, "text": self.finals[index]["text"]})
+
+    async def finish(self) -> Optional[Dict[str, Any]]:
+        """
+        Finalise the open window and wait for every final. Returns the
+        transcription in the shape of transcribe_audio_file, or None if any
+        window failed and the recording should be transcribed offline.
+        """
+        if self._partial_task is not None:
+            self._partial_task.cancel()
+        if self.duration - self.window_start > 0:
+            spans = await asyncio.to_thread(detect_speech_spans, self._window(self.window_start, self.duration))
+            if spans:
+                self._commit(self.duration)
+        await asyncio.gather(*self._final_tasks)
+
+        if self.failed:
+            return None
+
+        finals = [f for f in self.finals if f]
+        segments = [seg for f in finals for seg in f["segments"]]
+        language_seconds: Dict[str, float] = {}
+        for f in finals:
+            if f["language"]:
+                language_seconds[f["language"]] = language_seconds.get(f["language"], 0) + f["end"] - f["start"]
+
+        return {
+            "text": " ".join(f["text"] for f in finals if f["text"]),
+            "confidence": await compute_confidence(segments),
+            "language": max(language_seconds, key=language_seconds.get) if language_seconds else None,
+            "transcribe_time": datetime.now(timezone.utc),
+            "words": [w for f in finals for w in f["words"]],
+        }
@@ -0,0 +1,55 @@
+""" Broker-side view of the Celery queues """
+import json
+import time
+import logging
+from typing import Dict, List, Optional
+
+import redis
+
+from api.config.config import settings as CONFIG
+
+logger = logging.getLogger(__name__)
+
+_broker_client = None
+
+
+def _get_broker_client():
+    global _broker_client
+    if _broker_client is None:
+        _broker_client = redis.StrictRedis.from_url(CONFIG.REDIS_BROKER_URL)
+    return _broker_client
+
+
+def queue_depths(queues: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    Messages waiting in each Celery queue (Redis transport keeps one list per queue).
+    """
+    queues = queues or CONFIG.CELERY_QUEUES
+    try:
+        pipe = _get_broker_client().pipeline()
+        for queue in queues:
+            pipe.llen(queue)
+        return dict(zip(queues, pipe.execute()))
+    except Exception as e:
+        logger.warning(f"Could not read queue depths from the broker: {e}")
+        return {}
+
+
+def oldest_task_ages(queues: Optional[List[str]] = None) -> Dict[str, float]:
+    """
+    Seconds the oldest waiting message of each queue has been in the broker
+    (kombu LPUSHes and workers BRPOP, so the oldest sits at the tail).
+    """
+    queues = queues or CONFIG.CELERY_QUEUES
+    now = time.time()
+    ages = {}
+    try:
+        pipe = _get_broker_client().pipeline()
+        for queue in queues:
+            pipe.lindex(queue, -1)
+        for queue, raw in zip(queues, pipe.execute()):
+            enqueued_at = json.loads(raw).get("headers", {}).get("enqueued_at") if raw else None
+            ages[queue] = max(now - enqueued_at, 0.0) if enqueued_at else 0.0
+    except Exception as e:
+        logger.warning(f"Could not read queue ages from the broker: {e}")
+    return ages
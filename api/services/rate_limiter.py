@@ -0,0 +1,248 @@
+""" Cluster-wide token buckets for Groq transcription calls, shared through Redis """
+import time
+import random
+import asyncio
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Optional, Tuple, TypeVar
+
+import redis.asyncio as aioredis
+from groq import RateLimitError
+
+from api.config.config import settings as CONFIG
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_RPM_KEY = "ratelimit:groq:requests"
+_AUDIO_KEY = "ratelimit:groq:audio_seconds"
+_BLOCKED_KEY = "ratelimit:groq:blocked_until"
+
+BATCH_POOL = "batch"
+LIVE_POOL = "live"
+
+# (pool, longest wait before deferring) for calls made in the current context
+_policy: ContextVar[Tuple[str, Optional[float]]] = ContextVar("rate_limit_policy", default=(BATCH_POOL, None))
+
+
+@contextmanager
+def rate_limit_policy(pool: str = BATCH_POOL, max_wait: Optional[float] = None):
+    """
+    Route the Groq calls made inside the block to a budget pool. Live
+    sessions get their own LIVE_RATE_LIMIT_SHARE of the provider limits, so
+    they can neither starve nor be starved by the batch workers. max_wait=0
+    makes a call give up at once instead of queueing for the budget.
+    """
+    token = _policy.set((pool, max_wait))
+    try:
+        yield
+    finally:
+        _policy.reset(token)
+
+
+def _pool_limits(pool: str) -> Tuple[str, str, float, float]:
+    """
+    Bucket keys and capacities (requests/min, audio seconds/hour) of a pool.
+    """
+    headroom = CONFIG.RATE_LIMIT_HEADROOM
+    share = CONFIG.LIVE_RATE_LIMIT_SHARE if pool == LIVE_POOL else 1 - CONFIG.LIVE_RATE_LIMIT_SHARE
+    suffix = "" if pool == BATCH_POOL else f":{pool}"
+    return (
+        _RPM_KEY + suffix,
+        _AUDIO_KEY + suffix,
+        CONFIG.GROQ_REQUESTS_PER_MINUTE * headroom * share,
+        CONFIG.GROQ_AUDIO_SECONDS_PER_HOUR * headroom * share,
+    )
+
+# Refills both buckets, then either consumes (returns "0") or returns the
+# seconds to wait until both can cover the request. Nothing is consumed
+# while waiting, so callers never hold partial reservations.
+_ACQUIRE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local blocked = tonumber(redis.call('GET', KEYS[3]) or '0')
+if blocked > now then
+  return tostring(blocked - now)
+end
+
+local function refill(key, capacity, rate)
+  local state = redis.call('HMGET', key, 'tokens', 'ts')
+  local tokens = tonumber(state[1]) or capacity
+  local ts = tonumber(state[2]) or now
+  return math.min(capacity, tokens + math.max(0, now - ts) * rate)
+end
+
+local rpm_capacity = tonumber(ARGV[2])
+local rpm_rate = tonumber(ARGV[3])
+local audio_capacity = tonumber(ARGV[4])
+local audio_rate = tonumber(ARGV[5])
+local audio_cost = math.min(tonumber(ARGV[6]), audio_capacity)
+
+local requests = refill(KEYS[1], rpm_capacity, rpm_rate)
+local audio = refill(KEYS[2], audio_capacity, audio_rate)
+
+local wait = 0
+if requests < 1 then
+  wait = math.max(wait, (1 - requests) / rpm_rate)
+end
+if audio < audio_cost then
+  wait = math.max(wait, (audio_cost - audio) / audio_rate)
+end
+if wait > 0 then
+  return tostring(wait)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', requests - 1, 'ts', now)
+redis.call('HSET', KEYS[2], 'tokens', audio - audio_cost, 'ts', now)
+redis.call('EXPIRE', KEYS[1], 3600)
+redis.call('EXPIRE', KEYS[2], 7200)
+return "0"
+"""
+
+
+# Single bucket for other providers: consume one token, or return the
+# seconds until one is available.
+_TAKE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local rate = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+if tokens < 1 then
+  return tostring((1 - tokens) / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens - 1, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return "0"
+"""
+
+
+class RateLimitDeferred(Exception):
+    """
+    The provider budget is exhausted for longer than a task should block;
+    the task should be re-queued after retry_after seconds.
+    """
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Groq rate limit reached, retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+_loop_redis: dict = {}
+
+
+def _get_redis() -> aioredis.Redis:
+    loop = asyncio.get_running_loop()
+    client = _loop_redis.get(loop)
+    if client is None:
+        client = aioredis.from_url(CONFIG.REDIS_CACHE_URL)
+        _loop_redis[loop] = client
+    return client
+
+
+def _backoff(attempt: int) -> float:
+    """
+    Full-jitter exponential backoff.
+    """
+    ceiling = min(CONFIG.RATE_LIMIT_BACKOFF_MAX_SECONDS, CONFIG.RATE_LIMIT_BACKOFF_BASE_SECONDS * 2 ** attempt)
+    return random.uniform(0, ceiling)
+
+
+def _retry_after(error: RateLimitError) -> Optional[float]:
+    try:
+        value = error.response.headers.get("retry-after")
+        return float(value) if value is not None else None
+    except (AttributeError, ValueError):
+        return None
+
+
+async def acquire(audio_seconds: float) -> None:
+    """
+    Block until both the request and audio-seconds buckets of the current
+    pool admit one call, or raise RateLimitDeferred if that would take longer
+    than RATE_LIMIT_MAX_WAIT_SECONDS (or the policy's max_wait).
+    """
+    if not CONFIG.RATE_LIMIT_ENABLED:
+        return
+
+    pool, max_wait = _policy.get()
+    max_wait = CONFIG.RATE_LIMIT_MAX_WAIT_SECONDS if max_wait is None else max_wait
+    rpm_key, audio_key, rpm_capacity, audio_capacity = _pool_limits(pool)
+    cost = max(audio_seconds or 0, CONFIG.GROQ_MIN_BILLED_SECONDS)
+    redis_client = _get_redis()
+    waited = 0.0
+
+    while True:
+        wait = float(await redis_client.eval(
+            _ACQUIRE_SCRIPT,
+            3,
+            rpm_key,
+            audio_key,
+            _BLOCKED_KEY,
+            time.time(),
+            rpm_capacity,
+            rpm_capacity / 60.0,
+            audio_capacity,
+            audio_capacity / 3600.0,
+            cost,
+        ))
+        if wait <= 0:
+            return
+        if waited + wait > max_wait:
+            raise RateLimitDeferred(wait)
+        # Jitter keeps workers that woke together from colliding again
+        sleep_for = wait + random.uniform(0, min(1.0, wait))
+        waited += sleep_for
+        await asyncio.sleep(sleep_for)
+
+
+async def take_token(key: str, capacity: float, per_second: float) -> None:
+    """
+    Wait for one token from a cluster-wide bucket holding up to capacity
+    tokens and refilling at per_second, e.g. a provider's one request per
+    second usage policy shared by every process.
+    """
+    redis_client = _get_redis()
+    while True:
+        wait = float(await redis_client.eval(_TAKE_SCRIPT, 1, key, time.time(), capacity, per_second))
+        if wait <= 0:
+            return
+        await asyncio.sleep(wait + random.uniform(0, min(1.0, wait)))
+
+
+async def block_until(retry_after: float) -> None:
+    """
+    Pause every worker: the provider told us to back off (Retry-After).
+    """
+    redis_client = _get_redis()
+    until = time.time() + retry_after
+    current = float(await redis_client.get(_BLOCKED_KEY) or 0)
+    if until > current:
+        await redis_client.set(_BLOCKED_KEY, until, ex=max(1, int(retry_after) + 1))
+
+
+async def call_with_rate_limit(
+    call: Callable[[], Awaitable[T]],
+    audio_seconds: float,
+) -> T:
+    """
+    Run one Groq call inside the shared limiter. 429 responses honour
+    Retry-After cluster-wide and are retried with jittered exponential
+    backoff; when retries run out the call is deferred, not failed.
+    """
+    for attempt in range(CONFIG.RATE_LIMIT_RETRIES + 1):
+        await acquire(audio_seconds)
+        try:
+            return await call()
+        except RateLimitError as e:
+            retry_after = _retry_after(e)
+            delay = max(retry_after or 0, _backoff(attempt))
+            logger.warning(f"Groq returned 429 (attempt {attempt + 1}), backing off {delay:.1f}s")
+            if retry_after:
+                await block_until(retry_after)
+            if attempt == CONFIG.RATE_LIMIT_RETRIES or delay > CONFIG.RATE_LIMIT_MAX_WAIT_SECONDS:
+                raise RateLimitDeferred(delay) from e
+            await asyncio.sleep(delay)
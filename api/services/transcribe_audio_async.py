@@ -1,53 +1,159 @@
-import json
+import os
 import asyncio
+import logging
+import tempfile
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from api.config.client import transcription_client
+from typing import Optional
 from api.config.config import settings as CONFIG
+from api.storage import get_storage
+from api.services.audio_transcode import codec_extension, encode_pcm, ffmpeg_available
+from api.services.vad import TimeMap, decode_pcm, detect_speech_spans, trim_pcm, plan_chunks
+from api.services.transcription_backends import TranscriptionBackend, get_transcription_backend
+
+logger = logging.getLogger(__name__)
 
 async def compute_confidence(segment):
+    """
+    Duration-weighted mean of per-segment scores, so long segments count
+    for more than short interjections.
+    """
+    if not segment:
+        return None
     seg_score = 0
+    total_duration = 0
     for seg in segment:
         logprob_score = min(1.0, max(0.0, 1 + seg["avg_logprob"]))
         no_speech_score = 1 - seg["no_speech_prob"]
-        seg_score += round((logprob_score * 0.7 + no_speech_score * 0.3), 3)
-    return seg_score / len(segment)
-
-async def transcribe_audio_file(file_path: str):
-    """
-    Transcribes the audio file using the configured client.
-    """
-    BASE_DIR = CONFIG.BASE_DIR
-    file_name = BASE_DIR+"/"+file_path
-    with open(file_name, "rb") as file:
-
-        transcription = await transcription_client.audio.transcriptions.create(
-            file=file,
-            model=CONFIG.TRANSCRIPTION_MODEL,
-            prompt=CONFIG.AUDIO_TRANSCRIBE_PROMPT,
-            response_format="verbose_json",
-            timestamp_granularities=["word","segment"],
-            temperature=0.0
-        )
-
-        confidence = await compute_confidence(transcription.segments)
-        transcription_text = transcription.text
-        language = transcription.language
-        transcribe_time = datetime.now(timezone.utc)
-    
-        transcription_data = {
-            "text": transcription_text,
-            "confidence": confidence,
-            "language": language,
-            "transcribe_time": transcribe_time,
-            "words": [
-                {
-                    "start": s.get("start"),
-                    "end": s.get("end"),
-                    "text": s.get("word")
+        duration = max(float(seg.get("end", 0)) - float(seg.get("start", 0)), 0.01)
+        seg_score += round((logprob_score * 0.7 + no_speech_score * 0.3), 3) * duration
+        total_duration += duration
+    return seg_score / total_duration
+
+@asynccontextmanager
+async def _local_copy(file_path: str):
+    """
+    storage.local_copy with the download and the cleanup run in a thread, so
+    fetching a recording from S3 does not block the event loop.
+    """
+    copy = get_storage().local_copy(file_path)
+    local_path = await asyncio.to_thread(copy.__enter__)
+    try:
+        yield local_path
+    finally:
+        await asyncio.to_thread(copy.__exit__, None, None, None)
+
+async def _detect_speech(local_path: str):
+    """
+    Run VAD over the audio. Returns (PCM, speech spans), with no spans when
+    the recording holds no speech, or None when VAD cannot be applied.
+    """
+    if not CONFIG.VAD_ENABLED or not ffmpeg_available():
+        return None
+    try:
+        pcm = await asyncio.to_thread(decode_pcm, local_path)
+        spans = await asyncio.to_thread(detect_speech_spans, pcm)
+    except Exception as e:
+        logger.warning(f"VAD failed, sending the full recording: {e}")
+        return None
+    return pcm, spans
+
+async def _transcribe_chunk(pcm: bytes, spans, semaphore: asyncio.Semaphore, backend: TranscriptionBackend, model: str):
+    """
+    Encode the given speech spans as one chunk in TRANSCODE_CODEC and
+    transcribe it. Returns the backend result and the chunk's TimeMap to the
+    original audio.
+    """
+    chunk_pcm, time_map = trim_pcm(pcm, spans)
+    fd, chunk_path = tempfile.mkstemp(suffix=codec_extension(CONFIG.TRANSCODE_CODEC))
+    os.close(fd)
+    try:
+        await asyncio.to_thread(encode_pcm, chunk_pcm, chunk_path, CONFIG.TRANSCODE_CODEC)
+        async with semaphore:
+            transcription = await backend.transcribe(chunk_path, model, sum(e - s for s, e in spans))
+    finally:
+        os.unlink(chunk_path)
+    return transcription, time_map
+
+def _stitch(results):
+    """
+    Merge per-chunk responses (in order) into text, words, segments and language.
+    """
+    texts, words, segments = [], [], []
+    language_seconds = {}
+    for transcription, time_map in results:
+        if transcription.text and transcription.text.strip():
+            texts.append(transcription.text.strip())
+        for w in transcription.words:
+            words.append({
+                "start": time_map.to_original(w.get("start")),
+                "end": time_map.to_original(w.get("end")),
+                "text": w.get("word"),
+            })
+        chunk_segments = transcription.segments
+        segments.extend(chunk_segments)
+        chunk_seconds = sum(float(seg.get("end", 0)) - float(seg.get("start", 0)) for seg in chunk_segments)
+        if transcription.language:
+            language_seconds[transcription.language] = language_seconds.get(transcription.language, 0) + chunk_seconds
+    language = max(language_seconds, key=language_seconds.get) if language_seconds else None
+    return " ".join(texts), words, segments, language
+
+async def transcribe_audio_file(
+    file_path: str,
+    duration_seconds: float = None,
+    model: str = None,
+    backend: Optional[TranscriptionBackend] = None,
+):
+    """
+    Transcribes the audio file with the given backend (settings.TRANSCRIPTION_BACKEND
+    by default); every backend yields the same text/language/segments/words shape.
+    Silence is trimmed locally first and long speech is split at silences
+    into chunks that are transcribed concurrently, then stitched back with
+    word timestamps mapped to the original audio. Fully silent recordings
+    skip the API call.
+    """
+    model = model or CONFIG.TRANSCRIPTION_MODEL
+    backend = backend or get_transcription_backend()
+    async with _local_copy(file_path) as local_path:
+        detected = await _detect_speech(str(local_path))
+
+        if detected is None:
+            results = [(await backend.transcribe(str(local_path), model, duration_seconds), TimeMap())]
+        else:
+            pcm, spans = detected
+            if not spans:
+                logger.info(f"No speech detected in {file_path}, skipping transcription call")
+                return {
+                    "text": "",
+                    "confidence": None,
+                    "language": None,
+                    "transcribe_time": datetime.now(timezone.utc),
+                    "words": [],
                 }
-                for s in (transcription.words if hasattr(transcription, "words") else [])
+            chunks = plan_chunks(spans, CONFIG.TRANSCRIPTION_CHUNK_SECONDS)
+            semaphore = asyncio.Semaphore(backend.max_parallel_chunks)
+            tasks = [
+                asyncio.create_task(_transcribe_chunk(pcm, chunk, semaphore, backend, model))
+                for chunk in chunks
             ]
-        }
-    
-    return transcription_data
+            try:
+                results = await asyncio.gather(*tasks)
+            except BaseException:
+                # One chunk failed and the whole file will be retried: stop the
+                # siblings from spending more rate-limit budget
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+    text, words, segments, language = _stitch(results)
 
+    transcription_data = {
+        "text": text,
+        "confidence": await compute_confidence(segments),
+        "language": language,
+        "transcribe_time": datetime.now(timezone.utc),
+        "words": words,
+    }
+
+    return transcription_data
@@ -0,0 +1,33 @@
+from functools import lru_cache
+from typing import Optional
+
+from api.config.config import settings as CONFIG
+from api.services.transcription_backends.base import BackendTranscription, TranscriptionBackend
+
+
+@lru_cache(maxsize=None)
+def get_transcription_backend(name: Optional[str] = None) -> TranscriptionBackend:
+    """
+    Transcription engine by name ("groq" or "local"), defaulting to
+    settings.TRANSCRIPTION_BACKEND.
+    """
+    name = name or CONFIG.TRANSCRIPTION_BACKEND
+    if name == "local":
+        from api.services.transcription_backends.local import LocalWhisperBackend
+
+        return LocalWhisperBackend()
+    if name == "groq":
+        from api.services.transcription_backends.groq import GroqBackend
+
+        return GroqBackend()
+    raise ValueError(f"Unknown transcription backend: {name}")
+
+
+def backend_for_queue(queue: Optional[str]) -> TranscriptionBackend:
+    """
+    Engine configured for a Celery queue in settings.TRANSCRIPTION_QUEUE_BACKENDS.
+    """
+    return get_transcription_backend(CONFIG.TRANSCRIPTION_QUEUE_BACKENDS.get(queue))
+
+
+__all__ = ["BackendTranscription", "TranscriptionBackend", "get_transcription_backend", "backend_for_queue"]
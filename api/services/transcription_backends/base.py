@@ -0,0 +1,42 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class BackendTranscription:
+    """
+    Engine-neutral transcription of one audio file. Segments carry start,
+    end, text, avg_logprob and no_speech_prob; words carry start, end and word.
+    """
+
+    text: str
+    language: Optional[str] = None
+    segments: List[Dict[str, Any]] = field(default_factory=list)
+    words: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class TranscriptionBackend(ABC):
+    """
+    A speech-to-text engine behind transcribe_audio_file.
+    """
+
+    name: str
+
+    @abstractmethod
+    async def transcribe(self, path: str, model: str, audio_seconds: Optional[float] = None) -> BackendTranscription:
+        """
+        Transcribe the audio file at the local path with the requested model
+        tier (settings.TRANSCRIPTION_MODEL or TRANSCRIPTION_MODEL_TURBO).
+        """
+
+    def model_label(self, model: str) -> str:
+        """
+        Name stored in Transcription.model_name and used as the cache key, so
+        results of different engines are never mixed up.
+        """
+        return model
+
+    @property
+    def max_parallel_chunks(self) -> int:
+        return 1
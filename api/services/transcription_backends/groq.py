@@ -0,0 +1,40 @@
+from typing import Optional
+
+from api.config.client import get_transcription_client
+from api.config.config import settings as CONFIG
+from api.services.rate_limiter import call_with_rate_limit
+from api.services.transcription_backends.base import BackendTranscription, TranscriptionBackend
+
+
+class GroqBackend(TranscriptionBackend):
+    """
+    Remote Whisper on Groq, throttled by the shared Redis rate limiter.
+    """
+
+    name = "groq"
+
+    async def transcribe(self, path: str, model: str, audio_seconds: Optional[float] = None) -> BackendTranscription:
+        with open(path, "rb") as file:
+            async def call():
+                file.seek(0)
+                return await get_transcription_client().audio.transcriptions.create(
+                    file=file,
+                    model=model,
+                    prompt=CONFIG.AUDIO_TRANSCRIBE_PROMPT,
+                    response_format="verbose_json",
+                    timestamp_granularities=["word", "segment"],
+                    temperature=0.0
+                )
+
+            response = await call_with_rate_limit(call, audio_seconds)
+
+        return BackendTranscription(
+            text=response.text or "",
+            language=response.language,
+            segments=list(getattr(response, "segments", None) or []),
+            words=list(getattr(response, "words", None) or []),
+        )
+
+    @property
+    def max_parallel_chunks(self) -> int:
+        return CONFIG.TRANSCRIPTION_MAX_PARALLEL_CHUNKS
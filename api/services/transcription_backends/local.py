@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import threading
+from typing import Optional
+
+from api.config.config import settings as CONFIG
+from api.services.transcription_backends.base import BackendTranscription, TranscriptionBackend
+
+logger = logging.getLogger(__name__)
+
+
+class LocalWhisperBackend(TranscriptionBackend):
+    """
+    Whisper on this machine's CPU through faster-whisper (CTranslate2, int8).
+    Audio never leaves the box and no provider quota is used.
+    """
+
+    name = "local"
+
+    def __init__(self):
+        self._models = {}
+        self._models_lock = threading.Lock()
+        # CTranslate2 runs LOCAL_WHISPER_WORKERS transcriptions side by side
+        self._slots = threading.BoundedSemaphore(CONFIG.LOCAL_WHISPER_WORKERS)
+
+    def _local_model_name(self, model: str) -> str:
+        if model == CONFIG.TRANSCRIPTION_MODEL_TURBO:
+            return CONFIG.LOCAL_WHISPER_MODEL_TURBO
+        return CONFIG.LOCAL_WHISPER_MODEL
+
+    def model_label(self, model: str) -> str:
+        return f"local/{self._local_model_name(model)}"
+
+    def _get_model(self, name: str):
+        with self._models_lock:
+            model = self._models.get(name)
+            if model is None:
+                try:
+                    from faster_whisper import WhisperModel
+                except ImportError as e:
+                    raise RuntimeError(
+                        "The local transcription backend needs faster-whisper (pip install faster-whisper)"
+                    ) from e
+                logger.info(f"Loading local Whisper model {name} on CPU")
+                model = WhisperModel(
+                    name,
+                    device="cpu",
+                    compute_type=CONFIG.LOCAL_WHISPER_COMPUTE_TYPE,
+                    cpu_threads=CONFIG.LOCAL_WHISPER_CPU_THREADS,
+                    num_workers=CONFIG.LOCAL_WHISPER_WORKERS,
+                )
+                self._models[name] = model
+            return model
+
+    def _transcribe_sync(self, path: str, model: str) -> BackendTranscription:
+        whisper = self._get_model(self._local_model_name(model))
+        with self._slots:
+            segments_iter, info = whisper.transcribe(
+                path,
+                initial_prompt=CONFIG.AUDIO_TRANSCRIBE_PROMPT,
+                temperature=0.0,
+                word_timestamps=True,
+                beam_size=CONFIG.LOCAL_WHISPER_BEAM_SIZE,
+            )
+            # Segments are decoded lazily; consume them while holding the slot
+            raw_segments = list(segments_iter)
+
+        segments, words = [], []
+        for seg in raw_segments:
+            segments.append({
+                "start": seg.start,
+                "end": seg.end,
+                "text": seg.text,
+                "avg_logprob": seg.avg_logprob,
+                "no_speech_prob": seg.no_speech_prob,
+            })
+            for w in seg.words or []:
+                words.append({"start": w.start, "end": w.end, "word": w.word})
+
+        return BackendTranscription(
+            text="".join(seg.text for seg in raw_segments).strip(),
+            language=info.language,
+            segments=segments,
+            words=words,
+        )
+
+    async def transcribe(self, path: str, model: str, audio_seconds: Optional[float] = None) -> BackendTranscription:
+        return await asyncio.to_thread(self._transcribe_sync, path, model)
+
+    @property
+    def max_parallel_chunks(self) -> int:
+        return CONFIG.LOCAL_WHISPER_WORKERS
@@ -0,0 +1,167 @@
+""" Transcription results cached by (audio hash, model, prompt hash) in Redis """
+import json
+import time
+import hashlib
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from api.config.redis_client import get_cache_redis_client
+from api.models.recordings import Recording
+from api.models.transcriptions import Transcription
+from api.schemas.transcriptions import TranscriptionStatus
+
+from api.config.config import settings as CONFIG
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "transcription_cache"
+_LRU_KEY = f"{_KEY_PREFIX}:lru"
+_STATS_KEY = f"{_KEY_PREFIX}:stats"
+
+_CACHED_FIELDS = ("text", "language", "confidence", "words")
+
+
+def prompt_hash(prompt: Optional[str] = None) -> str:
+    prompt = CONFIG.AUDIO_TRANSCRIBE_PROMPT if prompt is None else prompt
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+
+
+def cache_key(audio_hash: str, model: str, prompt: Optional[str] = None) -> str:
+    return f"{_KEY_PREFIX}:{audio_hash}:{model}:{prompt_hash(prompt)}"
+
+
+def get_cached_transcription(audio_hash: Optional[str], model: str) -> Optional[Dict[str, Any]]:
+    """
+    Return cached text/language/confidence/words for the audio, or None.
+    Hits refresh the entry's LRU position and TTL.
+    """
+    redis_client = get_cache_redis_client()
+    if not CONFIG.TRANSCRIPTION_CACHE_ENABLED or not audio_hash or redis_client is None:
+        return None
+
+    key = cache_key(audio_hash, model)
+    try:
+        raw = redis_client.get(key)
+        if raw is None:
+            redis_client.hincrby(_STATS_KEY, "misses", 1)
+            return None
+        pipe = redis_client.pipeline()
+        pipe.expire(key, CONFIG.TRANSCRIPTION_CACHE_TTL_SECONDS)
+        pipe.zadd(_LRU_KEY, {key: time.time()})
+        pipe.hincrby(_STATS_KEY, "hits", 1)
+        pipe.execute()
+        return json.loads(raw)
+    except Exception as e:
+        logger.warning(f"Transcription cache lookup failed: {e}")
+        return None
+
+
+def set_cached_transcription(audio_hash: Optional[str], model: str, data: Dict[str, Any]) -> None:
+    """
+    Store a result and evict the least recently used entries over the cap.
+    """
+    redis_client = get_cache_redis_client()
+    if not CONFIG.TRANSCRIPTION_CACHE_ENABLED or not audio_hash or redis_client is None:
+        return
+
+    key = cache_key(audio_hash, model)
+    try:
+        payload = json.dumps({f: data.get(f) for f in _CACHED_FIELDS})
+        pipe = redis_client.pipeline()
+        pipe.set(key, payload, ex=CONFIG.TRANSCRIPTION_CACHE_TTL_SECONDS)
+        pipe.zadd(_LRU_KEY, {key: time.time()})
+        # Entries that expired by TTL leave stale LRU members; drop them too
+        pipe.zremrangebyscore(_LRU_KEY, "-inf", time.time() - CONFIG.TRANSCRIPTION_CACHE_TTL_SECONDS)
+        pipe.zcard(_LRU_KEY)
+        size = pipe.execute()[-1]
+
+        overflow = size - CONFIG.TRANSCRIPTION_CACHE_MAX_ENTRIES
+        if overflow > 0:
+            evicted = [member for member, _ in redis_client.zpopmin(_LRU_KEY, overflow)]
+            if evicted:
+                redis_client.delete(*evicted)
+                redis_client.hincrby(_STATS_KEY, "evictions", len(evicted))
+    except Exception as e:
+        logger.warning(f"Transcription cache store failed: {e}")
+
+
+def get_cache_stats() -> Dict[str, int]:
+    redis_client = get_cache_redis_client()
+    if redis_client is None:
+        return {}
+    stats = {k.decode(): int(v) for k, v in redis_client.hgetall(_STATS_KEY).items()}
+    stats["entries"] = redis_client.zcard(_LRU_KEY)
+    return stats
+
+
+def find_transcription_for_audio(db: Any, recording: Recording, model: str) -> Optional[Dict[str, Any]]:
+    """
+    Cache lookup with a database fallback: a completed transcription of
+    byte-identical audio by the same model is copied and put back in the cache.
+    Uses the synchronous session of the Celery worker.
+    """
+    if not recording.content_hash:
+        return None
+
+    cached = get_cached_transcription(recording.content_hash, model)
+    if cached is not None:
+        return cached
+
+    existing = (
+        db.query(Transcription)
+        .join(Recording, Recording.id == Transcription.recording_id)
+        .filter(
+            Recording.content_hash == recording.content_hash,
+            Recording.id != recording.id,
+            Transcription.status == TranscriptionStatus.completed.value,
+            Transcription.model_name == model,
+        )
+        .order_by(Transcription.transcribed_at.desc())
+        .first()
+    )
+    if not existing:
+        return None
+
+    data = {f: getattr(existing, f) for f in _CACHED_FIELDS}
+    set_cached_transcription(recording.content_hash, model, data)
+    return data
+
+
+def backfill_from_db(db: Any, batch_size: int = 500) -> int:
+    """
+    Populate the cache from completed transcriptions of content-addressed
+    recordings. Rows are assumed to have used the current prompt.
+    """
+    query = (
+        db.query(Transcription, Recording.content_hash)
+        .join(Recording, Recording.id == Transcription.recording_id)
+        .filter(
+            Recording.content_hash.isnot(None),
+            Transcription.status == TranscriptionStatus.completed.value,
+            Transcription.is_deleted == False,
+        )
+        .order_by(Transcription.transcribed_at.asc())
+    )
+
+    count = 0
+    for transcription, content_hash in query.yield_per(batch_size):
+        model = transcription.model_name or CONFIG.TRANSCRIPTION_MODEL
+        data = {f: getattr(transcription, f) for f in _CACHED_FIELDS}
+        set_cached_transcription(content_hash, model, data)
+        count += 1
+
+    logger.info(f"Backfilled {count} transcriptions into the cache")
+    return count
+
+
+if __name__ == "__main__":
+    from api.connections.database_connection import get_sync_db_session
+
+    db_gen = get_sync_db_session()
+    db = next(db_gen)
+    try:
+        print(f"Backfilled {backfill_from_db(db)} entries at {datetime.now(timezone.utc).isoformat()}")
+        print(get_cache_stats())
+    finally:
+        db.close()
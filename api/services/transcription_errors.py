@@ -0,0 +1,38 @@
+""" Classifies transcription failures into retryable and permanent ones """
+import subprocess
+
+import httpx
+from groq import APIConnectionError, APIStatusError
+
+TRANSIENT = "transient"
+PERMANENT = "permanent"
+
+# Status codes worth another attempt: timeouts, conflicts, throttling and server errors
+_RETRYABLE_STATUS = {408, 409, 425, 429}
+
+
+def classify_error(error: BaseException) -> str:
+    """
+    Network failures, timeouts, 429 and 5xx responses are transient. Audio
+    the decoder or provider rejects (4xx, ffmpeg errors) and missing files
+    are permanent and should fail fast. Anything unrecognised is retried.
+    """
+    if isinstance(error, APIStatusError):
+        code = error.status_code
+        return TRANSIENT if code >= 500 or code in _RETRYABLE_STATUS else PERMANENT
+    if isinstance(error, (APIConnectionError, httpx.TransportError, ConnectionError, TimeoutError)):
+        return TRANSIENT
+    if isinstance(error, (subprocess.CalledProcessError, FileNotFoundError, ValueError)):
+        return PERMANENT
+    return TRANSIENT
+
+
+def describe_error(error: BaseException, limit: int = 2000) -> str:
+    """
+    Short, storable failure reason.
+    """
+    detail = str(error)
+    if isinstance(error, subprocess.CalledProcessError) and error.stderr:
+        stderr = error.stderr.decode(errors="replace") if isinstance(error.stderr, bytes) else error.stderr
+        detail = stderr.strip() or detail
+    return f"{type(error).__name__}: {detail}"[:limit]
@@ -0,0 +1,59 @@
+""" In-flight registry that keeps at most one queued/running task per transcription """
+import logging
+
+from api.config.redis_client import get_cache_redis_client
+
+from api.config.config import settings as CONFIG
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "transcription:inflight"
+
+
+def _key(transcription_id: int) -> str:
+    return f"{_KEY_PREFIX}:{transcription_id}"
+
+
+def mark_inflight(transcription_id: int) -> bool:
+    """
+    Register a transcription as queued. Returns False if a task for it is
+    already queued or running. Without Redis every enqueue is allowed and the
+    task's conditional claim is the only guard.
+    """
+    redis_client = get_cache_redis_client()
+    if redis_client is None:
+        return True
+    try:
+        return bool(redis_client.set(
+            _key(transcription_id), 1, nx=True, ex=CONFIG.TRANSCRIPTION_INFLIGHT_TTL_SECONDS
+        ))
+    except Exception as e:
+        logger.warning(f"In-flight registry unavailable, enqueueing {transcription_id} anyway: {e}")
+        return True
+
+
+def refresh_inflight(transcription_id: int, ttl_seconds: int) -> None:
+    """
+    Keep the registration alive across a deferred retry.
+    """
+    redis_client = get_cache_redis_client()
+    if redis_client is None:
+        return
+    try:
+        redis_client.set(
+            _key(transcription_id), 1,
+            ex=max(ttl_seconds, CONFIG.TRANSCRIPTION_INFLIGHT_TTL_SECONDS),
+        )
+    except Exception as e:
+        logger.warning(f"Could not refresh in-flight entry for {transcription_id}: {e}")
+
+
+def clear_inflight(transcription_id: int) -> None:
+    redis_client = get_cache_redis_client()
+    if redis_client is None:
+        return
+    try:
+        redis_client.delete(_key(transcription_id))
+    except Exception as e:
+        logger.warning(f"Could not clear in-flight entry for {transcription_id}: {e}")
+
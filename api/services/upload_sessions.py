@@ -0,0 +1,307 @@
+import os
+import json
+import time
+import uuid
+import shutil
+import hashlib
+import logging
+from pathlib import Path
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from api.config.config import settings as CONFIG
+from api.config.redis_client import get_cache_redis_client
+from api.schemas.recordings import UploadSessionCreate, UploadSessionResponse
+from api.utils.upload_writer import WrittenFile
+
+logger = logging.getLogger(__name__)
+
+_META_FILE = "meta.json"
+_DATA_FILE = "data.part"
+
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _session_dir(session_id: str) -> Path:
+    return Path(CONFIG.UPLOAD_SESSION_DIR) / session_id
+
+
+def _read_meta(session_id: str) -> Optional[dict]:
+    meta_path = _session_dir(session_id) / _META_FILE
+    if not meta_path.exists():
+        return None
+    with open(meta_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_meta(session_id: str, meta: dict) -> None:
+    meta_path = _session_dir(session_id) / _META_FILE
+    tmp_path = meta_path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, meta_path)
+
+
+def _current_offset(session_id: str) -> int:
+    data_path = _session_dir(session_id) / _DATA_FILE
+    return data_path.stat().st_size if data_path.exists() else 0
+
+
+def _to_response(session_id: str, meta: dict, offset: int) -> UploadSessionResponse:
+    return UploadSessionResponse(
+        session_id=session_id,
+        offset=offset,
+        total_bytes=meta.get("total_bytes"),
+        expires_at=datetime.fromtimestamp(meta["expires_at"], tz=timezone.utc),
+    )
+
+
+def sweep_expired_upload_sessions() -> int:
+    """
+    Remove staged sessions whose TTL has passed. Returns the number removed.
+    """
+    sessions_root = Path(CONFIG.UPLOAD_SESSION_DIR)
+    if not sessions_root.exists():
+        return 0
+
+    now = time.time()
+    removed = 0
+    for session_path in sessions_root.iterdir():
+        if not session_path.is_dir():
+            continue
+        try:
+            meta = _read_meta(session_path.name)
+            expires_at = meta["expires_at"] if meta else session_path.stat().st_mtime + CONFIG.UPLOAD_SESSION_TTL_SECONDS
+        except Exception:
+            expires_at = 0
+        if expires_at <= now:
+            shutil.rmtree(session_path, ignore_errors=True)
+            removed += 1
+
+    if removed:
+        logger.info("Swept %s expired upload sessions", removed)
+    return removed
+
+
+def _create_session(user_id: int, payload: UploadSessionCreate) -> tuple[str, dict]:
+    sweep_expired_upload_sessions()
+
+    if payload.total_bytes is not None and payload.total_bytes > CONFIG.MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Uploaded file exceeds the {CONFIG.MAX_UPLOAD_BYTES} byte limit",
+        )
+
+    session_id = uuid.uuid4().hex
+    os.makedirs(_session_dir(session_id), exist_ok=True)
+    (_session_dir(session_id) / _DATA_FILE).touch()
+
+    meta = {
+        "user_id": user_id,
+        "duration_seconds": payload.duration_seconds,
+        "recorded_at": payload.recorded_at.isoformat(),
+        "location_text": payload.location_text,
+        "filename": payload.filename,
+        "total_bytes": payload.total_bytes,
+        "on_device": payload.on_device,
+        "expires_at": time.time() + CONFIG.UPLOAD_SESSION_TTL_SECONDS,
+    }
+    _write_meta(session_id, meta)
+    return session_id, meta
+
+
+async def create_upload_session(user_id: int, payload: UploadSessionCreate) -> UploadSessionResponse:
+    session_id, meta = await run_in_threadpool(_create_session, user_id, payload)
+    return _to_response(session_id, meta, 0)
+
+
+async def get_upload_session(session_id: str, user_id: int) -> tuple[dict, int]:
+    """
+    Load a session owned by the user, raising 404 if it is unknown or expired.
+    """
+    if not session_id.isalnum():
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    meta = await run_in_threadpool(_read_meta, session_id)
+    if not meta or meta["user_id"] != user_id or meta["expires_at"] <= time.time():
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    offset = await run_in_threadpool(_current_offset, session_id)
+    return meta, offset
+
+
+async def get_upload_session_status(session_id: str, user_id: int) -> UploadSessionResponse:
+    meta, offset = await get_upload_session(session_id, user_id)
+    return _to_response(session_id, meta, offset)
+
+
+def parse_content_range(content_range: Optional[str]) -> tuple[int, int, Optional[int]]:
+    """
+    Parse ``bytes <start>-<end>/<total|*>`` into (start, end, total).
+    """
+    try:
+        unit, _, spec = (content_range or "").strip().partition(" ")
+        byte_range, _, total = spec.partition("/")
+        start, _, end = byte_range.partition("-")
+        if unit != "bytes":
+            raise ValueError
+        return int(start), int(end), (None if total in ("", "*") else int(total))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Content-Range header")
+
+
+def _lock_key(session_id: str) -> str:
+    return f"upload:session:lock:{session_id}"
+
+
+def _acquire_lock(session_id: str) -> Optional[str]:
+    """
+    Take the session's append lock, shared by every API process through
+    Redis. Returns the token to release it with, or None if it is held.
+    """
+    token = uuid.uuid4().hex
+    if get_cache_redis_client().set(_lock_key(session_id), token, nx=True, ex=CONFIG.UPLOAD_SESSION_LOCK_SECONDS):
+        return token
+    return None
+
+
+def _release_lock(session_id: str, token: str) -> None:
+    # Only delete the lock if it is still ours (it may have expired and been retaken)
+    get_cache_redis_client().eval(_RELEASE_SCRIPT, 1, _lock_key(session_id), token)
+
+
+@asynccontextmanager
+async def upload_session_lock(session_id: str, offset: Optional[int] = None):
+    """
+    Hold the session's lock for the block, or raise 409 (carrying the offset
+    when known) if another request holds it. Serialises appends with each
+    other and with completion.
+    """
+    token = await run_in_threadpool(_acquire_lock, session_id)
+    if token is None:
+        detail = {"message": "Another request for this upload session is in progress"}
+        if offset is not None:
+            detail["offset"] = offset
+        raise HTTPException(status_code=409, detail=detail)
+    try:
+        yield
+    finally:
+        await run_in_threadpool(_release_lock, session_id, token)
+
+
+def _append(data_path: Path, chunk: bytes) -> None:
+    with open(data_path, "ab") as f:
+        f.write(chunk)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+async def append_upload_chunk(
+    session_id: str,
+    user_id: int,
+    content_range: Optional[str],
+    chunks: AsyncIterator[bytes],
+) -> UploadSessionResponse:
+    """
+    Append one byte range to the session. Ranges must arrive in order; a range
+    that does not start at the current offset, or that races another request
+    for the same session, gets a 409 carrying the offset so the client can
+    resume from there.
+    """
+    meta, offset = await get_upload_session(session_id, user_id)
+    start, end, total = parse_content_range(content_range)
+    if total is not None and total > CONFIG.MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Uploaded file exceeds the {CONFIG.MAX_UPLOAD_BYTES} byte limit",
+        )
+
+    async with upload_session_lock(session_id, offset):
+        return await _append_range(session_id, user_id, start, end, total, chunks)
+
+
+async def _append_range(
+    session_id: str,
+    user_id: int,
+    start: int,
+    end: int,
+    total: Optional[int],
+    chunks: AsyncIterator[bytes],
+) -> UploadSessionResponse:
+    # Re-read under the lock: the offset may have moved since the first check
+    meta, offset = await get_upload_session(session_id, user_id)
+    if start != offset:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "Range does not start at the current offset", "offset": offset},
+        )
+    if total is not None:
+        if meta.get("total_bytes") is None:
+            meta["total_bytes"] = total
+            await run_in_threadpool(_write_meta, session_id, meta)
+        elif meta["total_bytes"] != total:
+            raise HTTPException(status_code=400, detail="Total size does not match the session")
+
+    limit = meta.get("total_bytes") or CONFIG.MAX_UPLOAD_BYTES
+    data_path = _session_dir(session_id) / _DATA_FILE
+    expected = end - start + 1
+    received = bytearray()
+
+    async for chunk in chunks:
+        received.extend(chunk)
+        if len(received) > expected or offset + len(received) > limit:
+            raise HTTPException(status_code=413, detail="Chunk exceeds the declared range")
+        if len(received) >= CONFIG.UPLOAD_CHUNK_SIZE:
+            await run_in_threadpool(_append, data_path, bytes(received))
+            offset += len(received)
+            expected -= len(received)
+            received.clear()
+
+    if received:
+        await run_in_threadpool(_append, data_path, bytes(received))
+        offset += len(received)
+
+    return _to_response(session_id, meta, offset)
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CONFIG.UPLOAD_CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+async def finalize_upload_session(session_id: str, user_id: int) -> tuple[dict, WrittenFile]:
+    """
+    Verify a session is complete and hand back its metadata and staged file.
+    The caller holds upload_session_lock, moves the file into place and then
+    calls discard_upload_session, so concurrent completes cannot both create
+    a recording.
+    """
+    meta, offset = await get_upload_session(session_id, user_id)
+    total = meta.get("total_bytes")
+    if total is not None and offset != total:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "Upload is incomplete", "offset": offset},
+        )
+    if offset == 0:
+        raise HTTPException(status_code=400, detail="Upload is empty")
+
+    data_path = _session_dir(session_id) / _DATA_FILE
+    sha256 = await run_in_threadpool(_hash_file, data_path)
+    return meta, WrittenFile(path=data_path, sha256=sha256, size_bytes=offset)
+
+
+async def discard_upload_session(session_id: str) -> None:
+    await run_in_threadpool(shutil.rmtree, _session_dir(session_id), True)
@@ -0,0 +1,172 @@
+""" Local CPU voice-activity detection used to trim silence before transcription """
+import bisect
+import logging
+import subprocess
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+import numpy as np
+
+from api.config.config import settings as CONFIG
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+_BYTES_PER_SAMPLE = 2
+_FRAME_MS = 30
+
+Span = Tuple[float, float]
+
+
+def decode_pcm(path: str) -> bytes:
+    """
+    Decode any audio file to 16 kHz mono signed 16-bit PCM with ffmpeg.
+    """
+    result = subprocess.run(
+        [
+            "ffmpeg", "-v", "error", "-i", path,
+            "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE),
+            "-f", "s16le", "-",
+        ],
+        capture_output=True,
+        check=True,
+    )
+    return result.stdout
+
+
+def encode_flac(pcm: bytes, destination: str) -> None:
+    """
+    Encode raw 16 kHz mono PCM to FLAC.
+    """
+    subprocess.run(
+        [
+            "ffmpeg", "-y", "-v", "error",
+            "-f", "s16le", "-ar", str(SAMPLE_RATE), "-ac", "1", "-i", "-",
+            "-c:a", "flac", destination,
+        ],
+        input=pcm,
+        capture_output=True,
+        check=True,
+    )
+
+
+def _speech_frames(pcm: bytes) -> List[bool]:
+    frame_bytes = SAMPLE_RATE * _FRAME_MS // 1000 * _BYTES_PER_SAMPLE
+    n_frames = len(pcm) // frame_bytes
+
+    try:
+        import webrtcvad
+
+        vad = webrtcvad.Vad(CONFIG.VAD_AGGRESSIVENESS)
+        return [
+            vad.is_speech(pcm[i * frame_bytes:(i + 1) * frame_bytes], SAMPLE_RATE)
+            for i in range(n_frames)
+        ]
+    except ImportError:
+        pass
+
+    # Energy fallback: frames well above the estimated noise floor are speech
+    samples = np.frombuffer(pcm[:n_frames * frame_bytes], dtype=np.int16).astype(np.float32)
+    if not n_frames:
+        return []
+    frames = samples.reshape(n_frames, -1)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1)) + 1e-6
+    db = 20 * np.log10(rms / 32768.0)
+    noise_floor = np.percentile(db, 10)
+    threshold = max(noise_floor + CONFIG.VAD_ENERGY_MARGIN_DB, CONFIG.VAD_MIN_ENERGY_DB)
+    return list(db > threshold)
+
+
+def detect_speech_spans(pcm: bytes) -> List[Span]:
+    """
+    Return (start, end) seconds of speech, padded, with short gaps merged
+    and blips shorter than VAD_MIN_SPEECH_SECONDS dropped.
+    """
+    frame_seconds = _FRAME_MS / 1000
+    total_seconds = len(pcm) / (SAMPLE_RATE * _BYTES_PER_SAMPLE)
+
+    spans: List[Span] = []
+    start = None
+    for i, is_speech in enumerate(_speech_frames(pcm)):
+        if is_speech and start is None:
+            start = i * frame_seconds
+        elif not is_speech and start is not None:
+            spans.append((start, i * frame_seconds))
+            start = None
+    if start is not None:
+        spans.append((start, total_seconds))
+
+    merged: List[Span] = []
+    for s, e in spans:
+        s = max(0.0, s - CONFIG.VAD_PADDING_SECONDS)
+        e = min(total_seconds, e + CONFIG.VAD_PADDING_SECONDS)
+        if merged and s - merged[-1][1] < CONFIG.VAD_MIN_SILENCE_SECONDS:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], e))
+        else:
+            merged.append((s, e))
+
+    return [(s, e) for s, e in merged if e - s >= CONFIG.VAD_MIN_SPEECH_SECONDS]
+
+
+@dataclass
+class TimeMap:
+    """
+    Maps timestamps in trimmed audio back to the original recording.
+    Each entry is (trimmed_start, original_start) for one kept span.
+    """
+    trimmed_starts: List[float] = field(default_factory=list)
+    original_starts: List[float] = field(default_factory=list)
+
+    def add(self, trimmed_start: float, original_start: float) -> None:
+        self.trimmed_starts.append(trimmed_start)
+        self.original_starts.append(original_start)
+
+    def to_original(self, t: float) -> float:
+        if t is None or not self.trimmed_starts:
+            return t
+        i = max(0, bisect.bisect_right(self.trimmed_starts, t) - 1)
+        return round(self.original_starts[i] + (t - self.trimmed_starts[i]), 3)
+
+
+def trim_pcm(pcm: bytes, spans: List[Span]) -> Tuple[bytes, TimeMap]:
+    """
+    Concatenate only the speech spans, returning the trimmed PCM and its TimeMap.
+    """
+    bytes_per_second = SAMPLE_RATE * _BYTES_PER_SAMPLE
+    time_map = TimeMap()
+    parts = []
+    trimmed_seconds = 0.0
+    for s, e in spans:
+        begin = int(s * SAMPLE_RATE) * _BYTES_PER_SAMPLE
+        end = int(e * SAMPLE_RATE) * _BYTES_PER_SAMPLE
+        time_map.add(trimmed_seconds, s)
+        parts.append(pcm[begin:end])
+        trimmed_seconds += (end - begin) / bytes_per_second
+    return b"".join(parts), time_map
+
+
+def plan_chunks(spans: List[Span], max_seconds: float) -> List[List[Span]]:
+    """
+    Group speech spans into chunks of at most max_seconds of speech, cutting
+    only at the silences between spans. A single span longer than the limit
+    is split into equal pieces.
+    """
+    chunks: List[List[Span]] = []
+    current: List[Span] = []
+    current_seconds = 0.0
+
+    for s, e in spans:
+        pieces = max(1, int(np.ceil((e - s) / max_seconds)))
+        step = (e - s) / pieces
+        for k in range(pieces):
+            piece = (s + k * step, s + (k + 1) * step)
+            length = piece[1] - piece[0]
+            if current and current_seconds + length > max_seconds:
+                chunks.append(current)
+                current, current_seconds = [], 0.0
+            current.append(piece)
+            current_seconds += length
+
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,64 @@
+""" Grouping a day's recordings into visits: consecutive clips made at one place """
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from api.models.recordings import Recording
+
+from api.config.config import settings as CONFIG
+
+_EARTH_RADIUS_M = 6371000.0
+
+
+def distance_meters(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi, d_lambda = phi2 - phi1, math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * _EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+@dataclass
+class Visit:
+    recordings: List[Recording] = field(default_factory=list)
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    _located: int = 0
+
+    def add(self, recording: Recording) -> None:
+        finished = recording.recorded_at + timedelta(seconds=recording.duration_seconds or 0)
+        self.recordings.append(recording)
+        self.start = min(self.start or recording.recorded_at, recording.recorded_at)
+        self.end = max(self.end or finished, finished)
+        if recording.latitude is not None and recording.longitude is not None:
+            # Running centroid of the located clips
+            self._located += 1
+            if self.latitude is None:
+                self.latitude, self.longitude = recording.latitude, recording.longitude
+            else:
+                self.latitude += (recording.latitude - self.latitude) / self._located
+                self.longitude += (recording.longitude - self.longitude) / self._located
+
+    def accepts(self, recording: Recording) -> bool:
+        if recording.recorded_at - self.end > timedelta(minutes=CONFIG.VISIT_MAX_GAP_MINUTES):
+            return False
+        if recording.latitude is None or self.latitude is None:
+            # No fix on one side: close enough in time is taken as the same place
+            return True
+        return distance_meters(self.latitude, self.longitude, recording.latitude, recording.longitude) <= CONFIG.VISIT_RADIUS_METERS
+
+
+def cluster_visits(recordings: List[Recording]) -> List[Visit]:
+    """
+    Walk the recordings in time order and start a new visit whenever a clip
+    is more than VISIT_RADIUS_METERS from the current visit's centroid or
+    follows it by more than VISIT_MAX_GAP_MINUTES.
+    """
+    visits: List[Visit] = []
+    for recording in sorted(recordings, key=lambda r: r.recorded_at):
+        if not visits or not visits[-1].accepts(recording):
+            visits.append(Visit())
+        visits[-1].add(recording)
+    return visits
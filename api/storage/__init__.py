@@ -0,0 +1,34 @@
+import os
+from functools import lru_cache
+
+from api.config.config import settings as CONFIG
+from api.storage.base import StorageBackend
+
+
+@lru_cache(maxsize=1)
+def get_storage() -> StorageBackend:
+    """
+    Storage driver selected by settings.STORAGE_BACKEND ("local" or "s3").
+    """
+    if CONFIG.STORAGE_BACKEND == "s3":
+        from api.storage.s3 import S3Storage
+
+        return S3Storage(
+            bucket=CONFIG.S3_BUCKET,
+            chunk_size=CONFIG.UPLOAD_CHUNK_SIZE,
+            endpoint_url=CONFIG.S3_ENDPOINT_URL,
+            access_key=CONFIG.S3_ACCESS_KEY,
+            secret_key=CONFIG.S3_SECRET_KEY,
+            region=CONFIG.S3_REGION,
+        )
+
+    from api.storage.local import LocalStorage
+
+    return LocalStorage(
+        root=CONFIG.UPLOAD_DIR,
+        chunk_size=CONFIG.UPLOAD_CHUNK_SIZE,
+        excluded_dirs=[os.path.relpath(CONFIG.UPLOAD_STAGING_DIR, CONFIG.UPLOAD_DIR)],
+    )
+
+
+__all__ = ["StorageBackend", "get_storage"]
@@ -0,0 +1,49 @@
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+
+class StorageBackend(ABC):
+    """
+    Blocking interface over where recording files live. Keys are the
+    relative paths stored in Recording.file_path. Call from async code
+    through run_in_threadpool.
+    """
+
+    @abstractmethod
+    def put_file(self, local_path: Path, key: str) -> None:
+        """Move a local (staged) file into storage under key."""
+
+    @abstractmethod
+    def write_stream(self, key: str, chunks: Iterable[bytes]) -> int:
+        """Write an iterable of byte chunks under key, returning the size."""
+
+    @abstractmethod
+    def open_read(
+        self,
+        key: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> Iterator[bytes]:
+        """Stream the object, or the inclusive byte range [start, end] of it."""
+
+    @abstractmethod
+    def size(self, key: str) -> Optional[int]:
+        """Size in bytes, or None if the key does not exist."""
+
+    def exists(self, key: str) -> bool:
+        return self.size(key) is not None
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Delete key; missing keys are ignored."""
+
+    @abstractmethod
+    def list_keys(self, prefix: str = "") -> Iterator[str]:
+        """Yield every key under prefix."""
+
+    @abstractmethod
+    @contextmanager
+    def local_copy(self, key: str) -> Iterator[Path]:
+        """Yield a local filesystem path holding the object's bytes."""
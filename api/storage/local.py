@@ -0,0 +1,76 @@
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from api.storage.base import StorageBackend
+
+
+class LocalStorage(StorageBackend):
+    def __init__(self, root: str, chunk_size: int, excluded_dirs: Iterable[str] = ()):
+        self.root = Path(root)
+        self.chunk_size = chunk_size
+        self.excluded_dirs = [Path(d) for d in excluded_dirs]
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key.lstrip("/\\")).resolve()
+        if self.root.resolve() not in path.parents:
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    def put_file(self, local_path: Path, key: str) -> None:
+        destination = self._path(key)
+        os.makedirs(destination.parent, exist_ok=True)
+        os.replace(local_path, destination)
+
+    def write_stream(self, key: str, chunks: Iterable[bytes]) -> int:
+        destination = self._path(key)
+        os.makedirs(destination.parent, exist_ok=True)
+        tmp_path = destination.with_name(destination.name + ".part")
+        size = 0
+        with open(tmp_path, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                size += len(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, destination)
+        return size
+
+    def open_read(
+        self,
+        key: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> Iterator[bytes]:
+        with open(self._path(key), "rb") as f:
+            if start:
+                f.seek(start)
+            remaining = None if end is None else end - (start or 0) + 1
+            while remaining is None or remaining > 0:
+                block = f.read(self.chunk_size if remaining is None else min(self.chunk_size, remaining))
+                if not block:
+                    break
+                if remaining is not None:
+                    remaining -= len(block)
+                yield block
+
+    def size(self, key: str) -> Optional[int]:
+        path = self._path(key)
+        return path.stat().st_size if path.is_file() else None
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def list_keys(self, prefix: str = "") -> Iterator[str]:
+        base = self.root / prefix if prefix else self.root
+        if not base.exists():
+            return
+        excluded = [self.root / d for d in self.excluded_dirs]
+        for p in base.rglob("*"):
+            if p.is_file() and not any(d == p.parent or d in p.parents for d in excluded):
+                yield str(p.relative_to(self.root)).replace("\\", "/")
+
+    @contextmanager
+    def local_copy(self, key: str) -> Iterator[Path]:
+        yield self._path(key)
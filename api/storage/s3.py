@@ -0,0 +1,132 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from api.storage.base import StorageBackend
+
+# S3 multipart uploads need parts of at least 5 MiB (except the last one)
+_MIN_PART_SIZE = 8 * 1024 * 1024
+
+
+class S3Storage(StorageBackend):
+    """
+    Driver for any S3-protocol object store (AWS S3, MinIO for local runs).
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        chunk_size: int,
+        endpoint_url: Optional[str] = None,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        region: Optional[str] = None,
+    ):
+        try:
+            import boto3
+            from botocore.exceptions import ClientError
+        except ImportError as e:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires the 'boto3' package") from e
+
+        self._client_error = ClientError
+        self.bucket = bucket
+        self.chunk_size = chunk_size
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            aws_access_key_id=access_key,
+            aws_secret_access_key=secret_key,
+            region_name=region,
+        )
+        self._ensure_bucket()
+
+    def _ensure_bucket(self) -> None:
+        try:
+            self.client.head_bucket(Bucket=self.bucket)
+        except self._client_error:
+            self.client.create_bucket(Bucket=self.bucket)
+
+    def put_file(self, local_path: Path, key: str) -> None:
+        # upload_file switches to multipart transparently for large files
+        self.client.upload_file(str(local_path), self.bucket, key)
+        Path(local_path).unlink(missing_ok=True)
+
+    def write_stream(self, key: str, chunks: Iterable[bytes]) -> int:
+        upload = self.client.create_multipart_upload(Bucket=self.bucket, Key=key)
+        upload_id = upload["UploadId"]
+        parts = []
+        buffer = bytearray()
+        size = 0
+
+        def flush_part():
+            part_number = len(parts) + 1
+            response = self.client.upload_part(
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=bytes(buffer),
+            )
+            parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+            buffer.clear()
+
+        try:
+            for chunk in chunks:
+                buffer.extend(chunk)
+                size += len(chunk)
+                if len(buffer) >= _MIN_PART_SIZE:
+                    flush_part()
+            if buffer or not parts:
+                flush_part()
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except Exception:
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=key, UploadId=upload_id)
+            raise
+        return size
+
+    def open_read(
+        self,
+        key: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> Iterator[bytes]:
+        kwargs = {"Bucket": self.bucket, "Key": key}
+        if start is not None or end is not None:
+            kwargs["Range"] = f"bytes={start or 0}-{'' if end is None else end}"
+        body = self.client.get_object(**kwargs)["Body"]
+        try:
+            yield from body.iter_chunks(self.chunk_size)
+        finally:
+            body.close()
+
+    def size(self, key: str) -> Optional[int]:
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+        except self._client_error:
+            return None
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def list_keys(self, prefix: str = "") -> Iterator[str]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                yield obj["Key"]
+
+    @contextmanager
+    def local_copy(self, key: str) -> Iterator[Path]:
+        fd, tmp_name = tempfile.mkstemp(suffix=Path(key).suffix)
+        os.close(fd)
+        try:
+            self.client.download_file(self.bucket, key, tmp_name)
+            yield Path(tmp_name)
+        finally:
+            Path(tmp_name).unlink(missing_ok=True)
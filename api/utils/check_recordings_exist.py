@@ -1,12 +1,11 @@
-""" The Util Function to check if the Recordings exist in folder as well as in database """
+""" The Util Function to check if the Recordings exist in storage as well as in database """
 from pathlib import Path
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from api.config.config import settings
 from api.models.recordings import Recording
-
-recordings_dir = Path(settings.UPLOAD_DIR)
+from api.storage import get_storage
 
 async def check_recordings_exist(db: AsyncSession):
     result = await db.execute(
@@ -21,12 +20,8 @@ async def check_recordings_exist(db: AsyncSession):
         rel = str(recording.file_path).lstrip("/\\")
         db_paths.add(str(Path(rel)).replace("\\", "/"))
 
-    fs_paths: set[str] = set()
-    if recordings_dir.exists():
-        for p in recordings_dir.rglob("*"):
-            if p.is_file():
-                rel = p.relative_to(recordings_dir)
-                fs_paths.add(str(rel).replace("\\", "/"))
+    storage = get_storage()
+    fs_paths: set[str] = set(await run_in_threadpool(lambda: list(storage.list_keys())))
 
     missing_files = sorted(db_paths - fs_paths)
     orphan_files = sorted(fs_paths - db_paths)
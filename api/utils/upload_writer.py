@@ -0,0 +1,118 @@
+""" Streams uploaded audio to disk without blocking the event loop """
+import os
+import time
+import uuid
+import logging
+import hashlib
+from pathlib import Path
+from dataclasses import dataclass
+from typing import AsyncIterator, BinaryIO
+
+from fastapi import UploadFile, HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from api.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WrittenFile:
+    path: Path
+    sha256: str
+    size_bytes: int
+
+
+async def iter_upload_file(file: UploadFile) -> AsyncIterator[bytes]:
+    """
+    Yield an UploadFile in bounded chunks (each read runs in the threadpool).
+    """
+    while True:
+        chunk = await file.read(settings.UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
+
+def sweep_staging_files(max_age_seconds: int | None = None) -> int:
+    """
+    Remove staging files (top level of UPLOAD_STAGING_DIR) older than
+    UPLOAD_STAGING_MAX_AGE_SECONDS: uploads that failed after staging and
+    were never moved into storage. Returns the number removed.
+    """
+    staging_root = Path(settings.UPLOAD_STAGING_DIR)
+    if not staging_root.exists():
+        return 0
+
+    cutoff = time.time() - (max_age_seconds or settings.UPLOAD_STAGING_MAX_AGE_SECONDS)
+    removed = 0
+    for path in staging_root.glob("*.part"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            continue
+
+    if removed:
+        logger.info("Swept %s stale staging files", removed)
+    return removed
+
+
+def _open_staging_file() -> tuple[Path, BinaryIO]:
+    os.makedirs(settings.UPLOAD_STAGING_DIR, exist_ok=True)
+    path = Path(settings.UPLOAD_STAGING_DIR) / f"{uuid.uuid4().hex}.part"
+    return path, open(path, "wb")
+
+
+def _sync_and_close(buffer: BinaryIO) -> None:
+    buffer.flush()
+    os.fsync(buffer.fileno())
+    buffer.close()
+
+
+def _discard(path: Path, buffer: BinaryIO) -> None:
+    if not buffer.closed:
+        buffer.close()
+    path.unlink(missing_ok=True)
+
+
+async def write_stream_to_staging(
+    chunks: AsyncIterator[bytes],
+    max_bytes: int | None = None,
+) -> WrittenFile:
+    """
+    Write an async byte stream into a fresh staging file.
+
+    The SHA-256 and byte count are computed while writing, the size limit is
+    enforced per chunk and the file is fsynced before returning. All disk I/O
+    happens in the threadpool so the event loop is never blocked.
+    """
+    limit = max_bytes or settings.MAX_UPLOAD_BYTES
+    digest = hashlib.sha256()
+    size = 0
+
+    path, buffer = await run_in_threadpool(_open_staging_file)
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > limit:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Uploaded file exceeds the {limit} byte limit",
+                )
+            digest.update(chunk)
+            await run_in_threadpool(buffer.write, chunk)
+        await run_in_threadpool(_sync_and_close, buffer)
+    except HTTPException:
+        await run_in_threadpool(_discard, path, buffer)
+        raise
+    except Exception as e:
+        await run_in_threadpool(_discard, path, buffer)
+        raise HTTPException(status_code=500, detail=f"Could not save file: {str(e)}")
+
+    return WrittenFile(path=path, sha256=digest.hexdigest(), size_bytes=size)
+
+
+async def discard_staged(staged: WrittenFile) -> None:
+    await run_in_threadpool(lambda: staged.path.unlink(missing_ok=True))
@@ -4,6 +4,8 @@ import sys
 import os
 from pathlib import Path
 
+from api.config.config import settings as CONFIG
+
 ROOT = Path(__file__).parent
 
 def main():
@@ -13,23 +15,35 @@ def main():
     print("🚀 Starting Pana Backend Integration...")
 
     # 1. Start Celery Workers (Dedicated Queues)
-    # Using '-P solo' for Windows compatibility to avoid 'spawn' issues without extra deps.
-    
-    # High Priority Worker
-    celery_command_high = [
-        "celery", "-A", "celery_service.celery_app", "worker", 
-        "--loglevel=info", "-P", "solo", "-Q", "high_priority", "-n", "high_worker@%h"
+    # The thread pool works on Windows without 'spawn' issues and lets each worker
+    # run CELERY_WORKER_CONCURRENCY transcriptions on its shared asyncio loop.
+    # Workers for high_priority/default are spawned and retired by the autoscaler
+    # between AUTOSCALE_MIN_WORKERS and AUTOSCALE_MAX_WORKERS per queue.
+    autoscaler_command = ["python", "-m", "celery_service.autoscaler"]
+    print(f"   > Launching Celery Autoscaler: {' '.join(autoscaler_command)}")
+    celery_process_autoscaler = subprocess.Popen(autoscaler_command, cwd=ROOT)
+
+    # On-device Worker (local CPU Whisper; concurrency matches the model's workers)
+    celery_command_local = [
+        "celery", "-A", "celery_service.celery_app", "worker",
+        "--loglevel=info", "-P", CONFIG.CELERY_WORKER_POOL,
+        "--concurrency", str(CONFIG.LOCAL_WHISPER_WORKERS),
+        "-Q", CONFIG.TRANSCRIPTION_LOCAL_QUEUE, "-n", "local_worker@%h"
     ]
-    print(f"   > Launching High Priority Celery: {' '.join(celery_command_high)}")
-    celery_process_high = subprocess.Popen(celery_command_high, cwd=ROOT, shell=True)
+    print(f"   > Launching On-device Celery: {' '.join(celery_command_local)}")
+    celery_process_local = subprocess.Popen(celery_command_local, cwd=ROOT, shell=True)
 
-    # Default Priority Worker
-    celery_command_default = [
-        "celery", "-A", "celery_service.celery_app", "worker", 
-        "--loglevel=info", "-P", "solo", "-Q", "default", "-n", "default_worker@%h"
+    # Beat scheduler (periodic reaper for stuck transcriptions)
+    celery_command_beat = [
+        "celery", "-A", "celery_service.celery_app", "beat", "--loglevel=info"
     ]
-    print(f"   > Launching Default Priority Celery: {' '.join(celery_command_default)}")
-    celery_process_default = subprocess.Popen(celery_command_default, cwd=ROOT, shell=True)
+    print(f"   > Launching Celery Beat: {' '.join(celery_command_beat)}")
+    celery_process_beat = subprocess.Popen(celery_command_beat, cwd=ROOT, shell=True)
+
+    # Fair-share dispatcher (feeds the default/local queues per user)
+    dispatcher_command = ["python", "-m", "celery_service.fair_dispatcher"]
+    print(f"   > Launching Fair Dispatcher: {' '.join(dispatcher_command)}")
+    dispatcher_process = subprocess.Popen(dispatcher_command, cwd=ROOT)
 
     # 2. Start FastAPI Server
     api_command = ["python", "-m", "api.server"]
@@ -45,11 +59,17 @@ def main():
         while True:
             time.sleep(0.5)
             # Check if any process has exited unexpectedly
-            if celery_process_high.poll() is not None:
-                print("❌ High priority Celery worker terminated unexpectedly.")
+            if celery_process_autoscaler.poll() is not None:
+                print("❌ Celery autoscaler terminated unexpectedly.")
+                break
+            if celery_process_local.poll() is not None:
+                print("❌ On-device Celery worker terminated unexpectedly.")
+                break
+            if celery_process_beat.poll() is not None:
+                print("❌ Celery beat terminated unexpectedly.")
                 break
-            if celery_process_default.poll() is not None:
-                print("❌ Default priority Celery worker terminated unexpectedly.")
+            if dispatcher_process.poll() is not None:
+                print("❌ Fair dispatcher terminated unexpectedly.")
                 break
             if api_process.poll() is not None:
                 print("❌ API server terminated unexpectedly.")
@@ -59,10 +79,19 @@ def main():
     finally:
         # Cleanup
         for name, process in [
-            ("High Priority Celery", celery_process_high),
-            ("Default Priority Celery", celery_process_default),
+            ("Celery Autoscaler", celery_process_autoscaler),
+            ("On-device Celery", celery_process_local),
+            ("Celery Beat", celery_process_beat),
+            ("Fair Dispatcher", dispatcher_process),
             ("API", api_process)
         ]:
+            if process is celery_process_autoscaler and process.poll() is None:
+                # Ctrl+C reaches the autoscaler too; let it drain its workers first
+                print(f"   > Waiting for {name} to drain workers...")
+                try:
+                    process.wait(timeout=CONFIG.AUTOSCALE_DRAIN_TIMEOUT_SECONDS)
+                except subprocess.TimeoutExpired:
+                    pass
             if process.poll() is None:
                 print(f"   > Killing {name}...")
                 if "Celery" in name:
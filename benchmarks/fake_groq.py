@@ -0,0 +1,119 @@
+"""
+Stand-in for Groq's transcription endpoint, so the pipeline can be load
+tested without spending credit. Point the stack at it with
+GROQ_TRANSCRIPTION_BASE_URL=http://127.0.0.1:9100.
+
+    python -m benchmarks.fake_groq --latency-ms 800 --jitter-ms 300 --error-rate 0.02
+"""
+import random
+import asyncio
+import argparse
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+_WORDS = (
+    "today i went for a walk and thought about the week ahead there is a lot "
+    "to do at work but i feel calm about it i should call my sister soon"
+).split()
+
+
+def create_app(
+    latency_ms: float = 500,
+    jitter_ms: float = 200,
+    error_rate: float = 0.0,
+    rate_limit_rate: float = 0.0,
+    words: int = 150,
+    seconds_per_word: float = 0.4,
+) -> FastAPI:
+    app = FastAPI(title="Fake Groq")
+    stats = {"requests": 0, "ok": 0, "errors": 0, "rate_limited": 0, "bytes_in": 0, "in_flight": 0, "peak_in_flight": 0}
+
+    def _payload(model: str) -> dict:
+        word_list, segments = [], []
+        for i in range(words):
+            start = round(i * seconds_per_word, 3)
+            word_list.append({"word": _WORDS[i % len(_WORDS)], "start": start, "end": round(start + seconds_per_word * 0.8, 3)})
+        for i in range(0, words, 20):
+            chunk = word_list[i:i + 20]
+            segments.append({
+                "id": len(segments),
+                "start": chunk[0]["start"],
+                "end": chunk[-1]["end"],
+                "text": " ".join(w["word"] for w in chunk),
+                "avg_logprob": round(random.uniform(-0.4, -0.1), 3),
+                "no_speech_prob": round(random.uniform(0.0, 0.1), 3),
+            })
+        return {
+            "task": "transcribe",
+            "language": "english",
+            "duration": round(words * seconds_per_word, 3),
+            "text": " ".join(w["word"] for w in word_list),
+            "segments": segments,
+            "words": word_list,
+            "x_groq": {"id": f"fake-{stats['requests']}", "model": model},
+        }
+
+    @app.post("/openai/v1/audio/transcriptions")
+    async def transcriptions(request: Request):
+        stats["requests"] += 1
+        stats["in_flight"] += 1
+        stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+        try:
+            form = await request.form()
+            upload = form.get("file")
+            if upload is not None:
+                stats["bytes_in"] += len(await upload.read())
+
+            await asyncio.sleep(max(0.0, random.gauss(latency_ms, jitter_ms)) / 1000)
+
+            roll = random.random()
+            if roll < rate_limit_rate:
+                stats["rate_limited"] += 1
+                return JSONResponse(
+                    {"error": {"message": "Rate limit reached", "type": "tokens", "code": "rate_limit_exceeded"}},
+                    status_code=429,
+                    headers={"retry-after": "2"},
+                )
+            if roll < rate_limit_rate + error_rate:
+                stats["errors"] += 1
+                return JSONResponse({"error": {"message": "Internal server error", "type": "internal_server_error"}}, status_code=500)
+
+            stats["ok"] += 1
+            return _payload(str(form.get("model") or ""))
+        finally:
+            stats["in_flight"] -= 1
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    @app.post("/stats/reset")
+    async def reset_stats():
+        for key in stats:
+            stats[key] = 0
+        return stats
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Groq transcription server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=500, help="Mean response latency")
+    parser.add_argument("--jitter-ms", type=float, default=200, help="Standard deviation of the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--words", type=int, default=150, help="Words per response (payload size)")
+    args = parser.parse_args()
+
+    app = create_app(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        words=args.words,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
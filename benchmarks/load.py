@@ -0,0 +1,276 @@
+"""
+End-to-end load driver: uploads synthetic recordings concurrently through
+POST /api/recordings and waits for each transcript on the SSE stream, so
+the measurement covers create_recording, the queue, transcribe_audio_task
+and the completion event.
+
+Run the stack (backend.py) with GROQ_TRANSCRIPTION_BASE_URL pointing at
+benchmarks/fake_groq.py and the Groq rate limits raised well above the
+offered load, then:
+
+    python -m benchmarks.load --uploads 200 --concurrency 20 --save baseline
+    python -m benchmarks.load --uploads 200 --concurrency 20 --compare baseline
+"""
+import io
+import json
+import time
+import wave
+import asyncio
+import argparse
+import platform
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+
+from api.auth.jwt_utils import create_access_token
+from api.connections.database_connection import get_sync_db_session
+from api.models.users import User
+from api.models.transcriptions import Transcription
+from api.services.vad import SAMPLE_RATE
+from celery_service.celery_app import celery_app
+
+BASELINES = Path(__file__).resolve().parent / "baselines"
+_TERMINAL = {"completed", "failed", "dead_letter"}
+
+
+def synthetic_recording(seconds: float, seed: int) -> bytes:
+    """
+    A WAV of syllable-like noise bursts between pauses. The seed makes every
+    upload unique, so neither blob dedup nor the transcription cache kicks in.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(seconds * SAMPLE_RATE)
+    t = np.arange(n) / SAMPLE_RATE
+    envelope = (np.sin(2 * np.pi * 3.0 * t) > 0).astype(np.float32)
+    envelope *= (np.sin(2 * np.pi * 0.25 * t) > -0.5)  # a pause every few seconds
+    voice = np.sin(2 * np.pi * 180 * t) + 0.5 * np.sin(2 * np.pi * 360 * t) + 0.3 * rng.standard_normal(n)
+    samples = (voice * envelope * 6000 + rng.standard_normal(n) * 30).astype(np.int16)
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(SAMPLE_RATE)
+        out.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+def bench_tokens(users: int) -> List[str]:
+    """
+    Access tokens for bench-user-0..N, creating the users if needed.
+    """
+    db = next(get_sync_db_session())
+    try:
+        tokens = []
+        for i in range(users):
+            sub = f"bench-user-{i}"
+            if not db.query(User).filter(User.google_id == sub).first():
+                db.add(User(google_id=sub, email=f"{sub}@bench.local", name=f"Bench {i}"))
+                db.commit()
+            tokens.append(create_access_token({"sub": sub, "email": f"{sub}@bench.local"}, expires_minutes=24 * 60))
+        return tokens
+    finally:
+        db.close()
+
+
+def worker_count(queue: str) -> int:
+    replies = celery_app.control.inspect(timeout=2).active_queues() or {}
+    return sum(1 for queues in replies.values() if any(q["name"] == queue for q in queues)) or 1
+
+
+def queue_waits(recording_ids: List[int]) -> Dict[int, float]:
+    """
+    Seconds between each transcription row being created and its first
+    claim (claimed_at is refreshed by the heartbeat, so it is not used).
+    """
+    db = next(get_sync_db_session())
+    try:
+        rows = db.query(Transcription).filter(Transcription.recording_id.in_(recording_ids)).all()
+        return {
+            row.recording_id: (row.first_claimed_at - row.created_at).total_seconds()
+            for row in rows
+            if row.first_claimed_at and row.created_at
+        }
+    finally:
+        db.close()
+
+
+def percentiles(values: List[float]) -> Optional[dict]:
+    if not values:
+        return None
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "count": len(values),
+        "p50": round(float(p50), 3),
+        "p95": round(float(p95), 3),
+        "p99": round(float(p99), 3),
+        "max": round(float(max(values)), 3),
+    }
+
+
+class Run:
+    def __init__(self, api: str, tokens: List[str], args):
+        self.api = api.rstrip("/")
+        self.tokens = tokens
+        self.args = args
+        self.upload_started: Dict[int, float] = {}
+        self.owner: Dict[int, str] = {}
+        self.upload_latency: List[float] = []
+        self.upload_errors = 0
+        self.done: Dict[int, tuple] = {}
+        self.sse_ready = asyncio.Event()
+
+    async def listen(self, client: httpx.AsyncClient) -> None:
+        async with client.stream("GET", f"{self.api}/api/transcription-events/", timeout=None) as response:
+            self.sse_ready.set()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                event = json.loads(line[5:])
+                recording_id = event.get("recording_id")
+                if event.get("status") in _TERMINAL and recording_id not in self.done:
+                    self.done[recording_id] = (time.time(), event["status"])
+
+    async def upload(self, client: httpx.AsyncClient, index: int, semaphore: asyncio.Semaphore) -> None:
+        audio = synthetic_recording(self.args.seconds, seed=int(time.time() * 1000) + index)
+        token = self.tokens[index % len(self.tokens)]
+        async with semaphore:
+            started = time.time()
+            try:
+                response = await client.post(
+                    f"{self.api}/api/recordings",
+                    headers={"Authorization": f"Bearer {token}"},
+                    files={"file": (f"bench-{index}.wav", audio, "audio/wav")},
+                    data={
+                        "duration_seconds": str(int(self.args.seconds)),
+                        "recorded_at": datetime.now(timezone.utc).isoformat(),
+                    },
+                )
+                response.raise_for_status()
+                recording_id = response.json()["data"]["id"]
+            except Exception as e:
+                self.upload_errors += 1
+                print(f"upload {index} failed: {e}")
+                return
+            self.upload_latency.append(time.time() - started)
+            self.upload_started[recording_id] = started
+            self.owner[recording_id] = token
+
+    async def cleanup(self, client: httpx.AsyncClient) -> None:
+        for recording_id, token in self.owner.items():
+            try:
+                await client.delete(f"{self.api}/api/recordings/{recording_id}", headers={"Authorization": f"Bearer {token}"})
+            except Exception:
+                pass
+
+    async def execute(self) -> dict:
+        limits = httpx.Limits(max_connections=self.args.concurrency + 2)
+        async with httpx.AsyncClient(timeout=120, limits=limits) as client:
+            listener = asyncio.create_task(self.listen(client))
+            await asyncio.wait_for(self.sse_ready.wait(), timeout=10)
+
+            semaphore = asyncio.Semaphore(self.args.concurrency)
+            began = time.time()
+            await asyncio.gather(*(self.upload(client, i, semaphore) for i in range(self.args.uploads)))
+
+            deadline = time.time() + self.args.timeout
+            while not set(self.upload_started) <= set(self.done) and time.time() < deadline and not listener.done():
+                await asyncio.sleep(0.2)
+            listener.cancel()
+            outstanding = len(set(self.upload_started) - set(self.done))
+            if outstanding:
+                print(f"Gave up with {outstanding} transcripts outstanding")
+
+            if not self.args.keep:
+                await self.cleanup(client)
+
+        finished = [(rid, t, status) for rid, (t, status) in self.done.items() if rid in self.upload_started]
+        completed = [t for _, t, status in finished if status == "completed"]
+        end_to_end = [t - self.upload_started[rid] for rid, t, status in finished if status == "completed"]
+        waits = queue_waits(list(self.upload_started))
+        workers = self.args.workers or worker_count(self.args.queue)
+        window = (max(completed) - began) if completed else None
+
+        return {
+            "uploads": self.args.uploads,
+            "upload_errors": self.upload_errors,
+            "completed": len(completed),
+            "failed": sum(1 for _, _, status in finished if status != "completed"),
+            "timed_out": len(self.upload_started) - len(finished),
+            "upload_latency_seconds": percentiles(self.upload_latency),
+            "queue_wait_seconds": percentiles(list(waits.values())),
+            "time_to_transcript_seconds": percentiles(end_to_end),
+            "workers": workers,
+            "tasks_per_second": round(len(completed) / window, 3) if window else None,
+            "tasks_per_second_per_worker": round(len(completed) / window / workers, 3) if window else None,
+        }
+
+
+def fake_server_stats(url: Optional[str]) -> Optional[dict]:
+    if not url:
+        return None
+    try:
+        return httpx.get(f"{url.rstrip('/')}/stats", timeout=5).json()
+    except Exception:
+        return None
+
+
+def compare(result: dict, baseline: dict) -> None:
+    print(f"\nCompared with {baseline['name']} ({baseline['recorded_at']}):")
+    for metric in ("upload_latency_seconds", "queue_wait_seconds", "time_to_transcript_seconds"):
+        for stat in ("p50", "p95", "p99"):
+            new, old = (result[metric] or {}).get(stat), (baseline["result"][metric] or {}).get(stat)
+            if new is not None and old:
+                print(f"  {metric}.{stat:<4} {old:>9.3f} -> {new:>9.3f}  ({(new - old) / old:+.1%})")
+    new, old = result["tasks_per_second_per_worker"], baseline["result"]["tasks_per_second_per_worker"]
+    if new is not None and old:
+        print(f"  tasks_per_second_per_worker {old:>9.3f} -> {new:>9.3f}  ({(new - old) / old:+.1%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end transcription pipeline benchmark")
+    parser.add_argument("--api", default="http://127.0.0.1:8000")
+    parser.add_argument("--fake-groq", default="http://127.0.0.1:9100", help="Fake server to read call stats from")
+    parser.add_argument("--uploads", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10, help="Uploads in flight at once")
+    parser.add_argument("--users", type=int, default=4, help="Bench users the uploads are spread over")
+    parser.add_argument("--seconds", type=float, default=20, help="Length of each synthetic recording")
+    parser.add_argument("--queue", default="default", help="Queue whose workers are counted")
+    parser.add_argument("--workers", type=int, default=None, help="Worker count (default: ask Celery)")
+    parser.add_argument("--timeout", type=float, default=900, help="Seconds to wait for transcripts after the last upload")
+    parser.add_argument("--keep", action="store_true", help="Keep the uploaded recordings")
+    parser.add_argument("--save", metavar="NAME", help="Save the result as baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="Compare with baselines/NAME.json")
+    args = parser.parse_args()
+
+    if args.fake_groq:
+        try:
+            httpx.post(f"{args.fake_groq.rstrip('/')}/stats/reset", timeout=5)
+        except Exception:
+            args.fake_groq = None
+
+    result = asyncio.run(Run(args.api, bench_tokens(args.users), args).execute())
+    result["fake_groq"] = fake_server_stats(args.fake_groq)
+    print(json.dumps(result, indent=2))
+
+    if args.compare:
+        compare(result, json.loads((BASELINES / f"{args.compare}.json").read_text()))
+
+    if args.save:
+        BASELINES.mkdir(exist_ok=True)
+        record = {
+            "name": args.save,
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "host": platform.node(),
+            "params": {k: v for k, v in vars(args).items() if k not in ("save", "compare")},
+            "result": result,
+        }
+        (BASELINES / f"{args.save}.json").write_text(json.dumps(record, indent=2))
+        print(f"\nSaved baselines/{args.save}.json")
+
+
+if __name__ == "__main__":
+    main()
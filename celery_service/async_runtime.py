@@ -0,0 +1,72 @@
+"""
+One long-lived asyncio event loop per worker process.
+
+Tasks run on Celery's thread pool and hand their coroutines to this loop
+instead of calling asyncio.run() each time, so clients created on the loop
+(and their HTTP connection pools) are reused across tasks and N tasks can
+wait on I/O concurrently inside one process.
+"""
+import asyncio
+import logging
+import threading
+from typing import Any, Coroutine, Optional
+
+from celery.signals import worker_process_shutdown
+
+logger = logging.getLogger(__name__)
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+_db_setup: Optional[asyncio.Future] = None
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _thread
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(
+                target=_loop.run_forever,
+                name="celery-async-runtime",
+                daemon=True,
+            )
+            _thread.start()
+            logger.info("Started persistent asyncio loop for Celery tasks")
+        return _loop
+
+
+def run_async(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run a coroutine on the shared loop and block the calling task thread
+    until it finishes.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result()
+
+
+async def ensure_async_db() -> None:
+    """
+    Set up the async engine on the shared loop for tasks that reuse the API's
+    async cruds. Only ever awaited on that loop, so the check needs no lock.
+    """
+    global _db_setup
+    from api.connections.database_connection import setup_engine_and_session
+
+    if _db_setup is None or (_db_setup.done() and _db_setup.exception()):
+        _db_setup = asyncio.ensure_future(setup_engine_and_session())
+    await _db_setup
+
+
+@worker_process_shutdown.connect
+def _shutdown_loop(**kwargs):
+    global _loop
+    if _loop is None:
+        return
+    from api.config.client import close_clients
+
+    try:
+        asyncio.run_coroutine_threadsafe(close_clients(), _loop).result(timeout=10)
+    except Exception as e:
+        logger.warning(f"Error closing API clients: {e}")
+    _loop.call_soon_threadsafe(_loop.stop)
+    _loop = None
@@ -0,0 +1,222 @@
+"""
+Supervisor that runs Celery worker processes per queue and scales them on
+queue depth and the age of the oldest waiting task.
+
+Workers are added as soon as tasks wait longer than AUTOSCALE_TARGET_WAIT_SECONDS,
+but not again until the last ones have had AUTOSCALE_WORKER_STARTUP_SECONDS to
+come up (the backlog does not shrink while they boot), and retired one at a time after AUTOSCALE_SCALE_DOWN_DELAY_SECONDS without work.
+Retiring is a warm shutdown broadcast to that worker only, so running tasks
+finish first. Every decision is exported to Redis for the admin endpoint.
+"""
+import sys
+import math
+import json
+import time
+import socket
+import logging
+import itertools
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from celery_service.celery_app import celery_app
+from api.config.redis_client import get_cache_redis_client
+from api.services import fair_scheduler
+from api.services.queue_stats import queue_depths, oldest_task_ages
+
+from api.config.config import settings as CONFIG
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parent.parent
+
+METRICS_KEY = "autoscaler:metrics"
+DECISIONS_KEY = "autoscaler:decisions"
+_MAX_DECISIONS = 500
+
+
+@dataclass
+class WorkerProcess:
+    name: str
+    queue: str
+    process: subprocess.Popen
+    started_at: float = field(default_factory=time.time)
+    retiring_since: Optional[float] = None
+
+
+class Autoscaler:
+    def __init__(self, queues: List[str]):
+        self.queues = queues
+        self.workers: Dict[str, List[WorkerProcess]] = {queue: [] for queue in queues}
+        self.idle_since: Dict[str, Optional[float]] = {queue: None for queue in queues}
+        self.hostname = socket.gethostname()
+        self._seq = itertools.count(1)
+        self.redis = get_cache_redis_client()
+
+    def _active(self, queue: str) -> List[WorkerProcess]:
+        return [w for w in self.workers[queue] if w.retiring_since is None]
+
+    def _starting(self, queue: str, now: float) -> int:
+        return sum(1 for w in self._active(queue) if now - w.started_at < CONFIG.AUTOSCALE_WORKER_STARTUP_SECONDS)
+
+    def _spawn(self, queue: str) -> None:
+        name = f"{queue}_worker_{next(self._seq)}"
+        command = [
+            sys.executable, "-m", "celery", "-A", "celery_service.celery_app", "worker",
+            "--loglevel=info",
+            "-P", CONFIG.CELERY_WORKER_POOL,
+            "--concurrency", str(CONFIG.CELERY_WORKER_CONCURRENCY),
+            "-Q", queue,
+            "-n", f"{name}@{self.hostname}",
+        ]
+        process = subprocess.Popen(command, cwd=ROOT)
+        self.workers[queue].append(WorkerProcess(name=f"{name}@{self.hostname}", queue=queue, process=process))
+        logger.info(f"Started {name} for {queue}")
+
+    def _retire(self, queue: str) -> None:
+        # Newest first: long-running workers keep their warm connection pools
+        worker = self._active(queue)[-1]
+        worker.retiring_since = time.time()
+        celery_app.control.shutdown(destination=[worker.name])
+        logger.info(f"Draining {worker.name}")
+
+    def _reap(self) -> None:
+        now = time.time()
+        for queue, workers in self.workers.items():
+            for worker in list(workers):
+                if worker.process.poll() is not None:
+                    if worker.retiring_since is None:
+                        logger.error(f"{worker.name} exited unexpectedly ({worker.process.returncode})")
+                    workers.remove(worker)
+                elif worker.retiring_since and now - worker.retiring_since > CONFIG.AUTOSCALE_DRAIN_TIMEOUT_SECONDS:
+                    logger.warning(f"{worker.name} did not drain in time, terminating")
+                    worker.process.terminate()
+
+    def _observe(self) -> Dict[str, dict]:
+        depths = queue_depths(self.queues)
+        ages = oldest_task_ages(self.queues)
+        observed = {}
+        for queue in self.queues:
+            depth, age = depths.get(queue, 0), ages.get(queue, 0.0)
+            if queue in CONFIG.FAIR_QUEUES:
+                # Work held back by the fair dispatcher is waiting too
+                try:
+                    depth += sum(fair_scheduler.backlog(queue).values())
+                    age = max(age, fair_scheduler.oldest_waiting_age(queue))
+                except Exception as e:
+                    logger.warning(f"Could not read fair-share backlog of {queue}: {e}")
+            observed[queue] = {"depth": depth, "oldest_age_seconds": round(age, 1)}
+        return observed
+
+    def desired_workers(self, queue: str, depth: int, age: float, current: int, now: float, starting: int = 0) -> int:
+        low, high = CONFIG.AUTOSCALE_MIN_WORKERS, CONFIG.AUTOSCALE_MAX_WORKERS
+        if depth == 0:
+            if self.idle_since[queue] is None:
+                self.idle_since[queue] = now
+            if now - self.idle_since[queue] >= CONFIG.AUTOSCALE_SCALE_DOWN_DELAY_SECONDS:
+                # Stepwise, restarting the idle clock after each retirement
+                self.idle_since[queue] = now
+                return max(low, current - 1)
+            return max(low, current)
+
+        self.idle_since[queue] = None
+        if starting:
+            # The backlog cannot shrink until the new workers are up
+            return max(low, current)
+        if current == 0 or age > CONFIG.AUTOSCALE_TARGET_WAIT_SECONDS:
+            # Everyone is busy: add enough workers to absorb the backlog
+            return min(high, max(low, current + math.ceil(depth / CONFIG.CELERY_WORKER_CONCURRENCY)))
+        return max(low, current)
+
+    def _export(self, queue: str, metrics: dict, decision: Optional[str]) -> None:
+        if self.redis is None:
+            return
+        try:
+            pipe = self.redis.pipeline()
+            pipe.hset(METRICS_KEY, queue, json.dumps(metrics))
+            if decision:
+                pipe.lpush(DECISIONS_KEY, json.dumps({**metrics, "queue": queue, "decision": decision}))
+                pipe.ltrim(DECISIONS_KEY, 0, _MAX_DECISIONS - 1)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Could not export autoscaler metrics: {e}")
+
+    def tick(self) -> None:
+        self._reap()
+        now = time.time()
+        for queue, observed in self._observe().items():
+            current = len(self._active(queue))
+            starting = self._starting(queue, now)
+            desired = self.desired_workers(
+                queue, observed["depth"], observed["oldest_age_seconds"], current, now, starting
+            )
+
+            decision = None
+            if desired > current:
+                for _ in range(desired - current):
+                    self._spawn(queue)
+                decision = "scale_up"
+            elif desired < current:
+                for _ in range(current - desired):
+                    self._retire(queue)
+                decision = "scale_down"
+
+            metrics = {
+                **observed,
+                "workers": current,
+                "desired": desired,
+                "starting": starting,
+                "draining": len(self.workers[queue]) - current,
+                "at": now,
+            }
+            if decision:
+                logger.info(f"{queue}: {decision} {current} -> {desired} ({observed})")
+            self._export(queue, metrics, decision)
+
+    def shutdown(self) -> None:
+        for queue in self.queues:
+            for _ in self._active(queue):
+                self._retire(queue)
+        deadline = time.time() + CONFIG.AUTOSCALE_DRAIN_TIMEOUT_SECONDS
+        while any(self.workers.values()) and time.time() < deadline:
+            self._reap()
+            time.sleep(1)
+        for workers in self.workers.values():
+            for worker in workers:
+                worker.process.kill()
+
+    def run(self) -> None:
+        for queue in self.queues:
+            for _ in range(CONFIG.AUTOSCALE_MIN_WORKERS):
+                self._spawn(queue)
+        logger.info(f"Autoscaler managing {self.queues}")
+        try:
+            while True:
+                try:
+                    self.tick()
+                except Exception as e:
+                    logger.exception(f"Autoscaler tick failed: {e}")
+                time.sleep(CONFIG.AUTOSCALE_INTERVAL_SECONDS)
+        except KeyboardInterrupt:
+            logger.info("Autoscaler stopping, draining workers")
+        finally:
+            self.shutdown()
+
+
+def get_autoscaler_metrics() -> dict:
+    """
+    Latest per-queue state and the most recent scaling decisions.
+    """
+    redis_client = get_cache_redis_client()
+    if redis_client is None:
+        return {}
+    return {
+        "queues": {k.decode(): json.loads(v) for k, v in redis_client.hgetall(METRICS_KEY).items()},
+        "decisions": [json.loads(raw) for raw in redis_client.lrange(DECISIONS_KEY, 0, 49)],
+    }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    Autoscaler(CONFIG.AUTOSCALE_QUEUES).run()
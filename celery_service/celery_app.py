@@ -1,4 +1,6 @@
+import time
 from celery import Celery
+from celery.signals import before_task_publish
 
 from api.config.config import settings
 CONFIG = settings
@@ -7,7 +9,12 @@ celery_app = Celery(
     "worker",
     broker=CONFIG.REDIS_BROKER_URL,
     backend=CONFIG.REDIS_RESULT_BACKEND,
-    include=["celery_service.tasks.transcription"],
+    include=[
+        "celery_service.tasks.transcription",
+        "celery_service.tasks.maintenance",
+        "celery_service.tasks.geo_backfill",
+        "celery_service.tasks.diary",
+    ],
 )
 
 celery_app.conf.update(
@@ -17,4 +24,29 @@ celery_app.conf.update(
     timezone="UTC",
     enable_utc=True,
     task_default_queue="default",
+    worker_pool=CONFIG.CELERY_WORKER_POOL,
+    worker_concurrency=CONFIG.CELERY_WORKER_CONCURRENCY,
+    # Long I/O-bound tasks: don't let one thread hoard queued messages
+    worker_prefetch_multiplier=1,
+    beat_schedule={
+        "reap-stuck-transcriptions": {
+            "task": "reap_stuck_transcriptions_task",
+            "schedule": CONFIG.REAPER_INTERVAL_SECONDS,
+            "options": {"queue": "high_priority", "expires": CONFIG.REAPER_INTERVAL_SECONDS},
+        },
+        "sweep-uploads": {
+            "task": "sweep_uploads_task",
+            "schedule": CONFIG.UPLOAD_SWEEP_INTERVAL_SECONDS,
+            "options": {"queue": "default", "expires": CONFIG.UPLOAD_SWEEP_INTERVAL_SECONDS},
+        },
+    },
 )
+
+
+@before_task_publish.connect
+def stamp_enqueue_time(headers=None, **kwargs):
+    """
+    Record when a message entered the broker, so queue age can be measured.
+    """
+    if headers is not None:
+        headers.setdefault("enqueued_at", time.time())
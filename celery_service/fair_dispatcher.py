@@ -0,0 +1,86 @@
+""" Single dispatcher that feeds Celery from the per-user fair-share sub-queues """
+import time
+import socket
+import logging
+
+from api.config.redis_client import get_cache_redis_client
+from api.services.fair_scheduler import DeficitRoundRobin
+from api.services.queue_stats import queue_depths
+from api.services.transcription_inflight import clear_inflight
+from celery_service.tasks.transcription import transcribe_audio_task
+
+from api.config.config import settings as CONFIG
+
+logger = logging.getLogger(__name__)
+
+_LOCK_KEY = "fairq:dispatcher"
+_LOCK_TTL_SECONDS = 10
+
+# Extend the lock only while we still hold it
+_RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+def _send(queue: str):
+    def send(user_id: str, item: dict) -> None:
+        kwargs = {"model": item["model"]} if item.get("model") else {}
+        try:
+            transcribe_audio_task.apply_async(args=[item["transcription_id"]], kwargs=kwargs, queue=queue)
+        except Exception:
+            # Let the reaper pick the row up again
+            clear_inflight(item["transcription_id"])
+            raise
+    return send
+
+
+def run() -> None:
+    """
+    Keep each fair queue's broker list at most FAIR_DISPATCH_DEPTH deep,
+    topping it up in deficit round-robin order. The shallow broker list is
+    what bounds how long a light user's new recording can wait.
+    """
+    redis_client = get_cache_redis_client()
+    identity = f"{socket.gethostname()}:{id(redis_client)}"
+    schedulers = {
+        queue: DeficitRoundRobin(redis_client, queue, CONFIG.FAIR_QUANTUM_SECONDS)
+        for queue in CONFIG.FAIR_QUEUES
+    }
+    renew = redis_client.register_script(_RENEW_SCRIPT)
+    holding = False
+    logger.info(f"Fair dispatcher started for queues {list(schedulers)}")
+
+    while True:
+        # Only one dispatcher may hold the in-memory round-robin state
+        try:
+            if holding:
+                holding = bool(renew(keys=[_LOCK_KEY], args=[identity, _LOCK_TTL_SECONDS]))
+            if not holding:
+                holding = bool(redis_client.set(_LOCK_KEY, identity, nx=True, ex=_LOCK_TTL_SECONDS))
+        except Exception as e:
+            logger.warning(f"Fair dispatcher lock unavailable: {e}")
+            holding = False
+        if not holding:
+            time.sleep(_LOCK_TTL_SECONDS / 2)
+            continue
+
+        try:
+            depths = queue_depths(list(schedulers))
+            for queue, scheduler in schedulers.items():
+                budget = CONFIG.FAIR_DISPATCH_DEPTH - depths.get(queue, CONFIG.FAIR_DISPATCH_DEPTH)
+                if budget > 0:
+                    sent = scheduler.dispatch(budget, _send(queue))
+                    if sent:
+                        logger.info(f"Dispatched {sent} tasks to {queue}")
+        except Exception as e:
+            logger.exception(f"Fair dispatch cycle failed: {e}")
+
+        time.sleep(CONFIG.FAIR_DISPATCH_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run()
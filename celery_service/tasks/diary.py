@@ -0,0 +1,81 @@
+import time
+import logging
+from datetime import date
+from typing import Optional
+
+from celery_service.celery_app import celery_app
+from celery_service.async_runtime import run_async, ensure_async_db
+
+from api.connections import database_connection
+from api.cruds.diary import create_or_update_diary, count_unfinished_transcriptions
+from api.services.diary_jobs import update_job
+
+from api.config.config import settings as CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+async def _unfinished(user_id: int, diary_date: date) -> int:
+    await ensure_async_db()
+    async with database_connection.async_session() as db:
+        return await count_unfinished_transcriptions(db, user_id, diary_date)
+
+
+async def _generate(job_id: str, user_id: int, diary_date: date):
+    await ensure_async_db()
+    async with database_connection.async_session() as db:
+        return await create_or_update_diary(
+            db,
+            user_id,
+            diary_date,
+            on_progress=lambda stage: update_job(job_id, stage=stage),
+        )
+
+
+@celery_app.task(name="generate_diary_task", bind=True, max_retries=None)
+def generate_diary_task(self, job_id: str, user_id: int, diary_date: str, deadline: Optional[float] = None):
+    """
+    Build the user's diary for the day, reporting each stage on the job so
+    the client can follow along over the diary events stream.
+
+    Acts as a barrier first: while any of the day's transcriptions is still
+    pending or processing, the task re-schedules itself every
+    DIARY_BARRIER_POLL_SECONDS (holding no worker slot) until they finish or
+    DIARY_TRANSCRIPTION_DEADLINE_SECONDS pass, then generates exactly once.
+    """
+    target_date = date.fromisoformat(diary_date)
+    if deadline is None:
+        deadline = time.time() + CONFIG.DIARY_TRANSCRIPTION_DEADLINE_SECONDS
+        update_job(job_id, status="running", stage="transcripts")
+
+    try:
+        unfinished = run_async(_unfinished(user_id, target_date))
+    except Exception as e:
+        logger.exception(f"Diary job {job_id} could not check transcriptions: {e}")
+        unfinished = 0
+
+    if unfinished and time.time() < deadline:
+        update_job(job_id, stage="waiting", pending_transcriptions=unfinished)
+        # Explicit args: retry otherwise reuses the original request's args
+        # alongside these kwargs
+        raise self.retry(
+            args=[job_id, user_id, diary_date],
+            kwargs={"deadline": deadline},
+            countdown=CONFIG.DIARY_BARRIER_POLL_SECONDS,
+        )
+    if unfinished:
+        logger.warning(f"Diary job {job_id} writing with {unfinished} transcriptions unfinished at the deadline")
+
+    try:
+        diary = run_async(_generate(job_id, user_id, target_date))
+    except Exception as e:
+        logger.exception(f"Diary job {job_id} failed: {e}")
+        update_job(job_id, status="failed", stage=None, error=str(e))
+        return
+    update_job(
+        job_id,
+        status="completed",
+        stage=None,
+        pending_transcriptions=unfinished,
+        diary=diary.model_dump(mode="json"),
+    )
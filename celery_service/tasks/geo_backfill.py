@@ -0,0 +1,61 @@
+import logging
+import argparse
+
+from celery_service.celery_app import celery_app
+
+from api.connections.database_connection import get_sync_db_session
+from api.models.recordings import Recording
+from api.services.geocoding import parse_location_text
+
+logger = logging.getLogger(__name__)
+
+
+def backfill_recording_coordinates(db, batch_size: int = 1000) -> int:
+    """
+    Fill latitude/longitude from location_text, walking the table by id in
+    batches. Rows whose text is not a coordinate pair are left NULL. The
+    columns themselves are added by the API's startup schema upgrades.
+    Uses the synchronous session.
+    """
+    updated, last_id = 0, 0
+    while True:
+        rows = (
+            db.query(Recording)
+            .filter(
+                Recording.id > last_id,
+                Recording.latitude.is_(None),
+                Recording.location_text.isnot(None),
+            )
+            .order_by(Recording.id.asc())
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        for recording in rows:
+            coordinates = parse_location_text(recording.location_text)
+            if coordinates:
+                recording.latitude, recording.longitude = coordinates
+                updated += 1
+        last_id = rows[-1].id
+        db.commit()
+
+    logger.info(f"Backfilled coordinates for {updated} recordings")
+    return updated
+
+
+@celery_app.task(name="backfill_recording_coordinates_task")
+def backfill_recording_coordinates_task(batch_size: int = 1000):
+    db_gen = get_sync_db_session()
+    db = next(db_gen)
+    try:
+        return backfill_recording_coordinates(db, batch_size)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill recordings.latitude/longitude from location_text")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    print(f"Backfilled {backfill_recording_coordinates_task(args.batch_size)} recordings")
@@ -0,0 +1,224 @@
+import logging
+import argparse
+from typing import Dict, List, Optional, Set, Tuple
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, or_, and_
+
+from celery_service.celery_app import celery_app
+from celery_service.tasks.transcription import enqueue_transcription, publish_transcription_event, dead_letter
+
+from api.connections.database_connection import get_sync_db_session
+from api.models.recordings import Recording
+from api.models.transcriptions import Transcription
+from api.schemas.transcriptions import TranscriptionStatus
+from api.services.transcription_inflight import clear_inflight
+from api.services.dead_letter import remove_dead_letters
+from api.services.upload_sessions import sweep_expired_upload_sessions
+from api.utils.upload_writer import sweep_staging_files
+from api.services import fair_scheduler
+
+from api.config.config import settings as CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+def _stuck_filter(now: datetime):
+    """
+    Rows whose worker stopped heartbeating (claimed_at older than the
+    visibility timeout), and rows that have sat pending past their deadline.
+    """
+    processing_deadline = now - timedelta(seconds=CONFIG.TRANSCRIPTION_VISIBILITY_TIMEOUT_SECONDS)
+    pending_deadline = now - timedelta(seconds=CONFIG.TRANSCRIPTION_PENDING_DEADLINE_SECONDS)
+    return and_(
+        Transcription.is_deleted == False,
+        or_(
+            and_(
+                Transcription.status == TranscriptionStatus.processing.value,
+                func.coalesce(Transcription.claimed_at, Transcription.created_at) < processing_deadline,
+            ),
+            and_(
+                Transcription.status == TranscriptionStatus.pending.value,
+                func.coalesce(Transcription.claimed_at, Transcription.created_at) < pending_deadline,
+            ),
+        ),
+    )
+
+
+def _owners(db, transcriptions: List[Transcription]) -> Dict[int, Tuple[int, Optional[float]]]:
+    """
+    (user_id, audio seconds) of each transcription's recording, so re-queued
+    work goes back through the user's fair-share sub-queue at its real cost.
+    """
+    recording_ids = {t.recording_id for t in transcriptions}
+    if not recording_ids:
+        return {}
+    rows = (
+        db.query(Recording.id, Recording.user_id, Recording.duration_seconds)
+        .filter(Recording.id.in_(recording_ids))
+        .all()
+    )
+    by_recording = {row.id: (row.user_id, row.duration_seconds) for row in rows}
+    return {t.id: by_recording.get(t.recording_id, (None, None)) for t in transcriptions}
+
+
+def _still_queued(rows: List[Transcription], owners: Dict[int, Tuple[int, Optional[float]]]) -> Set[int]:
+    """
+    Pending rows still waiting in their owner's fair-share sub-queue: slow
+    to be served, not lost.
+    """
+    if not CONFIG.FAIR_SCHEDULING_ENABLED:
+        return set()
+    waiting, seen = set(), {}
+    for transcription in rows:
+        user_id = owners.get(transcription.id, (None, None))[0]
+        if user_id is None or transcription.status != TranscriptionStatus.pending:
+            continue
+        if user_id not in seen:
+            try:
+                seen[user_id] = set().union(*(fair_scheduler.queued_ids(user_id, q) for q in CONFIG.FAIR_QUEUES))
+            except Exception as e:
+                logger.warning(f"Could not read fair-share sub-queues of user {user_id}: {e}")
+                seen[user_id] = set()
+        if transcription.id in seen[user_id]:
+            waiting.add(transcription.id)
+    return waiting
+
+
+def _requeue(requeue: List[Tuple[int, str]], owners: Dict[int, Tuple[int, Optional[float]]]) -> int:
+    enqueued = 0
+    for transcription_id, queue in requeue:
+        user_id, cost = owners.get(transcription_id, (None, None))
+        if enqueue_transcription(transcription_id, queue, user_id=user_id, cost=cost):
+            enqueued += 1
+    return enqueued
+
+
+def reap_stuck_transcriptions(db) -> dict:
+    """
+    Re-enqueue stuck transcriptions, or dead-letter them once they have been
+    claimed TRANSCRIPTION_MAX_ATTEMPTS times. Uses the synchronous session.
+    """
+    now = datetime.now(timezone.utc)
+    rows = (
+        db.query(Transcription)
+        .filter(_stuck_filter(now))
+        .order_by(Transcription.created_at.asc())
+        .limit(CONFIG.REAPER_BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    owners = _owners(db, rows)
+    waiting = _still_queued(rows, owners)
+    rows = [t for t in rows if t.id not in waiting]
+
+    requeue, dead = [], []
+    for transcription in rows:
+        if (transcription.attempts or 0) >= CONFIG.TRANSCRIPTION_MAX_ATTEMPTS:
+            transcription.error_message = transcription.error_message or (
+                f"Stuck in {transcription.status.value} after {transcription.attempts} attempts"
+            )
+            dead_letter(transcription, None, "stuck")
+            dead.append(transcription)
+        else:
+            if transcription.status == TranscriptionStatus.processing:
+                # The claiming worker is gone; make the row claimable again
+                transcription.status = TranscriptionStatus.pending.value
+                clear_inflight(transcription.id)
+            requeue.append((transcription.id, transcription.queue or "default"))
+    db.commit()
+
+    # A row already with Celery keeps its in-flight mark, so
+    # enqueue_transcription does not queue it twice
+    enqueued = _requeue(requeue, owners)
+    for transcription in dead:
+        logger.error(
+            f"Transcription {transcription.id} dead-lettered after {transcription.attempts} attempts"
+        )
+        clear_inflight(transcription.id)
+        publish_transcription_event(transcription)
+
+    summary = {"stuck": len(rows), "requeued": enqueued, "dead_lettered": len(dead)}
+    if rows:
+        logger.warning(f"Reaper: {summary}")
+    return summary
+
+
+@celery_app.task(name="reap_stuck_transcriptions_task")
+def reap_stuck_transcriptions_task():
+    db_gen = get_sync_db_session()
+    db = next(db_gen)
+    try:
+        return reap_stuck_transcriptions(db)
+    finally:
+        db.close()
+
+
+@celery_app.task(name="sweep_uploads_task")
+def sweep_uploads_task():
+    """
+    Remove expired resumable-upload sessions and stale staging files.
+    """
+    return {
+        "sessions": sweep_expired_upload_sessions(),
+        "staging_files": sweep_staging_files(),
+    }
+
+
+def redrive_dead_letters(
+    db,
+    transcription_ids: Optional[List[int]] = None,
+    include_failed: bool = False,
+) -> int:
+    """
+    Reset dead-lettered (and optionally failed) rows to pending with a fresh
+    attempt budget and enqueue them on their original queue. Without ids,
+    every such row is re-driven. Uses the synchronous session.
+    """
+    statuses = [TranscriptionStatus.dead_letter.value]
+    if include_failed:
+        statuses.append(TranscriptionStatus.failed.value)
+
+    query = db.query(Transcription).filter(
+        Transcription.status.in_(statuses),
+        Transcription.is_deleted == False,
+    )
+    if transcription_ids:
+        query = query.filter(Transcription.id.in_(transcription_ids))
+    rows = query.with_for_update(skip_locked=True).all()
+
+    requeue = []
+    for transcription in rows:
+        transcription.status = TranscriptionStatus.pending.value
+        transcription.attempts = 0
+        transcription.claimed_at = None
+        transcription.error_message = None
+        requeue.append((transcription.id, transcription.queue or "default"))
+    owners = _owners(db, rows)
+    db.commit()
+
+    for transcription_id, _ in requeue:
+        clear_inflight(transcription_id)
+    _requeue(requeue, owners)
+    remove_dead_letters([transcription_id for transcription_id, _ in requeue])
+
+    logger.info(f"Re-drove {len(requeue)} transcriptions")
+    return len(requeue)
+
+
+@celery_app.task(name="redrive_dead_letters_task")
+def redrive_dead_letters_task(transcription_ids: Optional[List[int]] = None, include_failed: bool = False):
+    db_gen = get_sync_db_session()
+    db = next(db_gen)
+    try:
+        return redrive_dead_letters(db, transcription_ids, include_failed)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-drive dead-lettered transcriptions")
+    parser.add_argument("ids", nargs="*", type=int, help="Transcription ids (default: all dead-lettered)")
+    parser.add_argument("--include-failed", action="store_true", help="Also re-drive permanently failed rows")
+    args = parser.parse_args()
+    print(f"Re-drove {redrive_dead_letters_task(args.ids or None, args.include_failed)} transcriptions")
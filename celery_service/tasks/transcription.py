@@ -1,7 +1,13 @@
-import asyncio
+import random
 import logging
 import json
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from sqlalchemy import func, or_
+from celery.exceptions import Retry
 from celery_service.celery_app import celery_app
+from celery_service.async_runtime import run_async
 
 from api.connections.database_connection import get_sync_db_session
 from api.config.redis_client import get_redis_client
@@ -9,18 +15,247 @@ from api.models.recordings import Recording
 from api.models.transcriptions import Transcription
 from api.schemas.transcriptions import TranscriptionStatus
 from api.services.transcribe_audio_async import transcribe_audio_file
+from api.services.audio_transcode import ensure_transcoded
+from api.services.rate_limiter import RateLimitDeferred
+from api.services.transcription_backends import TranscriptionBackend, backend_for_queue
+from api.services.transcription_inflight import mark_inflight, refresh_inflight, clear_inflight
+from api.services.transcription_errors import TRANSIENT, classify_error, describe_error
+from api.services.dead_letter import push_dead_letter
+from api.services import fair_scheduler
+from api.services.transcription_cache import (
+    find_transcription_for_audio,
+    set_cached_transcription,
+)
 
 from api.config.config import settings as CONFIG
 
 logger = logging.getLogger(__name__)
 
-@celery_app.task(name="transcribe_audio_task")
-def transcribe_audio_task(transcription_id: int):
-    logger.info(f"Starting transcription task for ID: {transcription_id}")
-    
+
+def first_pass_model() -> str:
+    return CONFIG.TRANSCRIPTION_MODEL_TURBO if CONFIG.TRANSCRIPTION_TIERED else CONFIG.TRANSCRIPTION_MODEL
+
+
+def enqueue_transcription(
+    transcription_id: int,
+    queue: str = "default",
+    model: str = None,
+    user_id: int = None,
+    cost: float = None,
+) -> bool:
+    """
+    Queue a transcription unless a task for it is already queued or running.
+    With fair scheduling, work for a known user goes to their sub-queue on
+    the fair queues and is released by the dispatcher; everything else is
+    sent to Celery directly. Returns whether the transcription was queued.
+    """
+    if not mark_inflight(transcription_id):
+        logger.info(f"Transcription {transcription_id} is already in flight, not enqueueing")
+        return False
+    if (
+        CONFIG.FAIR_SCHEDULING_ENABLED
+        and user_id is not None
+        and queue in CONFIG.FAIR_QUEUES
+        and fair_scheduler.submit(transcription_id, user_id, queue, model, cost)
+    ):
+        return True
+    kwargs = {"model": model} if model else {}
+    try:
+        transcribe_audio_task.apply_async(args=[transcription_id], kwargs=kwargs, queue=queue)
+    except Exception:
+        clear_inflight(transcription_id)
+        raise
+    return True
+
+
+def promote_transcription(transcription_id: int, user_id: int, queue: str = "high_priority") -> bool:
+    """
+    Send a transcription on queue now. A task still waiting in the user's
+    fair-share sub-queue is taken out of it and sent directly, keeping its
+    in-flight registration; otherwise this is a plain enqueue, which does
+    nothing if a task is already with Celery or running.
+    """
+    if CONFIG.FAIR_SCHEDULING_ENABLED:
+        for fair_queue in CONFIG.FAIR_QUEUES:
+            if fair_queue == CONFIG.TRANSCRIPTION_LOCAL_QUEUE:
+                continue
+            try:
+                withdrawn = fair_scheduler.withdraw(transcription_id, user_id, fair_queue)
+            except Exception as e:
+                logger.warning(f"Could not withdraw {transcription_id} from {fair_queue}: {e}")
+                continue
+            if withdrawn:
+                refresh_inflight(transcription_id, CONFIG.TRANSCRIPTION_INFLIGHT_TTL_SECONDS)
+                transcribe_audio_task.apply_async(args=[transcription_id], queue=queue)
+                return True
+    return enqueue_transcription(transcription_id, queue)
+
+
+def _claim(db, transcription_id: int, queue: str) -> bool:
+    """
+    Atomically move a pending row to processing, counting the attempt and
+    stamping the claim for the reaper.
+    Only the worker whose UPDATE matched may transcribe it. On-device rows
+    are never claimed from any other queue.
+    """
+    filters = [
+        Transcription.id == transcription_id,
+        Transcription.status == TranscriptionStatus.pending.value,
+    ]
+    if queue != CONFIG.TRANSCRIPTION_LOCAL_QUEUE:
+        filters.append(or_(
+            Transcription.queue.is_(None),
+            Transcription.queue != CONFIG.TRANSCRIPTION_LOCAL_QUEUE,
+        ))
+    claimed = (
+        db.query(Transcription)
+        .filter(*filters)
+        .update(
+            {
+                Transcription.status: TranscriptionStatus.processing.value,
+                Transcription.attempts: Transcription.attempts + 1,
+                Transcription.claimed_at: func.now(),
+                Transcription.first_claimed_at: func.coalesce(Transcription.first_claimed_at, func.now()),
+                Transcription.queue: queue,
+            },
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return claimed == 1
+
+
+@contextmanager
+def _heartbeat(transcription_id: int):
+    """
+    Refresh the row's claimed_at every TRANSCRIPTION_HEARTBEAT_SECONDS while
+    the block runs, so the reaper only takes rows whose worker has stopped
+    beating, however long the transcription itself takes. Beats use their
+    own session from a background thread.
+    """
+    stopped = threading.Event()
+
+    def beat():
+        while not stopped.wait(CONFIG.TRANSCRIPTION_HEARTBEAT_SECONDS):
+            db_gen = get_sync_db_session()
+            db = next(db_gen)
+            try:
+                db.query(Transcription).filter(
+                    Transcription.id == transcription_id,
+                    Transcription.status == TranscriptionStatus.processing.value,
+                ).update({Transcription.claimed_at: func.now()}, synchronize_session=False)
+                db.commit()
+            except Exception as e:
+                logger.warning(f"Heartbeat for transcription {transcription_id} failed: {e}")
+            finally:
+                db.close()
+
+    thread = threading.Thread(target=beat, name=f"heartbeat-{transcription_id}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def retry_countdown(attempts: int) -> float:
+    """
+    Full-jitter exponential backoff between transient failures.
+    """
+    ceiling = min(
+        CONFIG.TRANSCRIPTION_RETRY_MAX_SECONDS,
+        CONFIG.TRANSCRIPTION_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0),
+    )
+    return random.uniform(0, ceiling)
+
+
+def dead_letter(transcription: Transcription, model: str, reason: str) -> None:
+    """
+    Park a row for manual re-drive and keep its payload and last error.
+    """
+    transcription.status = TranscriptionStatus.dead_letter.value
+    push_dead_letter(
+        transcription.id,
+        transcription.queue,
+        model,
+        transcription.error_message,
+        transcription.attempts or 0,
+        reason,
+    )
+
+
+def _transcribe(db, recording: Recording, model: str, backend: TranscriptionBackend):
+    """
+    Cached/deduplicated result for this audio, engine and model, or a fresh
+    transcription by the backend.
+    """
+    label = backend.model_label(model)
+    transcription_data = find_transcription_for_audio(db, recording, label)
+    if transcription_data:
+        logger.info(f"Reusing cached {label} transcription of identical audio {recording.content_hash}")
+        transcription_data["transcribe_time"] = datetime.now(timezone.utc)
+        return transcription_data
+
+    transcription_data = run_async(
+        transcribe_audio_file(recording.file_path, recording.duration_seconds, model, backend)
+    )
+    set_cached_transcription(recording.content_hash, label, transcription_data)
+    return transcription_data
+
+
+def needs_refinement(transcription: Transcription, model: str) -> bool:
+    return (
+        CONFIG.TRANSCRIPTION_TIERED
+        and model == CONFIG.TRANSCRIPTION_MODEL_TURBO
+        and bool(transcription.text)
+        and transcription.confidence is not None
+        and transcription.confidence < CONFIG.TRANSCRIPTION_CONFIDENCE_THRESHOLD
+    )
+
+
+def publish_transcription_event(transcription: Transcription, refining: bool = False):
+    try:
+        redis_client = get_redis_client()
+        status_value = (
+            transcription.status.value
+            if hasattr(transcription.status, "value")
+            else transcription.status
+        )
+        redis_client.publish(
+            "transcription_completed",
+            json.dumps(
+                {
+                    "transcription_id": transcription.id,
+                    "recording_id": transcription.recording_id,
+                    "status": status_value,
+                    "model_name": transcription.model_name,
+                    "refining": refining,
+                }
+            ),
+        )
+    except Exception as e:
+        logger.exception(f"Error during Publishing transcription information: {e}")
+
+
+@celery_app.task(name="transcribe_audio_task", bind=True, max_retries=None)
+def transcribe_audio_task(self, transcription_id: int, model: str = None):
+    """
+    Transcribe a recording. With TRANSCRIPTION_TIERED the first pass uses the
+    turbo model and is published at once; a large-model pass is queued only
+    when its confidence is below TRANSCRIPTION_CONFIDENCE_THRESHOLD.
+    The engine is the one configured for the queue the task arrived on.
+    """
+    model = model or first_pass_model()
+    refinement_pass = model != first_pass_model()
+    queue = (self.request.delivery_info or {}).get("routing_key") or "default"
+    backend = backend_for_queue(queue)
+    logger.info(f"Starting transcription task for ID: {transcription_id} with {backend.name}/{model}")
+
     db_gen = get_sync_db_session()
     db = next(db_gen)
-    
+    keep_inflight = False
+
     try:
         # Fetch Transcription and associated Recording
         transcription = db.query(Transcription).filter(Transcription.id == transcription_id).first()
@@ -34,55 +269,113 @@ def transcribe_audio_task(transcription_id: int):
             transcription.status = TranscriptionStatus.failed.value
             db.commit()
             return
-            
-        # Update status to processing
-        transcription.status = TranscriptionStatus.processing.value
-        db.commit()
 
-        # Perform Transcription
-        logger.info(f"Transcribing file: {recording.file_path}")
-        try:
-            transcription_data = asyncio.run(transcribe_audio_file(recording.file_path))
-
-            
-            # Update Transcription record
-            transcription.text = transcription_data["text"]
-            transcription.language = transcription_data["language"]
-            transcription.confidence = transcription_data["confidence"]
-            transcription.status = TranscriptionStatus.completed.value
-            transcription.transcribed_at = transcription_data["transcribe_time"]
-            transcription.words = transcription_data["words"]
-            
-            db.commit()
-            logger.info(f"Transcription {transcription_id} completed successfully.")
+        if refinement_pass:
+            # The first-pass text stays visible (and completed) until this one lands
+            try:
+                transcription_data = _transcribe(db, recording, model, backend)
+            except RateLimitDeferred as e:
+                logger.warning(f"Refinement of transcription {transcription_id} deferred: {e}")
+                keep_inflight = True
+                refresh_inflight(transcription_id, int(e.retry_after) + 60)
+                raise self.retry(countdown=e.retry_after)
+            except Exception as e:
+                logger.exception(f"Refinement of transcription {transcription_id} failed, keeping first pass: {e}")
+                return
+        else:
+            # Claim the row; a concurrent or duplicate task finds it taken
+            if not _claim(db, transcription_id, queue):
+                # The registry entry, if any, belongs to the task holding the row
+                logger.info(f"Transcription {transcription_id} already claimed or finished, skipping")
+                keep_inflight = True
+                return
+            db.refresh(transcription)
 
-        except Exception as e:
-            logger.exception(f"Error during transcription API call: {e}")
-            transcription.status = TranscriptionStatus.failed.value
-            db.commit()
-            raise e
-        try:
-            redis_client = get_redis_client()
-            status_value = (
-                transcription.status.value
-                if hasattr(transcription.status, "value")
-                else transcription.status
+            try:
+                with _heartbeat(transcription_id):
+                    # Normalize the stored audio to compact mono 16 kHz before sending it anywhere
+                    try:
+                        ensure_transcoded(db, recording)
+                    except Exception as e:
+                        logger.exception(f"Transcoding failed, transcribing the original upload: {e}")
+
+                    # Perform Transcription (identical audio reuses an earlier result)
+                    logger.info(f"Transcribing file: {recording.file_path}")
+                    transcription_data = _transcribe(db, recording, model, backend)
+            except RateLimitDeferred as e:
+                # Provider budget exhausted: park the row and come back later.
+                # Waiting for quota is not a failed attempt.
+                logger.warning(f"Transcription {transcription_id} deferred: {e}")
+                transcription.status = TranscriptionStatus.pending.value
+                transcription.attempts = max((transcription.attempts or 1) - 1, 0)
+                db.commit()
+                keep_inflight = True
+                refresh_inflight(transcription_id, int(e.retry_after) + 60)
+                raise self.retry(countdown=e.retry_after)
+            except Exception as e:
+                kind = classify_error(e)
+                transcription.error_message = describe_error(e)
+                attempts = transcription.attempts or 0
+                if kind == TRANSIENT and attempts < CONFIG.TRANSCRIPTION_MAX_ATTEMPTS:
+                    countdown = retry_countdown(attempts)
+                    logger.warning(
+                        f"Transcription {transcription_id} failed transiently "
+                        f"(attempt {attempts}), retrying in {countdown:.0f}s: {e}"
+                    )
+                    transcription.status = TranscriptionStatus.pending.value
+                    db.commit()
+                    keep_inflight = True
+                    refresh_inflight(transcription_id, int(countdown) + 60)
+                    raise self.retry(countdown=countdown, exc=e)
+
+                if kind == TRANSIENT:
+                    logger.error(f"Transcription {transcription_id} exhausted {attempts} attempts: {e}")
+                    dead_letter(transcription, model, "retries_exhausted")
+                else:
+                    # Bad or unreadable audio: retrying cannot help
+                    logger.error(f"Transcription {transcription_id} failed permanently: {e}")
+                    transcription.status = TranscriptionStatus.failed.value
+                    push_dead_letter(
+                        transcription_id, transcription.queue, model,
+                        transcription.error_message, attempts, "permanent_error",
+                    )
+                db.commit()
+                publish_transcription_event(transcription)
+                return
+
+        # Update Transcription record
+        transcription.text = transcription_data["text"]
+        transcription.language = transcription_data["language"]
+        transcription.confidence = transcription_data["confidence"]
+        transcription.model_name = backend.model_label(model)
+        transcription.status = TranscriptionStatus.completed.value
+        transcription.transcribed_at = transcription_data["transcribe_time"]
+        transcription.words = transcription_data["words"]
+        transcription.error_message = None
+
+        db.commit()
+        logger.info(f"Transcription {transcription_id} completed successfully with {model}.")
+
+        refine = needs_refinement(transcription, model)
+        publish_transcription_event(transcription, refining=refine)
+        if refine:
+            logger.info(
+                f"Transcription {transcription_id} confidence {transcription.confidence:.3f} "
+                f"below threshold, queueing {CONFIG.TRANSCRIPTION_MODEL} pass"
             )
-            redis_client.publish(
-                "transcription_completed",
-                json.dumps(
-                    {
-                        "transcription_id": transcription.id,
-                        "recording_id": transcription.recording_id,
-                        "status": status_value,
-                    }
-                ),
+            # Hand the in-flight slot over to the refinement pass
+            clear_inflight(transcription_id)
+            keep_inflight = enqueue_transcription(
+                transcription_id, queue, CONFIG.TRANSCRIPTION_MODEL,
+                user_id=recording.user_id, cost=recording.duration_seconds,
             )
-        except Exception as e:
-            logger.exception(f"Error during Publishing transcription information: {e}")
-
 
+    except Retry:
+        raise
     except Exception as e:
         logger.exception(f"Unexpected error in task: {e}")
+        raise
     finally:
+        if not keep_inflight:
+            clear_inflight(transcription_id)
         db.close()
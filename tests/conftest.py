@@ -0,0 +1,56 @@
+import os
+
+import pytest
+import redis
+
+# api.config.client builds the Groq client at import time
+os.environ.setdefault("GROQ_API_KEY", "test")
+
+from api.config.config import settings  # noqa: E402
+
+
+@pytest.fixture
+def upload_dirs(tmp_path, monkeypatch):
+    """
+    Point staging and upload-session storage at a temporary directory.
+    """
+    staging = tmp_path / "staging"
+    monkeypatch.setattr(settings, "UPLOAD_STAGING_DIR", str(staging))
+    monkeypatch.setattr(settings, "UPLOAD_SESSION_DIR", str(staging / "sessions"))
+    return staging
+
+
+@pytest.fixture
+def cache_redis():
+    """
+    The Redis at REDIS_CACHE_URL, or skip the test when it is unreachable.
+    """
+    client = redis.StrictRedis.from_url(settings.REDIS_CACHE_URL, socket_connect_timeout=0.5)
+    try:
+        client.ping()
+    except redis.RedisError:
+        pytest.skip("Redis is not reachable at REDIS_CACHE_URL")
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def sync_db():
+    """
+    Synchronous session on in-memory SQLite holding the transcriptions table,
+    shareable with background threads.
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from api.models.transcriptions import Transcription
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Transcription.__table__.create(engine)
+    factory = sessionmaker(bind=engine)
+    db = factory()
+    db.session_factory = factory
+    yield db
+    db.close()
+    engine.dispose()
@@ -0,0 +1,64 @@
+import pytest
+
+from api.services.gazetteer import Gazetteer
+
+PLACES = [
+    ("London", 51.50853, -0.12574),
+    ("Zürich", 47.36667, 8.55),
+    ("東京", 35.6895, 139.69171),
+]
+
+
+def write_dump(path, places):
+    lines = [f"{i}\t{name}\t{name}\t\t{lat}\t{lon}\tP\tPPL\n" for i, (name, lat, lon) in enumerate(places)]
+    path.write_text("".join(lines) + "malformed\tline\n", encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def gazetteer(tmp_path):
+    return Gazetteer(write_dump(tmp_path / "cities.txt", PLACES))
+
+
+def test_builds_mapped_files(tmp_path, gazetteer):
+    assert len(gazetteer) == 3
+    for suffix in (".points.npy", ".name_offsets.npy", ".names.bin"):
+        assert (tmp_path / f"cities{suffix}").exists()
+    assert not (tmp_path / "cities.build.lock").exists()
+
+
+def test_nearest_returns_name_and_distance(gazetteer):
+    name, km = gazetteer.nearest(51.5074, -0.1278)
+
+    assert name == "London"
+    assert km < 1
+
+
+def test_non_ascii_names_round_trip(gazetteer):
+    assert gazetteer.nearest(47.37, 8.54)[0] == "Zürich"
+    assert gazetteer.nearest(35.68, 139.76)[0] == "東京"
+
+
+def test_distance_is_great_circle(gazetteer):
+    _, km = gazetteer.nearest(51.50853, 1.0)
+
+    # 1.126 degrees of longitude at about 69 km per degree
+    assert km == pytest.approx(78.1, rel=0.02)
+
+
+def test_reuses_a_fresh_build(tmp_path, gazetteer):
+    points = tmp_path / "cities.points.npy"
+    built = points.stat().st_mtime_ns
+
+    assert len(Gazetteer(tmp_path / "cities.txt")) == 3
+    assert points.stat().st_mtime_ns == built
+
+
+def test_empty_dump(tmp_path):
+    empty = tmp_path / "empty.txt"
+    empty.write_text("", encoding="utf-8")
+
+    gazetteer = Gazetteer(empty)
+
+    assert len(gazetteer) == 0
+    assert gazetteer.nearest(0, 0) is None
@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+import pytest
+
+from api.config.config import settings
+from api.services import rate_limiter
+from api.services.rate_limiter import (
+    BATCH_POOL,
+    LIVE_POOL,
+    RateLimitDeferred,
+    acquire,
+    rate_limit_policy,
+    take_token,
+)
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(settings, "RATE_LIMIT_HEADROOM", 1.0)
+    monkeypatch.setattr(settings, "LIVE_RATE_LIMIT_SHARE", 0.5)
+    monkeypatch.setattr(settings, "GROQ_REQUESTS_PER_MINUTE", 4)
+    monkeypatch.setattr(settings, "GROQ_AUDIO_SECONDS_PER_HOUR", 3600)
+    monkeypatch.setattr(settings, "GROQ_MIN_BILLED_SECONDS", 10)
+
+
+@pytest.fixture
+def buckets(cache_redis, limits):
+    keys = [key for pool in (BATCH_POOL, LIVE_POOL) for key in rate_limiter._pool_limits(pool)[:2]]
+    keys += [rate_limiter._BLOCKED_KEY, "ratelimit:test"]
+    cache_redis.delete(*keys)
+    yield cache_redis
+    cache_redis.delete(*keys)
+
+
+def _acquire(pool=BATCH_POOL, audio_seconds=1.0, max_wait=0):
+    async def run():
+        with rate_limit_policy(pool, max_wait):
+            await acquire(audio_seconds)
+    asyncio.run(run())
+
+
+def test_pools_split_the_provider_limits(limits):
+    _, _, batch_rpm, batch_audio = rate_limiter._pool_limits(BATCH_POOL)
+    _, _, live_rpm, live_audio = rate_limiter._pool_limits(LIVE_POOL)
+
+    assert (batch_rpm, live_rpm) == (2, 2)
+    assert batch_audio + live_audio == 3600
+
+
+def test_backoff_is_full_jitter(monkeypatch):
+    monkeypatch.setattr(rate_limiter.random, "uniform", lambda low, high: (low, high))
+
+    assert rate_limiter._backoff(0) == (0, settings.RATE_LIMIT_BACKOFF_BASE_SECONDS)
+    assert rate_limiter._backoff(50) == (0, settings.RATE_LIMIT_BACKOFF_MAX_SECONDS)
+
+
+def test_bucket_admits_capacity_then_defers(buckets):
+    _acquire()
+    _acquire()
+
+    with pytest.raises(RateLimitDeferred) as deferred:
+        _acquire()
+    # Two requests per minute refill one token every 30 seconds
+    assert 0 < deferred.value.retry_after <= 30
+
+
+def test_audio_is_billed_at_the_minimum(buckets, monkeypatch):
+    monkeypatch.setattr(settings, "GROQ_REQUESTS_PER_MINUTE", 1000)
+    monkeypatch.setattr(settings, "GROQ_AUDIO_SECONDS_PER_HOUR", 40)
+    # 20 audio seconds per pool: two 1-second clips cost the 10-second minimum each
+    _acquire(audio_seconds=1)
+    _acquire(audio_seconds=1)
+
+    with pytest.raises(RateLimitDeferred):
+        _acquire(audio_seconds=1)
+
+
+def test_live_pool_is_not_drained_by_batch(buckets):
+    _acquire(BATCH_POOL)
+    _acquire(BATCH_POOL)
+    with pytest.raises(RateLimitDeferred):
+        _acquire(BATCH_POOL)
+
+    _acquire(LIVE_POOL)
+
+
+def test_retry_after_blocks_every_pool(buckets):
+    asyncio.run(rate_limiter.block_until(5))
+
+    for pool in (BATCH_POOL, LIVE_POOL):
+        with pytest.raises(RateLimitDeferred):
+            _acquire(pool)
+
+
+def test_take_token_spaces_calls_by_the_refill_rate(buckets):
+    async def run():
+        started = time.monotonic()
+        await take_token("ratelimit:test", 1, 4)
+        await take_token("ratelimit:test", 1, 4)
+        return time.monotonic() - started
+
+    assert asyncio.run(run()) >= 0.2
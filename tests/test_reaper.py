@@ -0,0 +1,120 @@
+import time
+import itertools
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from api.config.config import settings
+from api.models.transcriptions import Transcription
+from api.schemas.transcriptions import TranscriptionStatus
+from celery_service.tasks import maintenance, transcription as transcription_tasks
+
+USER_ID = 3
+
+_recording_ids = itertools.count(1)
+
+
+@pytest.fixture
+def reaper(monkeypatch):
+    """
+    Reaper with Redis and Celery side effects recorded instead of sent.
+    """
+    enqueued = []
+
+    def enqueue(transcription_id, queue="default", model=None, user_id=None, cost=None):
+        enqueued.append((transcription_id, queue, user_id, cost))
+        return True
+
+    monkeypatch.setattr(maintenance, "enqueue_transcription", enqueue)
+    monkeypatch.setattr(maintenance, "clear_inflight", lambda transcription_id: None)
+    monkeypatch.setattr(maintenance, "publish_transcription_event", lambda transcription: None)
+    monkeypatch.setattr(transcription_tasks, "push_dead_letter", lambda *args: None)
+    monkeypatch.setattr(
+        maintenance, "_owners", lambda db, rows: {row.id: (USER_ID, 42.0) for row in rows}
+    )
+    monkeypatch.setattr(settings, "FAIR_SCHEDULING_ENABLED", False)
+    return enqueued
+
+
+def _ago(seconds: float) -> datetime:
+    return datetime.now(timezone.utc) - timedelta(seconds=seconds)
+
+
+def _row(db, status, claimed_seconds_ago=None, attempts=1, queue="default") -> Transcription:
+    transcription = Transcription(
+        recording_id=next(_recording_ids),
+        status=status.value,
+        attempts=attempts,
+        queue=queue,
+        created_at=_ago(24 * 60 * 60),
+        claimed_at=_ago(claimed_seconds_ago) if claimed_seconds_ago is not None else None,
+    )
+    db.add(transcription)
+    db.commit()
+    return transcription
+
+
+def test_missed_heartbeat_is_requeued_with_owner_and_cost(sync_db, reaper):
+    stale = _row(sync_db, TranscriptionStatus.processing, settings.TRANSCRIPTION_VISIBILITY_TIMEOUT_SECONDS + 60)
+
+    summary = maintenance.reap_stuck_transcriptions(sync_db)
+
+    sync_db.refresh(stale)
+    assert stale.status == TranscriptionStatus.pending
+    assert reaper == [(stale.id, "default", USER_ID, 42.0)]
+    assert summary == {"stuck": 1, "requeued": 1, "dead_lettered": 0}
+
+
+def test_long_running_task_with_fresh_heartbeat_is_left_alone(sync_db, reaper):
+    # Created a day ago, but the worker beat a few seconds ago
+    running = _row(sync_db, TranscriptionStatus.processing, 5)
+
+    maintenance.reap_stuck_transcriptions(sync_db)
+
+    sync_db.refresh(running)
+    assert running.status == TranscriptionStatus.processing
+    assert reaper == []
+
+
+def test_exhausted_attempts_are_dead_lettered(sync_db, reaper):
+    stuck = _row(
+        sync_db,
+        TranscriptionStatus.processing,
+        settings.TRANSCRIPTION_VISIBILITY_TIMEOUT_SECONDS + 60,
+        attempts=settings.TRANSCRIPTION_MAX_ATTEMPTS,
+    )
+
+    summary = maintenance.reap_stuck_transcriptions(sync_db)
+
+    sync_db.refresh(stuck)
+    assert stuck.status == TranscriptionStatus.dead_letter
+    assert stuck.error_message
+    assert reaper == []
+    assert summary["dead_lettered"] == 1
+
+
+def test_pending_row_still_in_its_sub_queue_is_not_requeued(sync_db, reaper, monkeypatch):
+    waiting = _row(sync_db, TranscriptionStatus.pending, settings.TRANSCRIPTION_PENDING_DEADLINE_SECONDS + 60)
+    lost = _row(sync_db, TranscriptionStatus.pending, settings.TRANSCRIPTION_PENDING_DEADLINE_SECONDS + 60)
+    monkeypatch.setattr(settings, "FAIR_SCHEDULING_ENABLED", True)
+    monkeypatch.setattr(maintenance.fair_scheduler, "queued_ids", lambda user_id, queue: {waiting.id})
+
+    maintenance.reap_stuck_transcriptions(sync_db)
+
+    assert [transcription_id for transcription_id, *_ in reaper] == [lost.id]
+
+
+def test_heartbeat_refreshes_claimed_at_while_running(sync_db, monkeypatch):
+    running = _row(sync_db, TranscriptionStatus.processing, 3600)
+    before = running.claimed_at
+
+    def session():
+        yield sync_db.session_factory()
+
+    monkeypatch.setattr(transcription_tasks, "get_sync_db_session", session)
+    monkeypatch.setattr(settings, "TRANSCRIPTION_HEARTBEAT_SECONDS", 0.05)
+    with transcription_tasks._heartbeat(running.id):
+        time.sleep(0.2)
+
+    sync_db.expire_all()
+    assert running.claimed_at.replace(tzinfo=None) > before.replace(tzinfo=None)
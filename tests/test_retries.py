@@ -0,0 +1,49 @@
+import subprocess
+
+import httpx
+import pytest
+
+from api.config.config import settings
+from api.services.transcription_errors import PERMANENT, TRANSIENT, classify_error, describe_error
+from celery_service.tasks import transcription as transcription_tasks
+from celery_service.tasks.transcription import retry_countdown
+
+
+@pytest.fixture
+def bounds(monkeypatch):
+    monkeypatch.setattr(transcription_tasks.random, "uniform", lambda low, high: (low, high))
+
+
+@pytest.mark.parametrize("attempts, ceiling", [(0, 30), (1, 30), (2, 60), (4, 240)])
+def test_retry_countdown_is_full_jitter_up_to_the_doubling_ceiling(bounds, attempts, ceiling):
+    assert settings.TRANSCRIPTION_RETRY_BASE_SECONDS == 30
+    assert retry_countdown(attempts) == (0, ceiling)
+
+
+def test_retry_countdown_is_capped(bounds):
+    assert retry_countdown(50) == (0, settings.TRANSCRIPTION_RETRY_MAX_SECONDS)
+
+
+def test_retry_countdown_stays_in_range():
+    for attempts in range(1, 12):
+        assert 0 <= retry_countdown(attempts) <= settings.TRANSCRIPTION_RETRY_MAX_SECONDS
+
+
+@pytest.mark.parametrize(
+    "error, kind",
+    [
+        (httpx.ConnectError("refused"), TRANSIENT),
+        (TimeoutError(), TRANSIENT),
+        (subprocess.CalledProcessError(1, ["ffmpeg"]), PERMANENT),
+        (FileNotFoundError("gone.wav"), PERMANENT),
+        (RuntimeError("unknown"), TRANSIENT),
+    ],
+)
+def test_classify_error(error, kind):
+    assert classify_error(error) == kind
+
+
+def test_describe_error_prefers_ffmpeg_stderr():
+    error = subprocess.CalledProcessError(1, ["ffmpeg"], stderr=b"Invalid data found\n")
+
+    assert describe_error(error) == "CalledProcessError: Invalid data found"
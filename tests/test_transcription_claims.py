@@ -0,0 +1,58 @@
+import pytest
+
+from api.config.config import settings
+from api.models.transcriptions import Transcription
+from api.schemas.transcriptions import TranscriptionStatus
+from celery_service.tasks.transcription import _claim
+
+
+def _row(db, queue=None, status=TranscriptionStatus.pending) -> Transcription:
+    transcription = Transcription(recording_id=1, status=status.value, queue=queue)
+    db.add(transcription)
+    db.commit()
+    return transcription
+
+
+def test_claim_moves_pending_to_processing_once(sync_db):
+    transcription = _row(sync_db)
+
+    assert _claim(sync_db, transcription.id, "default")
+    assert not _claim(sync_db, transcription.id, "default")
+
+    sync_db.refresh(transcription)
+    assert transcription.status == TranscriptionStatus.processing
+    assert transcription.attempts == 1
+    assert transcription.queue == "default"
+    assert transcription.claimed_at is not None
+    assert transcription.first_claimed_at == transcription.claimed_at
+
+
+def test_reclaim_counts_attempts_and_keeps_first_claim(sync_db):
+    transcription = _row(sync_db)
+    _claim(sync_db, transcription.id, "default")
+    sync_db.refresh(transcription)
+    first_claimed_at = transcription.first_claimed_at
+
+    transcription.status = TranscriptionStatus.pending.value
+    transcription.first_claimed_at = first_claimed_at.replace(year=2000)
+    sync_db.commit()
+    assert _claim(sync_db, transcription.id, "high_priority")
+
+    sync_db.refresh(transcription)
+    assert transcription.attempts == 2
+    assert transcription.first_claimed_at.year == 2000
+
+
+@pytest.mark.parametrize("status", [TranscriptionStatus.completed, TranscriptionStatus.failed])
+def test_finished_rows_are_not_claimed(sync_db, status):
+    transcription = _row(sync_db, status=status)
+
+    assert not _claim(sync_db, transcription.id, "default")
+
+
+def test_on_device_rows_are_only_claimed_from_the_local_queue(sync_db):
+    transcription = _row(sync_db, queue=settings.TRANSCRIPTION_LOCAL_QUEUE)
+
+    assert not _claim(sync_db, transcription.id, "default")
+    assert not _claim(sync_db, transcription.id, "high_priority")
+    assert _claim(sync_db, transcription.id, settings.TRANSCRIPTION_LOCAL_QUEUE)
@@ -0,0 +1,144 @@
+import os
+import time
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from api.config.config import settings
+from api.schemas.recordings import UploadSessionCreate
+from api.services import upload_sessions
+from api.services.upload_sessions import (
+    append_upload_chunk,
+    create_upload_session,
+    finalize_upload_session,
+    get_upload_session_status,
+    parse_content_range,
+)
+from api.utils.upload_writer import sweep_staging_files
+
+USER_ID = 7
+
+
+@pytest.fixture
+def locks(monkeypatch):
+    """
+    In-process stand-in for the Redis session lock.
+    """
+    held = set()
+
+    def acquire(session_id):
+        if session_id in held:
+            return None
+        held.add(session_id)
+        return session_id
+
+    monkeypatch.setattr(upload_sessions, "_acquire_lock", acquire)
+    monkeypatch.setattr(upload_sessions, "_release_lock", lambda session_id, token: held.discard(session_id))
+    return held
+
+
+async def _stream(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+def _create(total_bytes=None) -> str:
+    payload = UploadSessionCreate(
+        duration_seconds=3,
+        recorded_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        filename="clip.wav",
+        total_bytes=total_bytes,
+    )
+    return asyncio.run(create_upload_session(USER_ID, payload)).session_id
+
+
+def _append(session_id: str, content_range: str, data: bytes):
+    return asyncio.run(append_upload_chunk(session_id, USER_ID, content_range, _stream(data)))
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes 0-99/200", (0, 99, 200)),
+        ("bytes 100-199/*", (100, 199, None)),
+        (" bytes 5-5/ ", (5, 5, None)),
+    ],
+)
+def test_parse_content_range(header, expected):
+    assert parse_content_range(header) == expected
+
+
+@pytest.mark.parametrize("header", [None, "", "items 0-1/2", "bytes a-b/c", "bytes 0-1/x"])
+def test_parse_content_range_rejects_garbage(header):
+    with pytest.raises(HTTPException) as error:
+        parse_content_range(header)
+    assert error.value.status_code == 400
+
+
+def test_ranges_resume_from_the_stored_offset(upload_dirs, locks):
+    session_id = _create(total_bytes=6)
+
+    assert _append(session_id, "bytes 0-2/6", b"abc").offset == 3
+    assert asyncio.run(get_upload_session_status(session_id, USER_ID)).offset == 3
+    assert _append(session_id, "bytes 3-5/6", b"def").offset == 6
+
+    meta, staged = asyncio.run(finalize_upload_session(session_id, USER_ID))
+    assert staged.path.read_bytes() == b"abcdef"
+    assert staged.size_bytes == 6
+
+
+def test_range_not_at_offset_gets_409_with_offset(upload_dirs, locks):
+    session_id = _create()
+    _append(session_id, "bytes 0-2/*", b"abc")
+
+    with pytest.raises(HTTPException) as error:
+        _append(session_id, "bytes 0-2/*", b"abc")
+
+    assert error.value.status_code == 409
+    assert error.value.detail["offset"] == 3
+
+
+def test_declared_total_over_limit_is_413(upload_dirs, locks):
+    session_id = _create()
+
+    with pytest.raises(HTTPException) as error:
+        _append(session_id, f"bytes 0-2/{settings.MAX_UPLOAD_BYTES + 1}", b"abc")
+
+    assert error.value.status_code == 413
+
+
+def test_concurrent_request_for_a_locked_session_is_409(upload_dirs, locks):
+    session_id = _create()
+    locks.add(session_id)
+
+    with pytest.raises(HTTPException) as error:
+        _append(session_id, "bytes 0-2/*", b"abc")
+
+    assert error.value.status_code == 409
+    assert error.value.detail["offset"] == 0
+
+
+def test_incomplete_upload_cannot_be_finalized(upload_dirs, locks):
+    session_id = _create(total_bytes=6)
+    _append(session_id, "bytes 0-2/6", b"abc")
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(finalize_upload_session(session_id, USER_ID))
+
+    assert error.value.status_code == 409
+    assert error.value.detail["offset"] == 3
+
+
+def test_sweep_removes_only_stale_staging_files(upload_dirs):
+    upload_dirs.mkdir(parents=True)
+    stale, fresh = upload_dirs / "stale.part", upload_dirs / "fresh.part"
+    stale.touch()
+    fresh.touch()
+    old = time.time() - settings.UPLOAD_STAGING_MAX_AGE_SECONDS - 60
+    os.utime(stale, (old, old))
+
+    assert sweep_staging_files() == 1
+    assert not stale.exists()
+    assert fresh.exists()
@@ -0,0 +1,28 @@
+import asyncio
+import hashlib
+
+import pytest
+from fastapi import HTTPException
+
+from api.utils.upload_writer import write_stream_to_staging
+
+
+async def _stream(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+def test_staged_file_has_content_hash_and_size(upload_dirs):
+    staged = asyncio.run(write_stream_to_staging(_stream(b"abc", b"def")))
+
+    assert staged.path.read_bytes() == b"abcdef"
+    assert staged.size_bytes == 6
+    assert staged.sha256 == hashlib.sha256(b"abcdef").hexdigest()
+
+
+def test_oversized_stream_is_rejected_and_discarded(upload_dirs):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(write_stream_to_staging(_stream(b"abc", b"def"), max_bytes=4))
+
+    assert error.value.status_code == 413
+    assert list(upload_dirs.glob("*.part")) == []
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from api.services.visits import cluster_visits, distance_meters
+
+HOME = (51.5007, -0.1246)
+# Roughly 1.1 km north of HOME
+PARK = (51.5107, -0.1246)
+START = datetime(2026, 5, 1, 9, 0)
+
+
+def clip(minutes, location=HOME, duration=60):
+    latitude, longitude = location if location else (None, None)
+    return SimpleNamespace(
+        recorded_at=START + timedelta(minutes=minutes),
+        duration_seconds=duration,
+        latitude=latitude,
+        longitude=longitude,
+    )
+
+
+def test_distance_meters():
+    assert distance_meters(*HOME, *HOME) == 0
+    assert distance_meters(*HOME, *PARK) == pytest.approx(1112, rel=0.01)
+
+
+def test_nearby_clips_form_one_visit_in_time_order():
+    later, earlier = clip(30), clip(0)
+
+    (visit,) = cluster_visits([later, earlier])
+
+    assert visit.recordings == [earlier, later]
+    assert visit.start == START
+    assert visit.end == START + timedelta(minutes=31)
+
+
+def test_moving_away_starts_a_new_visit():
+    visits = cluster_visits([clip(0), clip(10, PARK)])
+
+    assert len(visits) == 2
+    assert (visits[1].latitude, visits[1].longitude) == PARK
+
+
+def test_long_gap_starts_a_new_visit():
+    visits = cluster_visits([clip(0), clip(200)])
+
+    assert len(visits) == 2
+
+
+def test_unlocated_clip_joins_the_current_visit():
+    (visit,) = cluster_visits([clip(0), clip(10, location=None), clip(20)])
+
+    assert len(visit.recordings) == 3
+    assert (visit.latitude, visit.longitude) == pytest.approx(HOME)
+
+
+def test_centroid_averages_located_clips():
+    nearby = (HOME[0] + 0.001, HOME[1])
+
+    (visit,) = cluster_visits([clip(0), clip(10, nearby)])
+
+    assert visit.latitude == pytest.approx(HOME[0] + 0.0005)
+
+
+def test_no_recordings():
+    assert cluster_visits([]) == []